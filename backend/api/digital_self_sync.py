@@ -10,6 +10,12 @@ Output contract:
   Each node includes an ONNX embedding vector (384-dim, bge-small-en-v1.5).
   Device merges the diff into its local encrypted PKG.
 
+Vector encoding (content negotiation):
+  Default: `vector` is a JSON float list.
+  `Accept: application/json; vector-encoding=f16` (or `i8`): `vector` is
+  empty and `vector_b64` carries the base64 vector_codec encoding named in
+  `vector_encoding` — 4-8x smaller sync responses.
+
 Privacy contract:
   - Credentials used only for the duration of the request.
   - NEVER persisted on the backend.
@@ -34,12 +40,13 @@ from datetime import datetime, timezone
 from email.header import decode_header
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Header, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Response
 from pydantic import BaseModel, Field
 
 from auth.tokens import validate_token
 from auth.sso_validator import get_sso_validator, AuthError
-from memory.client.embedder import embed
+from memory.client import vector_codec
+from memory.client.embedder import embed_async
 from observability.audit_log import log_audit_event
 from schemas.audit import AuditEventType
 
@@ -62,6 +69,8 @@ class PKGNodeOut(BaseModel):
     confidence: float
     provenance: str     # EMAIL | LINKEDIN | SOCIAL
     vector: List[float] # 384-dim ONNX embedding for semantic search
+    vector_b64: Optional[str] = None    # compact encoding (when negotiated)
+    vector_encoding: str = "f32"        # f32 (JSON list) | f16 | i8 — see vector_codec
 
 
 class PKGEdgeOut(BaseModel):
@@ -99,6 +108,19 @@ def _get_user_id(authorization: Optional[str]) -> str:
             raise HTTPException(status_code=401, detail="Invalid token")
 
 
+def _encode_vectors(nodes: List[PKGNodeOut], accept: Optional[str], response: Response) -> None:
+    """Apply the vector encoding negotiated via the Accept header, in place."""
+    response.headers["Vary"] = "Accept"
+    encoding = vector_codec.negotiate(accept)
+    if encoding == "f32":
+        return
+    for node in nodes:
+        if node.vector:
+            node.vector_b64 = vector_codec.encode(node.vector, encoding)
+            node.vector = []
+        node.vector_encoding = encoding
+
+
 #    Entity extraction helpers                                                           
 
 def _domain_from_email(addr: str) -> str:
@@ -139,10 +161,10 @@ def _node_id_from_email(addr: str) -> str:
 
 
 async def _embed_texts(texts: List[str]) -> List[List[float]]:
-    """Generate ONNX embeddings in a thread (non-blocking, CPU-bound)."""
+    """Generate ONNX embeddings via the shared micro-batcher (non-blocking)."""
     if not texts:
         return []
-    return await asyncio.to_thread(embed, texts)
+    return await embed_async(texts)
 
 
 
@@ -300,7 +322,9 @@ class IMAPRequest(BaseModel):
 @router.post("/email/sync", response_model=PKGDiff)
 async def sync_imap_email(
     req: IMAPRequest,
+    response: Response,
     authorization: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
 ):
     """Extract entity vectors and relationship graph from IMAP email.
 
@@ -423,6 +447,7 @@ async def sync_imap_email(
     person_count = sum(1 for n in nodes if n.type == "Person")
     interest_count = sum(1 for n in nodes if n.type == "Interest")
     logger.info("[EmailSync] User=%s nodes=%d edges=%d", user_id, len(nodes), len(edges))
+    _encode_vectors(nodes, accept, response)
     return PKGDiff(
         nodes=nodes, edges=edges,
         stats={"nodes": len(nodes), "edges": len(edges),
@@ -448,7 +473,9 @@ class LinkedInCSVRequest(BaseModel):
 @router.post("/linkedin/sync", response_model=PKGDiff)
 async def sync_linkedin_csv(
     req: LinkedInCSVRequest,
+    response: Response,
     authorization: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
 ):
     """Extract professional relationship graph from LinkedIn Connections CSV.
 
@@ -550,6 +577,7 @@ async def sync_linkedin_csv(
         details={"action": "linkedin_sync", "nodes": len(nodes), "edges": len(edges)},
     )
     logger.info("[LinkedInSync] User=%s nodes=%d edges=%d", user_id, len(nodes), len(edges))
+    _encode_vectors(nodes, accept, response)
     return PKGDiff(nodes=nodes, edges=edges, stats={"nodes": len(nodes), "edges": len(edges)})
 
 
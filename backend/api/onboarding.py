@@ -12,7 +12,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
 from core.database import get_db
-from memory.retriever import store_fact, register_entity
+from memory.retriever import store_facts_bulk, register_entities_bulk
 
 logger = logging.getLogger(__name__)
 
@@ -117,37 +117,39 @@ async def save_onboarding_profile(profile: OnboardingProfile):
     db = get_db()
     items_stored = 0
 
-    await store_fact(user_id=profile.user_id, text=f"My name is {profile.display_name}", fact_type="IDENTITY", provenance="ONBOARDING")
-    items_stored += 1
+    facts: List[Dict[str, Any]] = [
+        {"text": f"My name is {profile.display_name}", "fact_type": "IDENTITY", "provenance": "ONBOARDING"},
+    ]
 
     if profile.timezone:
-        await store_fact(user_id=profile.user_id, text=f"My timezone is {profile.timezone}", fact_type="PREFERENCE", provenance="ONBOARDING")
-        items_stored += 1
+        facts.append({"text": f"My timezone is {profile.timezone}", "fact_type": "PREFERENCE", "provenance": "ONBOARDING"})
 
     if profile.communication_style:
-        await store_fact(user_id=profile.user_id, text=f"I prefer {profile.communication_style} communication style", fact_type="PREFERENCE", provenance="ONBOARDING")
-        items_stored += 1
+        facts.append({"text": f"I prefer {profile.communication_style} communication style", "fact_type": "PREFERENCE", "provenance": "ONBOARDING"})
 
     for key, value in profile.preferences.items():
-        await store_fact(user_id=profile.user_id, text=f"Preference: {key} = {value}", fact_type="PREFERENCE", provenance="ONBOARDING")
-        items_stored += 1
-
-    for contact in profile.contacts:
-        name = contact.get("name", "")
+        facts.append({"text": f"Preference: {key} = {value}", "fact_type": "PREFERENCE", "provenance": "ONBOARDING"})
+
+    contacts = [c for c in profile.contacts if c.get("name", "")]
+    entity_ids = await register_entities_bulk(profile.user_id, [
+        {
+            "entity_type": "PERSON", "name": c["name"],
+            "aliases": c.get("aliases", "").split(",") if c.get("aliases") else [],
+            "data": {"relationship": c.get("relationship", "contact")}, "provenance": "ONBOARDING",
+        }
+        for c in contacts
+    ])
+    items_stored += len(entity_ids)
+    for contact, entity_id in zip(contacts, entity_ids):
         rel = contact.get("relationship", "contact")
-        if name:
-            entity_id = await register_entity(
-                user_id=profile.user_id, entity_type="PERSON", name=name,
-                aliases=contact.get("aliases", "").split(",") if contact.get("aliases") else [],
-                data={"relationship": rel}, provenance="ONBOARDING",
-            )
-            await store_fact(user_id=profile.user_id, text=f"{name} is my {rel}", fact_type="FACT", provenance="ONBOARDING", related_to=entity_id)
-            items_stored += 2
+        facts.append({"text": f"{contact['name']} is my {rel}", "fact_type": "FACT", "provenance": "ONBOARDING", "related_to": entity_id})
 
     for routine in profile.routines:
         if routine.strip():
-            await store_fact(user_id=profile.user_id, text=f"Daily routine: {routine}", fact_type="ROUTINE", provenance="ONBOARDING")
-            items_stored += 1
+            facts.append({"text": f"Daily routine: {routine}", "fact_type": "ROUTINE", "provenance": "ONBOARDING"})
+
+    await store_facts_bulk(profile.user_id, facts)
+    items_stored += len(facts)
 
     status = {
         "user_id": profile.user_id, "completed": True, "step": 7, "total_steps": 7,
@@ -164,33 +166,34 @@ async def bulk_import(req: BulkImportRequest):
     db = get_db()
     items_stored = 0
 
+    facts: List[Dict[str, Any]] = []
+
     # Identity
     if req.display_name:
-        await store_fact(user_id=req.user_id, text=f"My name is {req.display_name}", fact_type="IDENTITY", provenance="ONBOARDING_AUTO")
-        items_stored += 1
+        facts.append({"text": f"My name is {req.display_name}", "fact_type": "IDENTITY", "provenance": "ONBOARDING_AUTO"})
 
     if req.timezone:
-        await store_fact(user_id=req.user_id, text=f"My timezone is {req.timezone}", fact_type="PREFERENCE", provenance="ONBOARDING_AUTO")
-        items_stored += 1
+        facts.append({"text": f"My timezone is {req.timezone}", "fact_type": "PREFERENCE", "provenance": "ONBOARDING_AUTO"})
 
     if req.communication_style:
-        await store_fact(user_id=req.user_id, text=f"I prefer {req.communication_style} communication style", fact_type="PREFERENCE", provenance="ONBOARDING_AUTO")
-        items_stored += 1
+        facts.append({"text": f"I prefer {req.communication_style} communication style", "fact_type": "PREFERENCE", "provenance": "ONBOARDING_AUTO"})
 
-    # Enriched contacts
-    for c in req.contacts:
-        if not c.name:
-            continue
+    # Enriched contacts — all entities registered in one batch, then one fact each
+    contacts = [c for c in req.contacts if c.name]
+    entities = []
+    for c in contacts:
         entity_data = {"relationship": c.relationship, "role": c.role, "email": c.email, "phone": c.phone,
                        "preferred_channel": c.preferred_channel, "importance": c.importance,
                        "starred": c.starred, "company": c.company, "import_source": c.import_source}
         entity_data = {k: v for k, v in entity_data.items() if v}
-
-        entity_id = await register_entity(
-            user_id=req.user_id, entity_type="PERSON", name=c.name,
-            aliases=c.aliases, data=entity_data, provenance="ONBOARDING_AUTO",
-        )
-
+        entities.append({
+            "entity_type": "PERSON", "name": c.name, "aliases": c.aliases,
+            "data": entity_data, "provenance": "ONBOARDING_AUTO",
+        })
+    entity_ids = await register_entities_bulk(req.user_id, entities)
+    items_stored += len(entity_ids)
+
+    for c, entity_id in zip(contacts, entity_ids):
         desc_parts = [f"{c.name} is my {c.relationship}"]
         if c.role:
             desc_parts.append(f"role: {c.role}")
@@ -199,12 +202,11 @@ async def bulk_import(req: BulkImportRequest):
         if c.preferred_channel:
             desc_parts.append(f"prefers {c.preferred_channel}")
 
-        await store_fact(
-            user_id=req.user_id, text=", ".join(desc_parts),
-            fact_type="FACT", provenance="ONBOARDING_AUTO", related_to=entity_id,
-            metadata={"email": c.email, "phone": c.phone, "importance": c.importance},
-        )
-        items_stored += 2
+        facts.append({
+            "text": ", ".join(desc_parts),
+            "fact_type": "FACT", "provenance": "ONBOARDING_AUTO", "related_to": entity_id,
+            "metadata": {"email": c.email, "phone": c.phone, "importance": c.importance},
+        })
 
     # Structured routines
     for r in req.routines:
@@ -226,11 +228,10 @@ async def bulk_import(req: BulkImportRequest):
         if r.days:
             text_parts.append(f"on {', '.join(r.days)}")
 
-        await store_fact(
-            user_id=req.user_id, text=" ".join(text_parts),
-            fact_type="ROUTINE", provenance="ONBOARDING_AUTO", metadata=meta,
-        )
-        items_stored += 1
+        facts.append({
+            "text": " ".join(text_parts),
+            "fact_type": "ROUTINE", "provenance": "ONBOARDING_AUTO", "metadata": meta,
+        })
 
     # Calendar patterns
     for p in req.patterns:
@@ -240,25 +241,25 @@ async def bulk_import(req: BulkImportRequest):
         if p.days:
             pattern_meta["days"] = p.days
         pattern_meta = {k: v for k, v in pattern_meta.items() if v or isinstance(v, (int, float))}
-        
-        await store_fact(
-            user_id=req.user_id, text=f"Pattern: {p.description}",
-            fact_type="FACT", provenance="ONBOARDING_AUTO",
-            metadata=pattern_meta,
-        )
-        items_stored += 1
+
+        facts.append({
+            "text": f"Pattern: {p.description}",
+            "fact_type": "FACT", "provenance": "ONBOARDING_AUTO",
+            "metadata": pattern_meta,
+        })
 
     # Location context
     if req.location and req.location.city:
         loc = req.location
-        await store_fact(
-            user_id=req.user_id,
-            text=f"I am based in {loc.city}, {loc.region}, {loc.country}",
-            fact_type="PREFERENCE", provenance="ONBOARDING_AUTO",
-            metadata={"city": loc.city, "region": loc.region, "country": loc.country,
-                       "timezone": loc.timezone, "postal_code": loc.postal_code},
-        )
-        items_stored += 1
+        facts.append({
+            "text": f"I am based in {loc.city}, {loc.region}, {loc.country}",
+            "fact_type": "PREFERENCE", "provenance": "ONBOARDING_AUTO",
+            "metadata": {"city": loc.city, "region": loc.region, "country": loc.country,
+                         "timezone": loc.timezone, "postal_code": loc.postal_code},
+        })
+
+    await store_facts_bulk(req.user_id, facts)
+    items_stored += len(facts)
 
     status = {
         "user_id": req.user_id, "completed": True, "step": 7, "total_steps": 7,
@@ -30,6 +30,13 @@ class Settings(BaseSettings):
     HEARTBEAT_INTERVAL_S: int = Field(default=5)
     HEARTBEAT_TIMEOUT_S: int = Field(default=15)  # >15s → refuse MIO
 
+    # ── WebSocket Gateway ────────────────────────────────────────
+    WS_PIPELINE_MAX_PENDING: int = Field(default=256)  # queued pipeline messages per session (audio chunks included)
+    WS_SESSION_MAX_TASKS: int = Field(default=4)       # concurrent background handlers per session
+    WS_SESSION_IDLE_TTL_S: int = Field(default=300)    # socket-less session records are swept after this
+    WS_BACKPLANE: str = Field(default="local")         # local (single worker) | unix (multi-worker, one host)
+    WS_BACKPLANE_DIR: str = Field(default="/tmp/myndlens-ws-backplane")  # worker sockets for WS_BACKPLANE=unix
+
     # ── External Services (stubs in early batches) ───────────────
     DEEPGRAM_API_KEY: str = Field(default="")
     DEEPGRAM_MODEL: str = Field(default="nova-2")
@@ -74,6 +81,30 @@ class Settings(BaseSettings):
     # ── Self-referential URL (used in pairing response) ──────
     MYNDLENS_BASE_URL: str = Field(default="https://app.myndlens.com")
 
+    # ── Digital Self / Embeddings ──────────────────────────────
+    EMBED_BATCH_MAX_SIZE: int = Field(default=32)       # texts per merged ONNX batch
+    EMBED_BATCH_MAX_WAIT_MS: float = Field(default=5.0)  # max wait to fill a batch
+    EMBED_WARMUP: bool = Field(default=True)             # load + run a dummy batch at startup
+    EMBED_ONNX_INTRA_OP_THREADS: int = Field(default=0)  # 0 = ONNX Runtime default (all cores) — set to the CPU limit
+    EMBED_ONNX_INTER_OP_THREADS: int = Field(default=0)  # 0 = same as intra-op
+    EMBED_ONNX_GRAPH_OPT_LEVEL: Literal["disable", "basic", "extended", "all"] = Field(default="all")
+    VECTOR_REHYDRATE_MODE: Literal["eager", "lazy"] = Field(default="eager")  # lazy = per user on first recall
+    VECTOR_REHYDRATE_BATCH_SIZE: int = Field(default=1000)
+    VECTOR_PERSIST_BATCH_SIZE: int = Field(default=500)        # ops per Mongo bulk_write
+    VECTOR_PERSIST_MAX_BACKLOG: int = Field(default=10000)     # pending ops before writers wait
+    VECTOR_PERSIST_FLUSH_INTERVAL_MS: float = Field(default=50.0)
+    VECTOR_STORAGE_ENCODING: Literal["f32", "f16", "i8"] = Field(default="f16")  # vector_store embedding bytes
+    VECTOR_SNAPSHOT_DIR: str = Field(default="")              # local dir for Chroma partition snapshots ("" = off)
+    VECTOR_SNAPSHOT_INTERVAL_S: float = Field(default=300.0)
+    VECTOR_EXACT_SEARCH_MAX_DOCS: int = Field(default=10000)  # partitions up to this size use exact NumPy search (0 = off)
+    GRAPH_CACHE_MAX_BYTES: int = Field(default=256 * 1024 * 1024)  # LRU budget for cached user graphs
+    RECALL_MEMO_TTL_S: float = Field(default=300.0)       # mandate-scoped recall memo entry lifetime
+    RECALL_MEMO_MAX_ENTRIES: int = Field(default=2048)
+    RECALL_MEMO_MIN_RESULTS: int = Field(default=5)       # over-fetch so later, smaller recalls hit
+    RECALL_NAME_FAST_PATH: bool = Field(default=True)     # answer bare-name queries from the lexical index
+    FACT_DEDUP_ENABLED: bool = Field(default=True)        # store_fact merges into an existing identical fact
+    FACT_DEDUP_MAX_DISTANCE: float = Field(default=0.0)   # cosine distance for near-duplicate merges (0 = exact only)
+
     # ── Observability ────────────────────────────────────────────
     LOG_LEVEL: str = Field(default="INFO")
     LOG_REDACTION_ENABLED: bool = Field(default=True)
@@ -106,8 +106,11 @@ async def init_indexes() -> None:
     await db.prompt_versions.create_index([("purpose", 1), ("is_active", 1)])
     await db.prompt_versions.create_index([("purpose", 1), ("version", -1)])
 
-    # Graphs: user_id lookup
+    # Graphs: user_id lookup (legacy whole-graph blobs, migrated on load)
     await db.graphs.create_index("user_id", unique=True)
+    # Graph nodes / edges: one document each, loaded per user
+    await db.graph_nodes.create_index([("user_id", 1), ("node_id", 1)], unique=True)
+    await db.graph_edges.create_index([("user_id", 1), ("source", 1), ("target", 1)], unique=True)
 
     # Transcripts: session_id lookup
     await db.transcripts.create_index("session_id")
@@ -115,6 +118,7 @@ async def init_indexes() -> None:
     # Vector store: doc_id lookup for persistence layer
     await db.vector_store.create_index("doc_id", unique=True)
     await db.vector_store.create_index([("metadata.user_id", 1)])
+    await db.vector_store.create_index([("updated_at", 1)])   # snapshot watermark delta
 
     # AgentGuard security reports: execution_id lookup
     await db.agentguard_reports.create_index("execution_id")
@@ -41,7 +41,7 @@ async def broadcast_stage(
     execution_id: str = "",
 ) -> None:
     """Broadcast a pipeline stage update via WebSocket + persist to DB."""
-    from gateway.ws_server import active_connections, _make_envelope, execution_sessions
+    from gateway.ws_server import send_to_session, execution_sessions
     from schemas.ws_messages import WSMessageType
 
     stage_name = STAGE_NAMES.get(stage_index, f"Stage {stage_index}")
@@ -69,14 +69,8 @@ async def broadcast_stage(
         upsert=True,
     )
 
-    # Broadcast to WS client
-    ws = active_connections.get(session_id)
-    if ws:
-        try:
-            data = _make_envelope(WSMessageType.PIPELINE_STAGE, payload)
-            await ws.send_text(data)
-        except Exception as e:
-            logger.warning("Failed to broadcast stage %d to session %s: %s", stage_index, session_id, e)
+    # Broadcast to WS client (forwarded over the backplane if another worker owns it)
+    await send_to_session(session_id, WSMessageType.PIPELINE_STAGE, payload)
 
     # Map execution_id → session_id for webhook routing
     if execution_id:
@@ -201,27 +195,22 @@ async def _poll_execution(
             structured = data.get("structured_result")
             result_type = data.get("result_type", "generic")
             if structured and status == "COMPLETED":
-                from gateway.ws_server import active_connections, _make_envelope, execution_sessions
+                from gateway.ws_server import send_to_session
                 from schemas.ws_messages import WSMessageType as _WST
-                ws = active_connections.get(session_id)
-                if ws:
-                    try:
-                        payload = {
-                            "stage_id": "delivered",
-                            "stage_index": 9,
-                            "total_stages": 10,
-                            "status": "done",
-                            "summary": summary,
-                            "sub_status": summary[:120],
-                            "result_type": result_type,
-                            "structured_result": structured,
-                            "delivered_to": ["in_app"],
-                            "progress": 100,
-                            "execution_id": execution_id,
-                        }
-                        await ws.send_text(_make_envelope(_WST.PIPELINE_STAGE, payload))
-                    except Exception:
-                        pass
+                payload = {
+                    "stage_id": "delivered",
+                    "stage_index": 9,
+                    "total_stages": 10,
+                    "status": "done",
+                    "summary": summary,
+                    "sub_status": summary[:120],
+                    "result_type": result_type,
+                    "structured_result": structured,
+                    "delivered_to": ["in_app"],
+                    "progress": 100,
+                    "execution_id": execution_id,
+                }
+                await send_to_session(session_id, _WST.PIPELINE_STAGE, payload)
             logger.info("Execution %s: exec=%s", status, execution_id)
             return
 
@@ -0,0 +1,204 @@
+"""Session Backplane — cross-worker delivery of server → client messages.
+
+Sockets live in the worker that accepted them, but deliveries can originate
+anywhere: the delivery webhook and the execution poller look sessions up by
+execution_id / session_id in their own worker's maps. When the lookup
+misses, the gateway publishes the message here and every other worker tries
+to deliver it to a socket it owns (ws_server._deliver_from_backplane).
+
+Messages are small dicts:
+    {"session_id" | "execution_id": ..., "type": <WSMessageType value>, "payload": {...}}
+
+Implementations (WS_BACKPLANE):
+  local — InProcessBackplane. Peers are other instances on the same channel
+          in this process; a single-worker deployment has none, so a
+          publish reaches nobody, exactly like the old local-only lookup.
+  unix  — UnixSocketBackplane. Each worker binds a datagram socket in
+          WS_BACKPLANE_DIR; publish sends to every other socket there. No
+          broker, works across uvicorn workers on one host, and is testable
+          without outside services.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import orjson
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[dict], Awaitable[None]]
+
+# Unix datagrams are bounded by the socket buffers; larger messages are dropped (logged)
+MAX_MESSAGE_BYTES = 192 * 1024
+
+
+class Backplane(ABC):
+    """Fan-out of session messages to the other gateway workers."""
+
+    def __init__(self):
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._handler: Optional[MessageHandler] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @abstractmethod
+    async def start(self, handler: MessageHandler) -> None:
+        """Begin receiving; handler is called with each message published by a peer."""
+        ...
+
+    @abstractmethod
+    async def publish(self, message: dict) -> int:
+        """Send message to every peer worker. Returns the number of peers reached."""
+        ...
+
+    async def close(self) -> None:
+        self._handler = None
+        for task in list(self._tasks):
+            task.cancel()
+
+    def _dispatch(self, message: dict) -> None:
+        """Run the handler for a received message without blocking the receiver."""
+        if self._handler is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._handle(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, message: dict) -> None:
+        try:
+            await self._handler(message)
+        except Exception as e:
+            logger.warning("[Backplane] handler failed: %s", str(e))
+
+
+# ── In-process ──────────────────────────────────────────────────────────────
+
+_channels: Dict[str, List["InProcessBackplane"]] = {}
+
+
+class InProcessBackplane(Backplane):
+    """Peers are the other started instances on the same channel, in this process."""
+
+    def __init__(self, channel: str = "default"):
+        super().__init__()
+        self.channel = channel
+
+    async def start(self, handler: MessageHandler) -> None:
+        self._handler = handler
+        members = _channels.setdefault(self.channel, [])
+        if self not in members:
+            members.append(self)
+
+    async def publish(self, message: dict) -> int:
+        peers = [b for b in _channels.get(self.channel, ()) if b is not self]
+        for peer in peers:
+            peer._dispatch(message)
+        return len(peers)
+
+    async def close(self) -> None:
+        members = _channels.get(self.channel, [])
+        if self in members:
+            members.remove(self)
+        if not members:
+            _channels.pop(self.channel, None)
+        await super().close()
+
+
+# ── Unix datagram sockets ───────────────────────────────────────────────────
+
+class _Receiver(asyncio.DatagramProtocol):
+    def __init__(self, backplane: "UnixSocketBackplane"):
+        self._backplane = backplane
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        try:
+            message = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            logger.warning("[Backplane] dropped undecodable datagram (%d bytes)", len(data))
+            return
+        self._backplane._dispatch(message)
+
+
+class UnixSocketBackplane(Backplane):
+    """One datagram socket per worker in a shared directory; publish sends to all the others."""
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = Path(directory)
+        self.path = self.directory / f"{self.worker_id}.sock"
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._sender: Optional[socket.socket] = None
+
+    async def start(self, handler: MessageHandler) -> None:
+        self._handler = handler
+        self.directory.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _Receiver(self), local_addr=str(self.path), family=socket.AF_UNIX,
+        )
+        self._transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        self._sender.setblocking(False)
+        logger.info("[Backplane] worker=%s listening on %s", self.worker_id, self.path)
+
+    def _peers(self) -> List[Path]:
+        return [p for p in self.directory.glob("*.sock") if p != self.path]
+
+    async def publish(self, message: dict) -> int:
+        if self._sender is None:
+            return 0
+        data = orjson.dumps(message)
+        if len(data) > MAX_MESSAGE_BYTES:
+            logger.warning("[Backplane] message too large to forward: %d bytes (max %d)", len(data), MAX_MESSAGE_BYTES)
+            return 0
+        reached = 0
+        for peer in self._peers():
+            try:
+                self._sender.sendto(data, str(peer))
+                reached += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Socket file left behind by a worker that died — nobody is listening
+                peer.unlink(missing_ok=True)
+            except BlockingIOError:
+                logger.warning("[Backplane] peer %s is not draining — message dropped", peer.name)
+            except OSError as e:
+                logger.warning("[Backplane] send to %s failed: %s", peer.name, str(e))
+        return reached
+
+    async def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._sender is not None:
+            self._sender.close()
+            self._sender = None
+        self.path.unlink(missing_ok=True)
+        await super().close()
+
+
+# ── Selection ───────────────────────────────────────────────────────────────
+
+_backplane: Optional[Backplane] = None
+
+
+def _get_backplane() -> Backplane:
+    settings = get_settings()
+    if settings.WS_BACKPLANE == "unix":
+        return UnixSocketBackplane(settings.WS_BACKPLANE_DIR)
+    if settings.WS_BACKPLANE != "local":
+        logger.error("[Backplane] Unknown WS_BACKPLANE=%s → using local", settings.WS_BACKPLANE)
+    return InProcessBackplane()
+
+
+def get_backplane() -> Backplane:
+    global _backplane
+    if _backplane is None:
+        _backplane = _get_backplane()
+    return _backplane
@@ -0,0 +1,65 @@
+"""Outbound envelope encoding — the gateway's hot serialization path.
+
+Envelopes the server builds itself need no validation: payload models were
+validated when constructed and dict payloads are server-built. So instead
+of WSEnvelope(...).model_dump_json() — validate the envelope, dump the
+payload model to a dict, then serialize that dict again by type inference —
+encode_envelope():
+  - serializes a payload model once, with its compiled schema serializer
+    (model_dump_json), and splices the JSON into the envelope text
+  - encodes dict payloads with orjson
+
+The output is wire-identical to WSEnvelope.model_dump_json(): same key
+order, UTC timestamps with a "Z" suffix, enums as their values. Inbound
+messages are still validated with the schemas.ws_messages models.
+
+Measured with scripts/bench_ws_envelope.py (per message, median):
+    heartbeat_ack       16.4us → 12.9us
+    transcript_partial  16.8us → 12.4us
+    pipeline_stage      14.0us → 9.7us
+    tts_audio (48KB)    61.4us → 19.3us
+At 500 sessions x 20 msg/s that is roughly 0.04 core per message type, and
+0.4 core for audio-bearing TTS.
+"""
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Union
+
+import orjson
+from pydantic import BaseModel
+
+from schemas.ws_messages import WSMessageType
+
+_ORJSON_OPTS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _envelope_id() -> str:
+    """Same id WSEnvelope's default_factory produces."""
+    return str(uuid.uuid4())
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not encode natively, serialized the way pydantic would."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def encode_payload(payload: Union[BaseModel, Dict[str, Any]]) -> str:
+    if isinstance(payload, BaseModel):
+        return payload.model_dump_json()
+    return orjson.dumps(payload, default=_default, option=_ORJSON_OPTS).decode()
+
+
+def encode_envelope(msg_type: Union[WSMessageType, str], payload: Union[BaseModel, Dict[str, Any]]) -> str:
+    """JSON text of a server → client envelope, without building a WSEnvelope."""
+    type_value = msg_type.value if isinstance(msg_type, WSMessageType) else WSMessageType(msg_type).value
+    timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return (
+        f'{{"type":"{type_value}","id":"{_envelope_id()}","timestamp":"{timestamp}",'
+        f'"payload":{encode_payload(payload)}}}'
+    )
@@ -0,0 +1,127 @@
+"""Pipeline DAG — run dependent async stages concurrently.
+
+Each Stage names the stages it needs; run_stages() starts every stage as
+soon as its inputs are ready, so independent stages overlap and a run takes
+roughly its critical path instead of the sum of its stages. A stage is
+awaited with its inputs' results as keyword arguments:
+
+    Stage("gap_fill", fill, needs=("ds_recall",))   →   await fill(ds_recall=<result>)
+
+Per stage:
+  - timeout_s bounds the stage; with a fallback, a timeout or error yields
+    the fallback as the stage's result, otherwise it aborts the run
+  - raising PipelineHalt ends the run early (the stage already answered the
+    user); every stage still in flight is cancelled
+on_event(stage, status, elapsed_ms) is awaited as each stage starts
+("started") and completes ("done" | "fallback" | "failed"), so progress
+streams out in completion order.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+StageEventHandler = Callable[[str, str, float], Awaitable[None]]
+
+REQUIRED = object()  # Stage.fallback default — the stage's failure aborts the run
+
+
+class PipelineHalt(Exception):
+    """Raised by a stage to end the run early; remaining stages are cancelled."""
+
+    def __init__(self, stage: str = "", reason: str = ""):
+        super().__init__(reason or stage)
+        self.stage = stage
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    needs: Tuple[str, ...] = ()
+    timeout_s: Optional[float] = None
+    fallback: Any = REQUIRED
+
+
+def _validate(stages: Iterable[Stage]) -> Dict[str, Stage]:
+    by_name: Dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage: {stage.name}")
+        by_name[stage.name] = stage
+    for stage in by_name.values():
+        unknown = [n for n in stage.needs if n not in by_name]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} needs unknown stage(s): {', '.join(unknown)}")
+    # Kahn's algorithm — anything left unvisited sits on a cycle
+    remaining = {name: set(stage.needs) for name, stage in by_name.items()}
+    while True:
+        ready = [name for name, needs in remaining.items() if not needs]
+        if not ready:
+            break
+        for name in ready:
+            del remaining[name]
+        for needs in remaining.values():
+            needs.difference_update(ready)
+    if remaining:
+        raise ValueError(f"Stage dependency cycle: {', '.join(sorted(remaining))}")
+    return by_name
+
+
+async def _run_stage(stage: Stage, inputs: Dict[str, Any], on_event: Optional[StageEventHandler]) -> Any:
+    start = time.monotonic()
+    if on_event:
+        await on_event(stage.name, "started", 0.0)
+    try:
+        if stage.timeout_s is None:
+            result = await stage.run(**inputs)
+        else:
+            result = await asyncio.wait_for(stage.run(**inputs), timeout=stage.timeout_s)
+        status = "done"
+    except PipelineHalt:
+        raise
+    except Exception as e:
+        elapsed_ms = (time.monotonic() - start) * 1000
+        if stage.fallback is REQUIRED:
+            if on_event:
+                await on_event(stage.name, "failed", elapsed_ms)
+            raise
+        logger.warning("[PIPELINE] stage=%s %s after %.0fms — using fallback",
+                       stage.name, "timed out" if isinstance(e, asyncio.TimeoutError) else f"failed: {e}", elapsed_ms)
+        result = stage.fallback
+        status = "fallback"
+    if on_event:
+        await on_event(stage.name, status, (time.monotonic() - start) * 1000)
+    return result
+
+
+async def run_stages(stages: Iterable[Stage], on_event: Optional[StageEventHandler] = None) -> Dict[str, Any]:
+    """Run the stage DAG; returns {stage name: result}.
+
+    Raises PipelineHalt if a stage halted the run, or the first required
+    stage's error. Either way no stage task outlives the call.
+    """
+    pending = _validate(stages)
+    results: Dict[str, Any] = {}
+    running: Dict[asyncio.Task, Stage] = {}
+    try:
+        while pending or running:
+            for name in [n for n, s in pending.items() if all(dep in results for dep in s.needs)]:
+                stage = pending.pop(name)
+                inputs = {dep: results[dep] for dep in stage.needs}
+                task = asyncio.ensure_future(_run_stage(stage, inputs, on_event))
+                running[task] = stage
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage = running.pop(task)
+                results[stage.name] = task.result()
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    return results
@@ -0,0 +1,123 @@
+"""Session Lanes — per-session task scheduling for the WS message loop.
+
+The receive loop must keep reading while the mandate pipeline runs (seconds
+of LLM calls): heartbeats keep presence fresh, a kill switch has to reach
+the in-flight work, and the pipeline itself waits for DS_CONTEXT /
+BIOMETRIC_RESPONSE replies that arrive on the same socket.
+
+Each authenticated session gets one SessionLanes:
+  - pipeline lane: one worker runs queued handlers strictly in arrival
+    order (audio, fragments, text/command input, execute) — the ordering
+    the inline loop used to give. At most WS_PIPELINE_MAX_PENDING queued.
+  - fast lane: control messages (heartbeat, kill switch, ds_context,
+    biometric_response) are still handled inline by the receive loop.
+  - background: independent one-off handlers run as tracked tasks, at most
+    WS_SESSION_MAX_TASKS at a time.
+
+cancel_pipeline() cancels the running pipeline handler and drops the
+queued ones (kill switch); close() cancels everything (disconnect).
+Handlers are passed as zero-argument callables so dropped work never
+creates an un-awaited coroutine.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[], Awaitable[Any]]
+
+
+class SessionLanes:
+    """Ordered pipeline lane + bounded background tasks for one WS session."""
+
+    def __init__(self, session_id: str, max_pending: int = 256, max_background: int = 4):
+        self.session_id = session_id
+        self.max_background = max_background
+        self._queue: "asyncio.Queue[Tuple[str, Handler]]" = asyncio.Queue(maxsize=max_pending)
+        self._worker: Optional[asyncio.Task] = None
+        self._current: Optional[asyncio.Task] = None
+        self._current_label = ""
+        self._background: Set[asyncio.Task] = set()
+        self._closed = False
+
+    def submit(self, label: str, handler: Handler) -> bool:
+        """Queue pipeline work behind everything already queued. False if the lane is full."""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((label, handler))
+        except asyncio.QueueFull:
+            logger.warning("[Lanes] Pipeline lane full: session=%s dropped=%s", self.session_id[:12], label)
+            return False
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        return True
+
+    def spawn(self, label: str, handler: Handler) -> bool:
+        """Run independent work now, as a tracked task. False at the concurrency limit."""
+        if self._closed or len(self._background) >= self.max_background:
+            logger.warning("[Lanes] Task limit reached: session=%s dropped=%s", self.session_id[:12], label)
+            return False
+        task = asyncio.create_task(self._guarded(label, handler))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return True
+
+    def cancel_pipeline(self) -> int:
+        """Cancel the running pipeline handler and drop queued ones. Returns handlers affected."""
+        dropped = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            dropped += 1
+        if self._current is not None and not self._current.done():
+            self._current.cancel()
+            dropped += 1
+        if dropped:
+            logger.info("[Lanes] Pipeline cancelled: session=%s handlers=%d", self.session_id[:12], dropped)
+        return dropped
+
+    async def close(self) -> None:
+        """Cancel all pipeline and background work and wait for it to unwind."""
+        self._closed = True
+        self.cancel_pipeline()
+        tasks = [t for t in (self._worker, *self._background) if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None or not self._queue.empty()
+
+    def stats(self) -> dict:
+        return {
+            "pipeline_running": self._current_label if self._current is not None else None,
+            "pipeline_queued": self._queue.qsize(),
+            "background_tasks": len(self._background),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            label, handler = await self._queue.get()
+            self._current_label = label
+            self._current = asyncio.create_task(self._guarded(label, handler))
+            try:
+                await self._current
+            except asyncio.CancelledError:
+                if self._closed:
+                    raise
+                # Only the handler was cancelled (kill switch) — keep serving the lane
+            finally:
+                self._current = None
+
+    async def _guarded(self, label: str, handler: Handler) -> None:
+        try:
+            await handler()
+        except asyncio.CancelledError:
+            logger.info("[Lanes] Cancelled: session=%s handler=%s", self.session_id[:12], label)
+            raise
+        except Exception as e:
+            logger.error("[Lanes] Handler failed: session=%s handler=%s error=%s",
+                         self.session_id[:12], label, str(e), exc_info=True)
@@ -0,0 +1,216 @@
+"""Session Registry — all per-session gateway state in one record per session.
+
+The gateway's per-session maps (socket, auth context, DS context,
+clarification state, lanes, ...) are fields of a single __slots__
+SessionRecord, so:
+  - teardown is one registry.drop(session_id), not a pop per map plus a
+    periodic scan for whatever was missed
+  - a late write from a task that outlived its socket recreates at most one
+    socket-less record, which sweep() frees after the idle TTL
+  - stats() gives session counts, per-field occupancy and an approximate
+    byte footprint for leak auditing
+
+ws_server keeps its module-level names (_session_auth, _session_contexts,
+...) as SessionFieldView objects — dict-like views of one record field
+across sessions — so existing call sites and importers are unchanged.
+Conversation state (gateway/conversation_state.py) is not in here: it
+deliberately outlives the socket so fragments survive a reconnect.
+"""
+import sys
+import time
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Set
+
+# Per-session fields — None means "not set" for every field
+SESSION_FIELDS = (
+    "websocket",          # active_connections
+    "auth",               # _session_auth
+    "context",            # _session_contexts
+    "clarification",      # _clarification_state
+    "question_count",     # _session_question_count
+    "execution_payload",  # _execution_payloads
+    "biometric",          # _biometric_events
+    "fragment_lock",      # _fragment_locks
+    "lanes",              # _session_lanes
+    "ds_resolve_event",   # _ds_resolve_events
+    "ds_context",         # _ds_context_data
+)
+
+
+class SessionRecord:
+    """Everything the gateway holds for one session."""
+
+    __slots__ = ("session_id", "created_at", "last_active", "execution_ids") + SESSION_FIELDS
+
+    def __init__(self, session_id: str):
+        now = time.monotonic()
+        self.session_id = session_id
+        self.created_at = now
+        self.last_active = now
+        self.execution_ids: Optional[Set[str]] = None  # allocated on first dispatch
+        for field in SESSION_FIELDS:
+            setattr(self, field, None)
+
+    def approx_bytes(self) -> int:
+        """Shallow size of the record and its values, plus one level into dict/list/set values."""
+        total = sys.getsizeof(self) + sys.getsizeof(self.session_id)
+        for field in SESSION_FIELDS + ("execution_ids",):
+            value = getattr(self, field)
+            if value is None:
+                continue
+            total += sys.getsizeof(value)
+            if isinstance(value, dict):
+                total += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+            elif isinstance(value, (list, set, tuple)):
+                total += sum(sys.getsizeof(v) for v in value)
+        return total
+
+
+class SessionRegistry:
+    """session_id → SessionRecord."""
+
+    def __init__(self):
+        self._records: Dict[str, SessionRecord] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._records
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        return self._records.get(session_id)
+
+    def record(self, session_id: str) -> SessionRecord:
+        """The session's record, created if missing; marks the session active."""
+        rec = self._records.get(session_id)
+        if rec is None:
+            rec = self._records[session_id] = SessionRecord(session_id)
+        else:
+            rec.last_active = time.monotonic()
+        return rec
+
+    def touch(self, session_id: str) -> None:
+        rec = self._records.get(session_id)
+        if rec is not None:
+            rec.last_active = time.monotonic()
+
+    def drop(self, session_id: str) -> Optional[SessionRecord]:
+        """Forget the session — all its fields go at once. Returns the record, if any."""
+        return self._records.pop(session_id, None)
+
+    def sweep(self, idle_ttl_s: float, now: Optional[float] = None) -> int:
+        """Drop socket-less records idle for longer than idle_ttl_s. Returns the number dropped."""
+        cutoff = (time.monotonic() if now is None else now) - idle_ttl_s
+        stale = [sid for sid, rec in self._records.items()
+                 if rec.websocket is None and rec.last_active < cutoff]
+        for sid in stale:
+            self._records.pop(sid, None)
+        return len(stale)
+
+    def view(self, field: str) -> "SessionFieldView":
+        if field not in SESSION_FIELDS:
+            raise ValueError(f"Unknown session field: {field}")
+        return SessionFieldView(self, field)
+
+    def stats(self) -> dict:
+        records = list(self._records.values())
+        return {
+            "sessions": len(records),
+            "connected": sum(1 for r in records if r.websocket is not None),
+            "fields": {f: sum(1 for r in records if getattr(r, f) is not None) for f in SESSION_FIELDS},
+            "approx_bytes": sum(r.approx_bytes() for r in records),
+        }
+
+
+class SessionFieldView(MutableMapping):
+    """session_id → one SessionRecord field, as a dict. Writes create the record."""
+
+    __slots__ = ("_registry", "_records", "_field")
+
+    def __init__(self, registry: SessionRegistry, field: str):
+        self._registry = registry
+        self._records = registry._records
+        self._field = field
+
+    def __getitem__(self, session_id: str) -> Any:
+        rec = self._records.get(session_id)
+        value = None if rec is None else getattr(rec, self._field)
+        if value is None:
+            raise KeyError(session_id)
+        return value
+
+    def __setitem__(self, session_id: str, value: Any) -> None:
+        setattr(self._registry.record(session_id), self._field, value)
+
+    def __delitem__(self, session_id: str) -> None:
+        rec = self._records.get(session_id)
+        if rec is None or getattr(rec, self._field) is None:
+            raise KeyError(session_id)
+        setattr(rec, self._field, None)
+
+    def __contains__(self, session_id: object) -> bool:
+        rec = self._records.get(session_id)
+        return rec is not None and getattr(rec, self._field) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        field = self._field
+        return iter([sid for sid, rec in self._records.items() if getattr(rec, field) is not None])
+
+    def __len__(self) -> int:
+        field = self._field
+        return sum(1 for rec in self._records.values() if getattr(rec, field) is not None)
+
+    # Single-probe fast paths (the MutableMapping defaults go through __getitem__ + KeyError)
+    def get(self, session_id: str, default: Any = None) -> Any:
+        rec = self._records.get(session_id)
+        value = None if rec is None else getattr(rec, self._field)
+        return default if value is None else value
+
+    _MISSING = object()
+
+    def pop(self, session_id: str, default: Any = _MISSING) -> Any:
+        rec = self._records.get(session_id)
+        value = None if rec is None else getattr(rec, self._field)
+        if value is None:
+            if default is self._MISSING:
+                raise KeyError(session_id)
+            return default
+        setattr(rec, self._field, None)
+        return value
+
+
+class ExecutionIndex(MutableMapping):
+    """execution_id → session_id, for webhook routing. Each id is also noted on its
+    session's record, so dropping a session frees its entries without a scan."""
+
+    def __init__(self, registry: SessionRegistry):
+        self._registry = registry
+        self._sessions: Dict[str, str] = {}
+
+    def __getitem__(self, execution_id: str) -> str:
+        return self._sessions[execution_id]
+
+    def __setitem__(self, execution_id: str, session_id: str) -> None:
+        self._sessions[execution_id] = session_id
+        rec = self._registry.get(session_id)
+        if rec is not None:
+            if rec.execution_ids is None:
+                rec.execution_ids = set()
+            rec.execution_ids.add(execution_id)
+
+    def __delitem__(self, execution_id: str) -> None:
+        del self._sessions[execution_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._sessions))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, execution_id: str, default: Any = None) -> Any:
+        return self._sessions.get(execution_id, default)
+
+    def forget_session(self, record: SessionRecord) -> None:
+        for execution_id in record.execution_ids or ():
+            if self._sessions.get(execution_id) == record.session_id:
+                self._sessions.pop(execution_id, None)
@@ -0,0 +1,110 @@
+"""TTS delivery — speak a response to the client, streamed when the client supports it.
+
+Clients that negotiated tts_streaming at auth get audio as the provider
+produces it:
+    tts_audio        (stream_id, text + UI fields, no audio) — sent with the first chunk
+    tts_audio_chunk  seq 0..n-1, base64 MP3 pieces in playback order
+    tts_audio_end    chunk_count, audio_size_bytes, complete
+so playback can start at first-chunk latency instead of full-synthesis
+latency. Other clients get the legacy single tts_audio envelope carrying
+the whole file. Either way, no audio (mock TTS, provider failure) falls
+back to a text-only tts_audio for on-device TTS.
+"""
+import base64
+import logging
+import time
+import uuid
+from typing import Optional
+
+from fastapi import WebSocket
+
+from gateway.envelope import encode_envelope
+from schemas.ws_messages import TTSAudioChunkPayload, TTSAudioEndPayload, WSMessageType
+from tts.orchestrator import get_tts_provider
+from tts.provider.interface import TTSProvider
+
+logger = logging.getLogger(__name__)
+
+
+async def send_tts(
+    ws: WebSocket,
+    session_id: str,
+    text: str,
+    *,
+    streaming: bool = False,
+    provider: Optional[TTSProvider] = None,
+    **fields,
+) -> int:
+    """Speak text to the client. fields are the UI hints of the tts_audio
+    payload (auto_record, ui_mode, draft_id, ...). Returns audio bytes sent
+    (0 = text-only fallback)."""
+    provider = provider or get_tts_provider()
+    if streaming:
+        return await _stream(ws, provider, session_id, text, fields)
+
+    result = await provider.synthesize(text)
+    if result.audio_bytes and not result.is_mock:
+        await ws.send_text(encode_envelope(WSMessageType.TTS_AUDIO, {
+            "text": text, "session_id": session_id,
+            "format": result.format, "is_mock": False,
+            "audio": base64.b64encode(result.audio_bytes).decode("ascii"),
+            "audio_size_bytes": len(result.audio_bytes),
+            **fields,
+        }))
+        return len(result.audio_bytes)
+    await _send_text_only(ws, session_id, text, fields)
+    return 0
+
+
+async def _send_text_only(ws: WebSocket, session_id: str, text: str, fields: dict) -> None:
+    await ws.send_text(encode_envelope(WSMessageType.TTS_AUDIO, {
+        "text": text, "session_id": session_id,
+        "format": "text", "is_mock": True,
+        **fields,
+    }))
+
+
+async def _stream(ws: WebSocket, provider: TTSProvider, session_id: str, text: str, fields: dict) -> int:
+    stream_id = uuid.uuid4().hex
+    start = time.monotonic()
+    first_chunk_ms = 0.0
+    seq = 0
+    size = 0
+    complete = True
+    chunks = provider.stream(text)
+    try:
+        async for chunk in chunks:
+            if not seq:
+                first_chunk_ms = (time.monotonic() - start) * 1000
+                await ws.send_text(encode_envelope(WSMessageType.TTS_AUDIO, {
+                    "text": text, "session_id": session_id,
+                    "format": "mp3", "is_mock": False,
+                    "stream_id": stream_id,
+                    **fields,
+                }))
+            await ws.send_text(encode_envelope(WSMessageType.TTS_AUDIO_CHUNK, TTSAudioChunkPayload(
+                stream_id=stream_id, session_id=session_id, seq=seq,
+                audio=base64.b64encode(chunk).decode("ascii"),
+            )))
+            seq += 1
+            size += len(chunk)
+    except Exception as e:
+        if not seq:
+            logger.error("[TTS:STREAM] session=%s provider failed before audio: %s", session_id, str(e))
+        else:
+            logger.error("[TTS:STREAM] session=%s stream=%s failed after %d chunks: %s",
+                         session_id, stream_id, seq, str(e))
+        complete = False
+    finally:
+        await chunks.aclose()
+
+    if not seq:
+        await _send_text_only(ws, session_id, text, fields)
+        return 0
+    await ws.send_text(encode_envelope(WSMessageType.TTS_AUDIO_END, TTSAudioEndPayload(
+        stream_id=stream_id, session_id=session_id,
+        chunk_count=seq, audio_size_bytes=size, complete=complete,
+    )))
+    logger.info("[TTS:STREAM] session=%s stream=%s chunks=%d bytes=%d first_chunk=%.0fms total=%.0fms",
+                session_id, stream_id, seq, size, first_chunk_ms, (time.monotonic() - start) * 1000)
+    return size
@@ -14,11 +14,12 @@ EXECUTION GUARDRAIL (Patch 5 / §3.2):
 """
 import asyncio
 import os
-import base64
 import json
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Dict, List
+from functools import partial
+from typing import Dict, List, MutableMapping
 
 from fastapi import WebSocket, WebSocketDisconnect
 
@@ -33,7 +34,6 @@ from presence.rules import get_heartbeat_interval_ms
 from schemas.audit import AuditEventType
 from schemas.ws_messages import (
     WSMessageType,
-    WSEnvelope,
     AuthPayload,
     AuthOkPayload,
     AuthFailPayload,
@@ -46,8 +46,7 @@ from schemas.ws_messages import (
     TTSAudioPayload,
     ErrorPayload,
 )
-from stt.orchestrator import get_stt_provider, decode_audio_payload
-from tts.orchestrator import get_tts_provider
+from stt.orchestrator import get_stt_provider, decode_audio_payload, decode_audio_frame
 from l1.scout import run_l1_scout
 from transcript.assembler import transcript_assembler
 from transcript.storage import save_transcript
@@ -56,6 +55,12 @@ from intent.gap_filler import SessionContext, parse_capsule_summary, enrich_tran
 from gateway.conversation_state import (
     get_or_create_conversation,
 )
+from gateway.backplane import get_backplane
+from gateway.envelope import encode_envelope
+from gateway.pipeline_dag import PipelineHalt, Stage, run_stages
+from gateway.session_lanes import SessionLanes
+from gateway.session_registry import ExecutionIndex, SessionRegistry
+from gateway.tts_stream import send_tts
 from mandate.store import (
     save_mandate, get_mandate, transition_state,
     delete_mandate, cleanup_session_mandates, MandateState,
@@ -63,48 +68,57 @@ from mandate.store import (
 
 logger = logging.getLogger(__name__)
 
+# All per-session state lives in one record per session (gateway/session_registry.py).
+# The maps below are dict-like views of one record field each; disconnect drops
+# the whole record.
+_sessions = SessionRegistry()
+
 # Active connections: session_id -> WebSocket
-active_connections: Dict[str, WebSocket] = {}
+active_connections: MutableMapping[str, WebSocket] = _sessions.view("websocket")
 # Execution ID -> session_id mapping (for webhook→WS broadcast)
-execution_sessions: Dict[str, str] = {}
+execution_sessions = ExecutionIndex(_sessions)
 # Per-session Digital Self context (pre-loaded at auth, lives for session duration)
-_session_contexts: Dict[str, SessionContext] = {}
+_session_contexts: MutableMapping[str, SessionContext] = _sessions.view("context")
 # Per-session clarification state (tracks pending micro-question loops)
-_clarification_state: Dict[str, dict] = {}
+_clarification_state: MutableMapping[str, dict] = _sessions.view("clarification")
 # Per-session question counter — hard cap at 3 questions per mandate
-_session_question_count: Dict[str, int] = {}
+_session_question_count: MutableMapping[str, int] = _sessions.view("question_count")
 # Per-session dispatch-ready payloads (built by _handle_execute_request, consumed by Stage 2 APPROVE)
-_execution_payloads: Dict[str, dict] = {}
+_execution_payloads: MutableMapping[str, dict] = _sessions.view("execution_payload")
 
 # Max concurrent sessions — prevent unbounded memory growth
 MAX_CONCURRENT_SESSIONS = 500
+# Mandate pipeline stage budgets — on timeout the stage degrades (no DS nodes / raw transcript)
+MANDATE_DS_RECALL_TIMEOUT_S = 4.0   # vector recall + the 2s ds_resolve round trip
+MANDATE_GAP_FILL_TIMEOUT_S = 2.0
 # Track ALL open sockets (including pre-auth) to prevent resource exhaustion
 _open_connections = 0
 # Per-session auth context — stored at WS auth to allow execute_request from
 # within audio_chunk handler (permission grant path needs subscription/tenant/token)
-_session_auth: Dict[str, dict] = {}
+_session_auth: MutableMapping[str, dict] = _sessions.view("auth")
 # Full enriched mandates are now persisted to MongoDB via mandate.store
 # (replaces process-local _pending_mandates dict for crash safety — H1).
 # Biometric auth events — session_id -> {"event": asyncio.Event, "result": dict}
-_biometric_events: Dict[str, dict] = {}
+_biometric_events: MutableMapping[str, dict] = _sessions.view("biometric")
 # Per-session fragment processing lock — ensures fragments are processed sequentially
-_fragment_locks: Dict[str, asyncio.Lock] = {}
+_fragment_locks: MutableMapping[str, asyncio.Lock] = _sessions.view("fragment_lock")
+# Per-session task lanes — pipeline work runs off the receive loop (gateway/session_lanes.py)
+_session_lanes: MutableMapping[str, SessionLanes] = _sessions.view("lanes")
 
 
 
 async def _session_cleanup_loop():
-    """Periodic cleanup of stale session maps — runs every 5 minutes."""
+    """Periodic cleanup of stale session state — runs every 5 minutes.
+
+    Disconnect already drops the session's record; this is the backstop for
+    records recreated by late writes, and for orphaned conversation states.
+    """
     while True:
         await asyncio.sleep(300)
         try:
+            # Socket-less records (late writes after disconnect) idle past the TTL
+            total_stale = _sessions.sweep(get_settings().WS_SESSION_IDLE_TTL_S)
             active_ids = set(_session_auth.keys())
-            # Clean maps for sessions that no longer have auth (disconnected)
-            total_stale = 0
-            for map_dict in [_session_contexts, _clarification_state, _session_question_count, _fragment_locks]:
-                stale = [k for k in map_dict if k not in active_ids]
-                for k in stale:
-                    map_dict.pop(k, None)
-                total_stale += len(stale)
             # Clean orphaned conversation states (sessions that disconnected >5 min ago
             # and never reconnected). We import here to avoid circular dependency.
             from gateway.conversation_state import _conversation_states, _user_session_map
@@ -220,20 +234,18 @@ If a required value is unavailable, use `null`. If an action fails, include `"er
 
 # Per-session DS resolve events — pipeline holds here waiting for device to
 # return readable text for vector-matched node IDs (ds_resolve / ds_context flow)
-_ds_resolve_events: Dict[str, asyncio.Event] = {}
-_ds_context_data: Dict[str, List[Dict]] = {}   # session_id → [{id, text}, ...]
+_ds_resolve_events: MutableMapping[str, asyncio.Event] = _sessions.view("ds_resolve_event")
+_ds_context_data: MutableMapping[str, List[Dict]] = _sessions.view("ds_context")   # session_id → [{id, text}, ...]
 
 
 def _make_envelope(msg_type: WSMessageType, payload: dict) -> str:
-    """Create a JSON string envelope for sending."""
-    envelope = WSEnvelope(type=msg_type, payload=payload)
-    return envelope.model_dump_json()
+    """Create a JSON string envelope for sending (unvalidated fast path — gateway/envelope.py)."""
+    return encode_envelope(msg_type, payload)
 
 
 async def _send(ws: WebSocket, msg_type: WSMessageType, payload_model) -> None:
-    """Send a typed message to the client."""
-    data = _make_envelope(msg_type, payload_model.model_dump())
-    await ws.send_text(data)
+    """Send a typed message to the client. The payload model is serialized once, directly."""
+    await ws.send_text(encode_envelope(msg_type, payload_model))
 
 
 async def _preload_session_context(session_id: str, user_id: str) -> None:
@@ -281,30 +293,63 @@ async def broadcast_to_session(
     """Broadcast a message to the WS client associated with an execution.
 
     Called by the delivery webhook to push pipeline_stage/tts_audio updates to the mobile app.
-    Returns False if no matching session is found — never broadcasts to unrelated sessions.
+    If no local session owns the execution, the message goes to the other workers over
+    the backplane. Returns False if it was neither delivered nor forwarded — never
+    broadcasts to unrelated sessions.
     """
+    try:
+        msg_type = WSMessageType[message_type.upper()] if message_type != "pipeline_stage" else WSMessageType.PIPELINE_STAGE
+    except KeyError:
+        msg_type = WSMessageType.PIPELINE_STAGE
+
     session_id = execution_sessions.get(execution_id)
-    if not session_id:
+    if session_id and session_id in active_connections:
+        return await _deliver_local(session_id, msg_type, payload)
+
+    forwarded = await get_backplane().publish(
+        {"execution_id": execution_id, "type": msg_type.value, "payload": payload},
+    )
+    if not forwarded:
         logger.warning("broadcast_to_session: no session for execution_id=%s", execution_id)
-        return False
+    return forwarded > 0
+
 
+async def send_to_session(session_id: str, msg_type: WSMessageType, payload: dict) -> bool:
+    """Send to a session's socket, wherever it lives: this worker, else forwarded over the backplane."""
+    if session_id in active_connections:
+        return await _deliver_local(session_id, msg_type, payload)
+    return await get_backplane().publish(
+        {"session_id": session_id, "type": msg_type.value, "payload": payload},
+    ) > 0
+
+
+async def _deliver_local(session_id: str, msg_type, payload: dict) -> bool:
     ws = active_connections.get(session_id)
     if not ws:
         return False
-
     try:
-        msg_type = WSMessageType[message_type.upper()] if message_type != "pipeline_stage" else WSMessageType.PIPELINE_STAGE
-    except KeyError:
-        msg_type = WSMessageType.PIPELINE_STAGE
-
-    try:
-        data = _make_envelope(msg_type, payload)
-        await ws.send_text(data)
+        await ws.send_text(_make_envelope(msg_type, payload))
         return True
-    except Exception:
+    except Exception as e:
+        logger.warning("Send to session %s failed: %s", session_id, str(e))
         return False
 
 
+async def _deliver_from_backplane(message: dict) -> None:
+    """Backplane handler — deliver a peer worker's message if the session is ours."""
+    session_id = message.get("session_id") or execution_sessions.get(message.get("execution_id", ""))
+    if session_id and session_id in active_connections:
+        await _deliver_local(session_id, message["type"], message.get("payload") or {})
+
+
+async def start_backplane() -> None:
+    await get_backplane().start(_deliver_from_backplane)
+
+
+async def stop_backplane() -> None:
+    await get_backplane().close()
+
+
 async def handle_ws_connection(websocket: WebSocket) -> None:
     """Main WebSocket handler. Protocol:
 
@@ -398,6 +443,22 @@ async def handle_ws_connection(websocket: WebSocket) -> None:
         session_id = session.session_id
         active_connections[session_id] = websocket
 
+        # Session lanes exist from here on so auth-time background work is
+        # cancelled with the session (the finally block closes them)
+        settings = get_settings()
+        lanes = SessionLanes(
+            session_id,
+            max_pending=settings.WS_PIPELINE_MAX_PENDING,
+            max_background=settings.WS_SESSION_MAX_TASKS,
+        )
+        _session_lanes[session_id] = lanes
+
+        # Warm the user's vector partition (lazy rehydration) while the rest
+        # of the handshake runs, instead of on the first recall
+        if user_id_resolved:
+            from memory.client.vector import ensure_user_loaded
+            lanes.spawn("vector_preload", partial(ensure_user_loaded, user_id_resolved))
+
         # Store per-session auth context + user prefs for mandate enforcement
         _session_auth[session_id] = {
             "subscription_status": subscription_status,
@@ -407,6 +468,7 @@ async def handle_ws_connection(websocket: WebSocket) -> None:
             "delegation_mode":     auth_payload.delegation_mode,
             "ds_paused":           auth_payload.ds_paused,
             "data_residency":      auth_payload.data_residency,
+            "tts_streaming":       auth_payload.tts_streaming,
         }
 
         # Migrate conversation state from old session (if user was capturing fragments)
@@ -519,30 +581,46 @@ async def handle_ws_connection(websocket: WebSocket) -> None:
                 return
 
         # ---- Phase 2: Message Loop ----
+        # Control messages are handled inline; pipeline work runs in the
+        # session's ordered lane so this loop keeps reading while it runs.
+        uid = user_id_resolved or ""
         while True:
-            raw = await websocket.receive_text()
-            msg = json.loads(raw)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            if frame.get("bytes") is not None:
+                # Binary audio frame (stt.orchestrator.AUDIO_FRAME_HEADER + raw audio)
+                if not lanes.submit("audio_frame", partial(
+                    _handle_audio_frame, websocket, session_id, frame["bytes"], user_id=uid,
+                )):
+                    await _send_busy(websocket, "audio_frame")
+                continue
+
+            msg = json.loads(frame["text"])
             msg_type = msg.get("type")
             payload = msg.get("payload", {})
+            work = None   # (label, handler) for the pipeline lane
 
             if msg_type == WSMessageType.HEARTBEAT.value:
                 await _handle_heartbeat(websocket, session_id, payload)
 
             elif msg_type == WSMessageType.AUDIO_CHUNK.value:
-                await _handle_audio_chunk(websocket, session_id, payload, user_id=user_id_resolved or "")
+                work = ("audio_chunk", partial(_handle_audio_chunk, websocket, session_id, payload, user_id=uid))
 
             elif msg_type == WSMessageType.EXECUTE_REQUEST.value:
-                await _handle_execute_request(
+                work = ("execute_request", partial(
+                    _handle_execute_request,
                     websocket, session_id, payload, subscription_status,
-                    user_id=user_id_resolved or "",
+                    user_id=uid,
                     tenant_id=sso_claims.myndlens_tenant_id if sso_claims else "",
                     auth_token=auth_payload.token,
-                )
+                ))
 
             elif msg_type == WSMessageType.CANCEL.value:
                 reason = payload.get("reason", "")
                 logger.info("Cancel received: session=%s reason=%s", session_id, reason)
                 if reason == "kill_switch":
+                    lanes.cancel_pipeline()
                     stt_p = get_stt_provider()
                     stt_p._streams.pop(session_id, None)
                     transcript_assembler.cleanup(session_id)
@@ -550,28 +628,32 @@ async def handle_ws_connection(websocket: WebSocket) -> None:
                     logger.info("Kill switch: pipeline aborted for session=%s", session_id)
                 elif reason == "fragment_captured":
                     # Path A — Capture Cycle: lightweight fragment processing
-                    await _handle_fragment_captured(websocket, session_id, user_id=user_id_resolved or "")
+                    work = ("fragment_captured", partial(_handle_fragment_captured, websocket, session_id, user_id=uid))
                 else:
                     # Path B (legacy) — full pipeline on single utterance
-                    await _handle_stream_end(websocket, session_id, user_id=user_id_resolved or "")
+                    work = ("stream_end", partial(_handle_stream_end, websocket, session_id, user_id=uid))
 
             elif msg_type == WSMessageType.THOUGHT_STREAM_END.value:
                 # Path B — Full Pipeline: user finished thinking, run mandate pipeline
                 logger.info("Thought stream end: session=%s", session_id)
-                await _handle_thought_stream_end(websocket, session_id, user_id=user_id_resolved or "")
+                work = ("thought_stream_end", partial(_handle_thought_stream_end, websocket, session_id, user_id=uid))
 
             elif msg_type == WSMessageType.TEXT_INPUT.value:
-                await _handle_text_input(websocket, session_id, payload, user_id=user_id_resolved or "")
+                work = ("text_input", partial(_handle_text_input, websocket, session_id, payload, user_id=uid))
 
             elif msg_type == WSMessageType.COMMAND_INPUT.value:
-                await _handle_command_input(websocket, session_id, payload, user_id=user_id_resolved or "")
+                work = ("command_input", partial(_handle_command_input, websocket, session_id, payload, user_id=uid))
 
             elif msg_type == WSMessageType.WA_PAIR_REQUEST.value:
-                await _handle_wa_pair_request(websocket, session_id, payload, user_id=user_id_resolved or "")
+                # Independent of the mandate pipeline — runs alongside it
+                if not lanes.spawn("wa_pair_request", partial(
+                    _handle_wa_pair_request, websocket, session_id, payload, user_id=uid,
+                )):
+                    await _send_busy(websocket, msg_type)
 
             elif msg_type == "context_sync":
                 # Device sends full PKG context capsule immediately after auth_ok
-                await _handle_context_sync(session_id, user_id_resolved or "", payload)
+                await _handle_context_sync(session_id, uid, payload)
 
             elif msg_type == WSMessageType.DS_CONTEXT.value:
                 # Device responding to ds_resolve — providing readable text for matched node IDs
@@ -594,6 +676,9 @@ async def handle_ws_connection(websocket: WebSocket) -> None:
                     code="UNKNOWN_MSG_TYPE",
                 ))
 
+            if work is not None and not lanes.submit(*work):
+                await _send_busy(websocket, msg_type)
+
     except WebSocketDisconnect:
         logger.info("WS disconnected: session=%s", session_id)
     except json.JSONDecodeError:
@@ -605,15 +690,17 @@ async def handle_ws_connection(websocket: WebSocket) -> None:
         _open_connections = max(0, _open_connections - 1)
         # Cleanup all per-session in-memory state
         if session_id:
-            active_connections.pop(session_id, None)
-            _session_contexts.pop(session_id, None)
-            _session_auth.pop(session_id, None)
+            # Stop in-flight pipeline / background work before tearing down its state
+            lanes = _session_lanes.get(session_id)
+            if lanes is not None:
+                await lanes.close()
+            # Drop every in-memory map entry for the session at once, including
+            # execution_id → session_id routes
+            record = _sessions.drop(session_id)
+            if record is not None:
+                execution_sessions.forget_session(record)
             # Clean up pending mandates for this session (DB-backed — H1)
             await cleanup_session_mandates(session_id)
-            _clarification_state.pop(session_id, None)
-            _execution_payloads.pop(session_id, None)
-            _session_question_count.pop(session_id, None)
-            _fragment_locks.pop(session_id, None)
             # NOTE: Do NOT call cleanup_conversation(session_id) here.
             # The conversation state (fragments) must survive disconnect so that
             # migrate_conversation_for_user() can recover them on reconnect.
@@ -622,13 +709,12 @@ async def handle_ws_connection(websocket: WebSocket) -> None:
             from proactive.scheduler import unregister_session
             if user_id_resolved:
                 unregister_session(user_id_resolved)
+                # Drop the user's in-memory entity alias index (rebuilt on next use)
+                from memory.client.kv import evict_user as evict_alias_index
+                evict_alias_index(user_id_resolved)
             # Clean self-awareness mode state
             from guardrails.self_awareness import cleanup_mode
             cleanup_mode(session_id)
-            # Clean up execution_sessions entries for this session (prevents memory leak)
-            stale_keys = [k for k, v in execution_sessions.items() if v == session_id]
-            for k in stale_keys:
-                execution_sessions.pop(k, None)
             await terminate_session(session_id)
             await log_audit_event(
                 AuditEventType.SESSION_TERMINATED,
@@ -637,6 +723,20 @@ async def handle_ws_connection(websocket: WebSocket) -> None:
             )
 
 
+async def _send_tts(ws: WebSocket, session_id: str, text: str, **fields) -> int:
+    """Speak text to the client — as ordered audio chunks if it negotiated tts_streaming at auth."""
+    streaming = (_session_auth.get(session_id) or {}).get("tts_streaming", False)
+    return await send_tts(ws, session_id, text, streaming=streaming, **fields)
+
+
+async def _send_busy(ws: WebSocket, msg_type: str) -> None:
+    """Tell the client a message was dropped by the session's lane limits."""
+    await _send(ws, WSMessageType.ERROR, ErrorPayload(
+        message=f"Session busy — {msg_type} dropped",
+        code="SESSION_BUSY",
+    ))
+
+
 async def _handle_heartbeat(ws: WebSocket, session_id: str, payload: dict) -> None:
     """Process a heartbeat message."""
     try:
@@ -999,26 +1099,12 @@ async def _handle_execute_request(
         stage2_text = f"{'All set ' + _fn_stage2 + '. ' if _fn_stage2 else 'All set. '}Agent created. Ready for OpenClaw action. Please Approve."
         logger.info("[EXECUTE:STAGE2_GATE] session=%s draft=%s — artefact ready, awaiting Stage 2 approval",
                     session_id, req.draft_id)
-        _tts_s2 = get_tts_provider()
-        tts_s2 = await _tts_s2.synthesize(stage2_text)
-        if tts_s2.audio_bytes and not tts_s2.is_mock:
-            audio_b64_s2 = base64.b64encode(tts_s2.audio_bytes).decode("ascii")
-            await ws.send_text(_make_envelope(WSMessageType.TTS_AUDIO, {
-                "text": stage2_text, "session_id": session_id,
-                "format": "mp3", "is_mock": False,
-                "audio": audio_b64_s2,
-                "audio_size_bytes": len(tts_s2.audio_bytes),
-                "auto_record": False, "is_clarification": True,
-                "ui_mode": "approval", "awaiting_command": "approve_or_change",
-                "draft_id": req.draft_id,
-            }))
-        else:
-            await _send(ws, WSMessageType.TTS_AUDIO, TTSAudioPayload(
-                text=stage2_text, session_id=session_id, format="text", is_mock=True,
-                auto_record=False, is_clarification=True,
-                ui_mode="approval", awaiting_command="approve_or_change",
-                draft_id=req.draft_id,
-            ))
+        await _send_tts(
+            ws, session_id, stage2_text,
+            auto_record=False, is_clarification=True,
+            ui_mode="approval", awaiting_command="approve_or_change",
+            draft_id=req.draft_id,
+        )
         return  # Pause here — Stage 2 APPROVE will resume dispatch
 
     except DispatchBlockedError as e:
@@ -1040,20 +1126,34 @@ def get_active_session_count() -> int:
     return len(active_connections)
 
 
+def get_session_registry_stats() -> dict:
+    """Per-session state held by this worker: record counts, field occupancy, approx bytes."""
+    return _sessions.stats()
+
+
 # =====================================================
 #  Batch 2: Audio Chunk + Transcript + TTS Handlers
 # =====================================================
 
 async def _handle_audio_chunk(ws: WebSocket, session_id: str, payload: dict, user_id: str = "") -> None:
-    """Process an audio chunk: validate → STT → transcript → respond."""
+    """Process a JSON audio chunk (base64 audio): validate → STT → transcript → respond."""
+    audio_bytes, seq, error = decode_audio_payload(payload)
+    await _process_audio(ws, session_id, audio_bytes, seq, error)
+
+
+async def _handle_audio_frame(ws: WebSocket, session_id: str, frame: bytes, user_id: str = "") -> None:
+    """Process a binary audio frame — same flow, no JSON / base64, audio passed as a view."""
+    audio, seq, error = decode_audio_frame(frame)
+    await _process_audio(ws, session_id, audio, seq, error)
+
+
+async def _process_audio(ws: WebSocket, session_id: str, audio: bytes | memoryview, seq: int, error: str | None) -> None:
     try:
         # If there's a pending permission clarification, clean any stale transcript
         # from previous cycles so "Yes" doesn't get appended to old text
         if _clarification_state.get(session_id, {}).get("pending"):
             transcript_assembler.cleanup(session_id)
 
-        audio_bytes, seq, error = decode_audio_payload(payload)
-
         if error:
             await _send(ws, WSMessageType.ERROR, ErrorPayload(
                 message=error,
@@ -1063,7 +1163,7 @@ async def _handle_audio_chunk(ws: WebSocket, session_id: str, payload: dict, use
 
         # Feed to STT provider
         stt = get_stt_provider()
-        fragment = await stt.feed_audio(session_id, audio_bytes, seq)
+        fragment = await stt.feed_audio(session_id, audio, seq)
 
         if fragment:
             # Add to transcript assembler
@@ -1510,18 +1610,7 @@ async def _handle_command_input(ws: WebSocket, session_id: str, payload: dict, u
                     await delete_mandate(stored_draft_id)
 
                     ack_text = "OpenClaw executing User Mandate Now"
-                    _tts_ack_provider = get_tts_provider()
-                    tts_ack = await _tts_ack_provider.synthesize(ack_text)
-                    if tts_ack.audio_bytes and not tts_ack.is_mock:
-                        await _send(ws, WSMessageType.TTS_AUDIO, TTSAudioPayload(
-                            text=ack_text, session_id=session_id, format="mp3", is_mock=False,
-                            audio=base64.b64encode(tts_ack.audio_bytes).decode("ascii"),
-                            audio_size_bytes=len(tts_ack.audio_bytes),
-                        ))
-                    else:
-                        await _send(ws, WSMessageType.TTS_AUDIO, TTSAudioPayload(
-                            text=ack_text, session_id=session_id, format="text", is_mock=True,
-                        ))
+                    await _send_tts(ws, session_id, ack_text)
                     await log_audit_event(
                         AuditEventType.EXECUTE_REQUESTED, session_id=session_id,
                         details={"draft_id": stored_draft_id, "cycle_id": mandate_cycle_id,
@@ -1763,21 +1852,7 @@ async def _handle_text_input(ws: WebSocket, session_id: str, payload: dict, user
         clarify = _clarification_state.get(session_id)
         if clarify and clarify.get("pending") and clarify.get("question_asked"):
             # Re-ask the pending clarification — user hasn't answered yet
-            tts = get_tts_provider()
-            result = await tts.synthesize(clarify["question_asked"])
-            if result.audio_bytes and not result.is_mock:
-                import base64
-                await ws.send_text(_make_envelope(WSMessageType.TTS_AUDIO, {
-                    "text": clarify["question_asked"], "session_id": session_id,
-                    "format": "mp3", "is_mock": False, "auto_record": True,
-                    "audio": base64.b64encode(result.audio_bytes).decode("ascii"),
-                    "audio_size_bytes": len(result.audio_bytes),
-                }))
-            else:
-                await ws.send_text(_make_envelope(WSMessageType.TTS_AUDIO, {
-                    "text": clarify["question_asked"], "session_id": session_id,
-                    "format": "text", "is_mock": True, "auto_record": True,
-                }))
+            await _send_tts(ws, session_id, clarify["question_asked"], auto_record=True)
         else:
             # No pending clarification — generic "try again" recovery
             recovery = "I didn't catch that. Could you try again?"
@@ -2089,6 +2164,10 @@ async def _send_mock_tts_response(ws: WebSocket, session_id: str, transcript: st
         import uuid
         cycle_id = f"cycle_{uuid.uuid4().hex[:16]}"
 
+    # Every Digital Self recall below (gap fill, L1, dimensions, L2) shares this cycle's memo
+    from memory import recall_memo
+    recall_memo.bind_cycle(cycle_id)
+
     # Reset conversation for fresh mandates (no pending clarification)
     if not _clarification_state.get(session_id, {}).get("pending"):
         conv.reset()
@@ -2113,57 +2192,16 @@ async def _send_mock_tts_response(ws: WebSocket, session_id: str, transcript: st
     )
     await _emit_stage("capture", 0, "done")
 
-    # ── STEP 0.5: DS Vector Query → ds_resolve → ds_context → Gap Fill ────────
+    # ── Mandate pipeline as a stage DAG (gateway/pipeline_dag.py) ──────────
+    # Independent stages overlap: the self-awareness router runs alongside the
+    # DS recall round trip, and the harm check alongside L1 → micro-questions →
+    # dimensions. A stage that answers the user itself (self-awareness answer,
+    # micro-question) raises PipelineHalt, which cancels whatever is in flight.
+    #
+    #   ds_recall ──→ gap_fill ──┐
+    #   self_awareness ──────────┴→ l1 → micro_questions → dimensions ─┐
+    #   self_awareness ─────────────→ harm ────────────────────────────┴→ response → draft → deliver
     session_ctx = _session_contexts.get(session_id)
-    enriched_transcript = transcript
-    matched_nodes: List[Dict] = []
-
-    # 1. Query vector store for user-specific nodes relevant to this transcript
-    if user_id:
-        try:
-            from memory.client.vector import query as vector_query
-            matched = vector_query(
-                query_text=transcript,
-                n_results=3,
-                where={"user_id": user_id},   # USER ISOLATION — never cross-user
-            )
-            if matched:
-                node_ids = [m["id"] for m in matched]
-                logger.info("[DS] Vector matched %d nodes for session=%s", len(node_ids), session_id[:12])
-
-                # 2. Ask device: "resolve these node IDs → send me the readable text"
-                resolve_payload = _make_envelope(
-                    WSMessageType.DS_RESOLVE,
-                    {"node_ids": node_ids, "session_id": session_id},
-                )
-                await ws.send_text(resolve_payload)
-
-                # 3. Await ds_context response from device (max 2 seconds)
-                event = asyncio.Event()
-                _ds_resolve_events[session_id] = event
-                try:
-                    await asyncio.wait_for(event.wait(), timeout=2.0)
-                    matched_nodes = _ds_context_data.pop(session_id, [])
-                    logger.info("[DS] ds_context received: %d nodes for session=%s", len(matched_nodes), session_id[:12])
-                except asyncio.TimeoutError:
-                    logger.warning("[DS] ds_context timeout for session=%s — using fallback session_ctx", session_id[:12])
-                finally:
-                    _ds_resolve_events.pop(session_id, None)
-        except Exception as e:
-            logger.debug("[DS] Vector query skipped: %s", str(e))
-
-    # 4. Gap fill: targeted context if available, else fallback to generic session_ctx
-    if matched_nodes:
-        # Build a targeted SessionContext from the device-provided text
-        targeted_summary = " | ".join(f"{n['text']}" for n in matched_nodes if n.get("text"))
-        targeted_ctx = parse_capsule_summary(targeted_summary, user_id) if targeted_summary else session_ctx
-        enriched_transcript = await enrich_transcript(transcript, targeted_ctx)
-        if enriched_transcript != transcript:
-            logger.info("[MANDATE:0:GAPFILL] session=%s targeted DS gap fill (%d nodes)", session_id, len(matched_nodes))
-    elif session_ctx:
-        enriched_transcript = await enrich_transcript(transcript, session_ctx)
-        if enriched_transcript != transcript:
-            logger.info("[MANDATE:0:GAPFILL] session=%s fallback session_ctx (entities=%d)", session_id, len(session_ctx.entities))
 
     # Extract DS summary for harm check
     context_capsule_summary = session_ctx.raw_summary if session_ctx else ""
@@ -2172,160 +2210,180 @@ async def _send_mock_tts_response(ws: WebSocket, session_id: str, transcript: st
     if not context_capsule and session_ctx and session_ctx.raw_summary:
         context_capsule = json.dumps({"summary": session_ctx.raw_summary})
 
-    # ── STEP 0: Self-Awareness Router — two-mode interaction model ──────────
-    from guardrails.self_awareness import route_self_awareness
-    self_answer = await route_self_awareness(session_id, transcript, _user_first_name)
-    if self_answer:
-        response_text = self_answer
-        # Skip the entire pipeline — just speak the answer
-        tts = get_tts_provider()
-        tts_result = await tts.synthesize(response_text)
-        if tts_result.audio_bytes and not tts_result.is_mock:
-            tts_payload = {
-                "text": response_text, "session_id": session_id,
-                "format": "mp3", "is_mock": False,
-                "audio": base64.b64encode(tts_result.audio_bytes).decode("ascii"),
-                "audio_size_bytes": len(tts_result.audio_bytes),
-                "auto_record": False,
-            }
-            await ws.send_text(_make_envelope(WSMessageType.TTS_AUDIO, tts_payload))
-        else:
-            await _send(ws, WSMessageType.TTS_AUDIO, TTSAudioPayload(
-                text=response_text, session_id=session_id, format="text", is_mock=True,
-            ))
-        logger.info("[SELF_AWARENESS] session=%s answered meta-question", session_id)
-        return
+    # ── STEP 0.5: DS Vector Query → ds_resolve → ds_context → Gap Fill ────────
+    async def _ds_recall() -> List[Dict]:
+        if not user_id:
+            return []
+        # 1. Query vector store for user-specific nodes relevant to this transcript
+        from memory.retriever import recall
+        matched = await recall(   # scoped to user_id — never cross-user
+            user_id=user_id,
+            query_text=transcript,
+            n_results=3,
+        )
+        if not matched:
+            return []
+        node_ids = [m["node_id"] for m in matched]
+        logger.info("[DS] Vector matched %d nodes for session=%s", len(node_ids), session_id[:12])
+
+        # 2. Ask device: "resolve these node IDs → send me the readable text"
+        resolve_payload = _make_envelope(
+            WSMessageType.DS_RESOLVE,
+            {"node_ids": node_ids, "session_id": session_id},
+        )
+        await ws.send_text(resolve_payload)
 
-    # ── STEP 1: L1 Scout — intent classification ────────────────────────────
-    logger.info("[MANDATE:1:L1_SCOUT] session=%s starting intent hypothesis", session_id)
-    await _emit_stage("digital_self", 1, "active", "Classifying intent...")
-
-    l1_draft = await run_l1_scout(
-        session_id=session_id,
-        user_id=user_id,
-        transcript=enriched_transcript,  # enriched for LLM understanding
-        context_capsule=context_capsule,
-        original_transcript=transcript,   # stored in draft for user-facing display
-    )
+        # 3. Await ds_context response from device (max 2 seconds)
+        event = asyncio.Event()
+        _ds_resolve_events[session_id] = event
+        try:
+            await asyncio.wait_for(event.wait(), timeout=2.0)
+            matched_nodes = _ds_context_data.pop(session_id, [])
+            logger.info("[DS] ds_context received: %d nodes for session=%s", len(matched_nodes), session_id[:12])
+            return matched_nodes
+        except asyncio.TimeoutError:
+            logger.warning("[DS] ds_context timeout for session=%s — using fallback session_ctx", session_id[:12])
+            return []
+        finally:
+            _ds_resolve_events.pop(session_id, None)
 
-    # Update session's recent transcript history for next mandate's gap-filling
-    if session_ctx:
-        session_ctx.recent_transcripts.append(transcript[:80])
-        if len(session_ctx.recent_transcripts) > 5:
-            session_ctx.recent_transcripts.pop(0)
+    # 4. Gap fill: targeted context if available, else fallback to generic session_ctx
+    async def _gap_fill(ds_recall: List[Dict]) -> str:
+        if ds_recall:
+            # Build a targeted SessionContext from the device-provided text
+            targeted_summary = " | ".join(f"{n['text']}" for n in ds_recall if n.get("text"))
+            targeted_ctx = parse_capsule_summary(targeted_summary, user_id) if targeted_summary else session_ctx
+            enriched = await enrich_transcript(transcript, targeted_ctx)
+            if enriched != transcript:
+                logger.info("[MANDATE:0:GAPFILL] session=%s targeted DS gap fill (%d nodes)", session_id, len(ds_recall))
+            return enriched
+        if session_ctx:
+            enriched = await enrich_transcript(transcript, session_ctx)
+            if enriched != transcript:
+                logger.info("[MANDATE:0:GAPFILL] session=%s fallback session_ctx (entities=%d)", session_id, len(session_ctx.entities))
+            return enriched
+        return transcript
 
-    if l1_draft.hypotheses:
-        top_h = l1_draft.hypotheses[0]
-        logger.info(
-            "[MANDATE:1:L1_SCOUT] session=%s DONE is_mock=%s hypotheses=%d "
-            "top_action=%s top_confidence=%.2f top_hypothesis='%s' latency_ms=%.0f",
-            session_id, l1_draft.is_mock, len(l1_draft.hypotheses),
-            top_h.intent, top_h.confidence, top_h.hypothesis[:60],
-            l1_draft.latency_ms,
+    # ── STEP 0: Self-Awareness Router — two-mode interaction model ──────────
+    async def _self_awareness() -> None:
+        from guardrails.self_awareness import route_self_awareness
+        self_answer = await route_self_awareness(session_id, transcript, _user_first_name)
+        if self_answer:
+            # Skip the entire pipeline — just speak the answer
+            await _send_tts(ws, session_id, self_answer, auto_record=False)
+            logger.info("[SELF_AWARENESS] session=%s answered meta-question", session_id)
+            raise PipelineHalt("self_awareness", "answered meta-question")
+
+    # ── STEP 1: L1 Scout — intent classification ────────────────────────────
+    async def _l1(gap_fill: str, self_awareness: None):
+        logger.info("[MANDATE:1:L1_SCOUT] session=%s starting intent hypothesis", session_id)
+        l1_draft = await run_l1_scout(
+            session_id=session_id,
+            user_id=user_id,
+            transcript=gap_fill,  # enriched for LLM understanding
+            context_capsule=context_capsule,
+            original_transcript=transcript,   # stored in draft for user-facing display
         )
-    else:
-        logger.warning("[MANDATE:1:L1_SCOUT] session=%s DONE — NO hypotheses returned", session_id)
 
-    await _emit_stage("digital_self", 1, "done")
+        # Update session's recent transcript history for next mandate's gap-filling
+        if session_ctx:
+            session_ctx.recent_transcripts.append(transcript[:80])
+            if len(session_ctx.recent_transcripts) > 5:
+                session_ctx.recent_transcripts.pop(0)
+
+        if l1_draft.hypotheses:
+            top_h = l1_draft.hypotheses[0]
+            logger.info(
+                "[MANDATE:1:L1_SCOUT] session=%s DONE is_mock=%s hypotheses=%d "
+                "top_action=%s top_confidence=%.2f top_hypothesis='%s' latency_ms=%.0f",
+                session_id, l1_draft.is_mock, len(l1_draft.hypotheses),
+                top_h.intent, top_h.confidence, top_h.hypothesis[:60],
+                l1_draft.latency_ms,
+            )
+        else:
+            logger.warning("[MANDATE:1:L1_SCOUT] session=%s DONE — NO hypotheses returned", session_id)
+        return l1_draft
 
     # ── STEP 1.5: Micro-Question Clarification Loop ─────────────────────────
     # RULES: Max 3 questions total. No questions after mandate processing starts.
-    if l1_draft.hypotheses and not l1_draft.is_mock:
-        top_check = l1_draft.hypotheses[0]
+    async def _micro_questions(l1, gap_fill: str) -> None:
+        if not l1.hypotheses or l1.is_mock:
+            return
+        top_check = l1.hypotheses[0]
         from intent.micro_questions import should_ask_micro_questions, generate_micro_questions
 
-        if conv.can_ask_question() and should_ask_micro_questions(top_check.confidence, top_check.dimension_suggestions, top_check.hypothesis):
-            clarify_state = _clarification_state.get(session_id, {})
-            attempt = clarify_state.get("attempts", 0)
-            questions_asked: list = clarify_state.get("questions_asked", [])
+        if not (conv.can_ask_question() and should_ask_micro_questions(top_check.confidence, top_check.dimension_suggestions, top_check.hypothesis)):
+            return
+        clarify_state = _clarification_state.get(session_id, {})
+        attempt = clarify_state.get("attempts", 0)
+        questions_asked: list = clarify_state.get("questions_asked", [])
+        if attempt != 0:
+            return
 
-            if attempt == 0:
-                logger.info("[MANDATE:1.5:MICRO_Q] session=%s generating micro-questions (conf=%.2f)",
-                            session_id, top_check.confidence)
-                await _emit_stage("digital_self", 1, "active", "Asking to clarify...")
+        logger.info("[MANDATE:1.5:MICRO_Q] session=%s generating micro-questions (conf=%.2f)",
+                    session_id, top_check.confidence)
+        await _emit_stage("digital_self", 1, "active", "Asking to clarify...")
 
-                mq_result = await generate_micro_questions(
-                    session_id=session_id,
-                    user_id=user_id,
-                    transcript=transcript,
-                    hypothesis=top_check.hypothesis,
-                    confidence=top_check.confidence,
-                    dimensions=top_check.dimension_suggestions,
-                    already_asked=questions_asked,
-                )
+        mq_result = await generate_micro_questions(
+            session_id=session_id,
+            user_id=user_id,
+            transcript=transcript,
+            hypothesis=top_check.hypothesis,
+            confidence=top_check.confidence,
+            dimensions=top_check.dimension_suggestions,
+            already_asked=questions_asked,
+        )
+        if not mq_result.questions:
+            return
 
-                if mq_result.questions:
-                    question = mq_result.questions[0]
-                    conv.record_question(question.question)
-
-                    _clarification_state[session_id] = {
-                        "pending": True,
-                        "type": "micro",
-                        "original_transcript": transcript,
-                        "enriched_transcript": enriched_transcript,
-                        "question_asked": question.question,
-                        "questions_asked": questions_asked + [question.question],
-                        "context_capsule": context_capsule,
-                        "attempts": 1,
-                        "_cycle_id": cycle_id,
-                    }
-
-                    # Send the question to the client
-                    clarify_payload = {
-                        "question": question.question,
-                        "why": question.why,
-                        "options": question.options,
-                        "dimension": question.dimension_filled,
-                        "session_id": session_id,
-                    }
-                    cq_data = _make_envelope(WSMessageType.CLARIFICATION_QUESTION, clarify_payload)
-                    await ws.send_text(cq_data)
-
-                    # TTS the question so user HEARS it
-                    tts = get_tts_provider()
-                    tts_result = await tts.synthesize(question.question)
-                    if tts_result.audio_bytes and not tts_result.is_mock:
-                        audio_b64 = base64.b64encode(tts_result.audio_bytes).decode("ascii")
-                        tts_payload = {
-                            "text": question.question,
-                            "session_id": session_id,
-                            "format": "mp3",
-                            "is_mock": False,
-                            "audio": audio_b64,
-                            "audio_size_bytes": len(tts_result.audio_bytes),
-                            "is_clarification": True,
-                            "auto_record": True,
-                        }
-                        await ws.send_text(_make_envelope(WSMessageType.TTS_AUDIO, tts_payload))
-                    else:
-                        # Mock TTS — still need auto_record so mic opens after question
-                        mock_payload = {
-                            "text": question.question, "session_id": session_id,
-                            "format": "text", "is_mock": True,
-                            "is_clarification": True, "auto_record": True,
-                        }
-                        await ws.send_text(_make_envelope(WSMessageType.TTS_AUDIO, mock_payload))
+        question = mq_result.questions[0]
+        conv.record_question(question.question)
 
-                    logger.info(
-                        "[MANDATE:1.5:MICRO_Q] session=%s ASKED: '%s' — waiting for response",
-                        session_id, question.question,
-                    )
-                    # STOP pipeline here — wait for user's spoken/typed response
-                    # The response will come as text_input or audio_chunk
-                    # which will be handled by _handle_clarification_response
-                    return
+        _clarification_state[session_id] = {
+            "pending": True,
+            "type": "micro",
+            "original_transcript": transcript,
+            "enriched_transcript": gap_fill,
+            "question_asked": question.question,
+            "questions_asked": questions_asked + [question.question],
+            "context_capsule": context_capsule,
+            "attempts": 1,
+            "_cycle_id": cycle_id,
+        }
 
-    # ── STEP 1.5b: Coherence check (legacy, kept for non-clarification path) ─
-    if l1_draft.hypotheses:
-        top_check = l1_draft.hypotheses[0]
-        # Coherence check removed — L1 Scout (Gemini) is the classifier. Trust it.
+        # Send the question to the client
+        clarify_payload = {
+            "question": question.question,
+            "why": question.why,
+            "options": question.options,
+            "dimension": question.dimension_filled,
+            "session_id": session_id,
+        }
+        cq_data = _make_envelope(WSMessageType.CLARIFICATION_QUESTION, clarify_payload)
+        await ws.send_text(cq_data)
+
+        # TTS the question so user HEARS it
+        # auto_record so the mic opens after the question, audio or not
+        await _send_tts(
+            ws, session_id, question.question,
+            is_clarification=True, auto_record=True,
+        )
 
-    # ── STEP 2: Mandate Dimensions (intent-driven, execution-level) ─────────
-    logger.info("[MANDATE:2:DIMENSIONS] session=%s building mandate dimensions", session_id)
-    await _emit_stage("dimensions", 2, "active", "Building mandate...")
+        logger.info(
+            "[MANDATE:1.5:MICRO_Q] session=%s ASKED: '%s' — waiting for response",
+            session_id, question.question,
+        )
+        # STOP pipeline here — wait for user's spoken/typed response
+        # The response will come as text_input or audio_chunk
+        # which will be handled by _handle_clarification_response
+        raise PipelineHalt("micro_questions", "waiting for clarification")
 
-    if l1_draft.hypotheses and not l1_draft.is_mock:
-        top = l1_draft.hypotheses[0]
+    # ── STEP 2: Mandate Dimensions (intent-driven, execution-level) ─────────
+    async def _dimensions(l1, micro_questions: None):
+        logger.info("[MANDATE:2:DIMENSIONS] session=%s building mandate dimensions", session_id)
+        if not l1.hypotheses or l1.is_mock:
+            return None, []
+        top = l1.hypotheses[0]
         from dimensions.extractor import extract_mandate_dimensions
         mandate = await extract_mandate_dimensions(
             session_id=session_id, user_id=user_id, transcript=transcript,
@@ -2337,7 +2395,7 @@ async def _send_mock_tts_response(ws: WebSocket, session_id: str, transcript: st
         # determine_skills() and OC will only see the hypothesis summary string.
         mandate_data = mandate if isinstance(mandate, dict) else {"raw": mandate}
         await save_mandate(
-            draft_id=l1_draft.draft_id,
+            draft_id=l1.draft_id,
             mandate_data=mandate_data,
             state=MandateState.DIMENSIONS_EXTRACTED,
             session_id=session_id,
@@ -2350,38 +2408,36 @@ async def _send_mock_tts_response(ws: WebSocket, session_id: str, transcript: st
             "[MANDATE:2:DIMENSIONS] session=%s intent=%s actions=%d missing=%d",
             session_id, top.intent, len(mandate.get("actions", [])), len(missing),
         )
-    else:
-        mandate = None
-        missing = []
-
-    await _emit_stage("dimensions", 2, "done")
+        return mandate, missing
 
     # ── STEP 3: Guardrails — LLM harm check ─────────────────────────────────
-    logger.info("[MANDATE:3:GUARDRAILS] session=%s safety check", session_id)
-    await _emit_stage("mandate", 3, "active", "Safety check...")
-
-    from guardrails.engine import _assess_harm_llm
-    harm_check = await _assess_harm_llm(
-        transcript=transcript, ds_context=context_capsule_summary,
-        session_id=session_id, user_id=user_id,
-    )
+    # Needs only the transcript and DS summary, so it runs while L1 / dimensions do.
+    async def _harm(self_awareness: None):
+        logger.info("[MANDATE:3:GUARDRAILS] session=%s safety check", session_id)
+        from guardrails.engine import _assess_harm_llm
+        return await _assess_harm_llm(
+            transcript=transcript, ds_context=context_capsule_summary,
+            session_id=session_id, user_id=user_id,
+        )
 
-    if harm_check.block_execution:
-        name_prefix = f"{_user_first_name}, " if _user_first_name else ""
-        response_text = name_prefix + (harm_check.nudge or "I can't assist with that.")
-        logger.warning("[MANDATE:3:GUARDRAILS] BLOCKED session=%s result=%s reason=%s",
-                       session_id, harm_check.result, harm_check.reason)
-    elif mandate and l1_draft.hypotheses and not l1_draft.is_mock:
-        top = l1_draft.hypotheses[0]
-        summary = mandate.get("mandate_summary", top.hypothesis)
-        missing_count = len(missing)
-
-        if missing_count > 0:
-            # RULE: No questions during mandate processing. All data collection
-            # must happen BEFORE mandate (in Step 1.5 micro-questions).
-            # Log the missing dimensions for debugging but proceed with defaults.
-            logger.info("[MANDATE:2:DIMS] session=%s %d missing dimensions — proceeding with defaults (no questions during mandate)",
-                        session_id, missing_count)
+    async def _response(l1, dimensions, harm) -> str:
+        mandate, missing = dimensions
+        if harm.block_execution:
+            name_prefix = f"{_user_first_name}, " if _user_first_name else ""
+            response_text = name_prefix + (harm.nudge or "I can't assist with that.")
+            logger.warning("[MANDATE:3:GUARDRAILS] BLOCKED session=%s result=%s reason=%s",
+                           session_id, harm.result, harm.reason)
+        elif mandate and l1.hypotheses and not l1.is_mock:
+            top = l1.hypotheses[0]
+            summary = mandate.get("mandate_summary", top.hypothesis)
+            missing_count = len(missing)
+
+            if missing_count > 0:
+                # RULE: No questions during mandate processing. All data collection
+                # must happen BEFORE mandate (in Step 1.5 micro-questions).
+                # Log the missing dimensions for debugging but proceed with defaults.
+                logger.info("[MANDATE:2:DIMS] session=%s %d missing dimensions — proceeding with defaults (no questions during mandate)",
+                            session_id, missing_count)
             # Build TTS: Phase 2 summary ONLY (Stage 2 execution approval is separate)
             name_prefix = f"{_user_first_name}, " if _user_first_name else ""
             sub_intents = top.sub_intents if top.sub_intents else []
@@ -2395,29 +2451,20 @@ async def _send_mock_tts_response(ws: WebSocket, session_id: str, transcript: st
             else:
                 response_text = f"Hi {name_prefix.rstrip(', ')}, {summary}. Shall I proceed?"
         else:
-            name_prefix = f"{_user_first_name}, " if _user_first_name else ""
-            sub_intents = top.sub_intents if top.sub_intents else []
-            if sub_intents and len(sub_intents) > 0:
-                sub_list = ". ".join(str(s) for s in sub_intents[:3] if s)
-                response_text = (
-                    f"Hi {name_prefix.rstrip(', ')}, {summary}. "
-                    f"This covers: {sub_list}. "
-                    f"Shall I proceed?"
-                )
-            else:
-                response_text = f"Hi {name_prefix.rstrip(', ')}, {summary}. Shall I proceed?"
-    else:
-        top_h = l1_draft.hypotheses[0].hypothesis if l1_draft.hypotheses else transcript[:50]
-        response_text = f"Understood: {top_h}. Shall I proceed?"
+            top_h = l1.hypotheses[0].hypothesis if l1.hypotheses else transcript[:50]
+            response_text = f"Understood: {top_h}. Shall I proceed?"
 
-    logger.info("[MANDATE:3:GUARDRAILS] session=%s result=PASS", session_id)
-    await _emit_stage("mandate", 3, "done")
+        logger.info("[MANDATE:3:GUARDRAILS] session=%s result=PASS", session_id)
+        return response_text
 
     # ── STEP 4: Draft update ─────────────────────────────────────────────────
-    if l1_draft.hypotheses:
-        top = l1_draft.hypotheses[0]
+    async def _draft(l1, dimensions, response: str) -> None:
+        if not l1.hypotheses:
+            return
+        mandate, missing = dimensions
+        top = l1.hypotheses[0]
         draft_payload = {
-            "draft_id": l1_draft.draft_id,
+            "draft_id": l1.draft_id,
             "action_class": top.intent,
             "intent": top.intent,
             "hypothesis": top.hypothesis,
@@ -2425,106 +2472,133 @@ async def _send_mock_tts_response(ws: WebSocket, session_id: str, transcript: st
             "confidence": top.confidence,
             "mandate": {k: v for k, v in (mandate or {}).items() if k != "_meta"} if mandate else {},
             "missing_count": len(missing),
-            "is_mock": l1_draft.is_mock,
+            "is_mock": l1.is_mock,
         }
         data = _make_envelope(WSMessageType.DRAFT_UPDATE, draft_payload)
         await ws.send_text(data)
 
     # ── STEP 5: TTS synthesis + Delegation Mode enforcement ─────────────────
-    logger.info("[MANDATE:5:TTS] session=%s synthesizing text='%s'", session_id, response_text[:60])
-    tts = get_tts_provider()
-    result = await tts.synthesize(response_text)
-
-    # Delegation Mode enforcement:
-    #   advisory   → ALWAYS ask for approval ("shall i proceed?")
-    #   assisted   → ask when mandate confidence < threshold (current behaviour)
-    #   delegated  → auto-execute, NEVER ask for approval
-    delegation_mode = (_session_auth.get(session_id) or {}).get("delegation_mode", "assisted")
-
-    if delegation_mode == "delegated":
-        needs_approval = False
-        logger.info("[MANDATE:5:DELEGATION] session=%s mode=delegated → auto-execute", session_id)
-    elif delegation_mode == "advisory":
-        needs_approval = True
-    else:
-        # Assisted: always ask for approval (explicit policy, not text matching)
-        needs_approval = True
-
-    # Persist mandate as APPROVAL_PENDING in DB (H1 — replaces in-memory dict)
-    # First, abort any stale pending mandates for this user to prevent accumulation
-    from mandate.store import abort_all_pending_for_user
-    await abort_all_pending_for_user(user_id, except_draft_id=l1_draft.draft_id)
-
-    mandate_data = mandate if isinstance(mandate, dict) else {"mandate": mandate}
-    mandate_data["original_transcript"] = transcript
-    mandate_data["tts_text"] = response_text
-    await save_mandate(
-        draft_id=l1_draft.draft_id,
-        mandate_data=mandate_data,
-        state=MandateState.APPROVAL_PENDING,
-        session_id=session_id,
-        user_id=user_id,
-        cycle_id=cycle_id,
-    )
+    async def _deliver(l1, dimensions, response: str, draft: None) -> None:
+        mandate, _ = dimensions
+        response_text = response
+        # Delegation Mode enforcement:
+        #   advisory   → ALWAYS ask for approval ("shall i proceed?")
+        #   assisted   → ask when mandate confidence < threshold (current behaviour)
+        #   delegated  → auto-execute, NEVER ask for approval
+        delegation_mode = (_session_auth.get(session_id) or {}).get("delegation_mode", "assisted")
+
+        if delegation_mode == "delegated":
+            needs_approval = False
+            logger.info("[MANDATE:5:DELEGATION] session=%s mode=delegated → auto-execute", session_id)
+        elif delegation_mode == "advisory":
+            needs_approval = True
+        else:
+            # Assisted: always ask for approval (explicit policy, not text matching)
+            needs_approval = True
 
-    if needs_approval:
-        _clarification_state[session_id] = {
-            "pending":             True,
-            "type":                "intent_confirmation",
-            "original_transcript": transcript,
-            "question_asked":      response_text,
-            "context_capsule":     context_capsule,
-            "draft_id":            l1_draft.draft_id,
-            "_cycle_id":           cycle_id,
-        }
-        logger.info("[MANDATE:5:INTENT_GATE] session=%s draft_id=%s — awaiting intent confirmation (Stage 1, tap only)",
-                    session_id, l1_draft.draft_id)
-    else:
-        # Delegated mode: auto-execute immediately
-        auth_ctx = _session_auth.get(session_id, {})
-        asyncio.create_task(_handle_execute_request(
-            ws, session_id,
-            {"session_id": session_id, "draft_id": l1_draft.draft_id},
-            subscription_status=auth_ctx.get("subscription_status", "ACTIVE"),
+        # Persist mandate as APPROVAL_PENDING in DB (H1 — replaces in-memory dict)
+        # First, abort any stale pending mandates for this user to prevent accumulation
+        from mandate.store import abort_all_pending_for_user
+        await abort_all_pending_for_user(user_id, except_draft_id=l1.draft_id)
+
+        mandate_data = mandate if isinstance(mandate, dict) else {"mandate": mandate}
+        mandate_data["original_transcript"] = transcript
+        mandate_data["tts_text"] = response_text
+        await save_mandate(
+            draft_id=l1.draft_id,
+            mandate_data=mandate_data,
+            state=MandateState.APPROVAL_PENDING,
+            session_id=session_id,
             user_id=user_id,
-            tenant_id=auth_ctx.get("tenant_id", ""),
-            auth_token=auth_ctx.get("auth_token", ""),
-        ))
-        logger.info("[MANDATE:5:AUTO_EXECUTE] session=%s draft_id=%s", session_id, l1_draft.draft_id)
-
-    if result.audio_bytes and not result.is_mock:
-        audio_b64 = base64.b64encode(result.audio_bytes).decode("ascii")
-        payload_dict = {
-            "text": response_text, "session_id": session_id,
-            "format": "mp3", "is_mock": False,
-            "audio": audio_b64,
-            "audio_size_bytes": len(result.audio_bytes),
-            "auto_record": False,  # Execution approval = physical tap only, no voice
-            "is_clarification": needs_approval,
-            "ui_mode": "approval" if needs_approval else "executing" if delegation_mode == "delegated" else "idle",
-            "awaiting_command": "approve_or_change" if needs_approval else "none",
-            "draft_id": l1_draft.draft_id if needs_approval else "",
-            "requires_approval": needs_approval,
-        }
-        await ws.send_text(_make_envelope(WSMessageType.TTS_AUDIO, payload_dict))
-        logger.info("[MANDATE:5:TTS] session=%s DONE real_audio bytes=%d", session_id, len(result.audio_bytes))
-    else:
-        payload_dict = {
-            "text": response_text, "session_id": session_id,
-            "format": "text", "is_mock": True,
-            "auto_record": False,  # Execution approval = physical tap only, no voice
-            "is_clarification": needs_approval,
-            "ui_mode": "approval" if needs_approval else "executing" if delegation_mode == "delegated" else "idle",
-            "awaiting_command": "approve_or_change" if needs_approval else "none",
-            "draft_id": l1_draft.draft_id if needs_approval else "",
-            "requires_approval": needs_approval,
-        }
-        await ws.send_text(_make_envelope(WSMessageType.TTS_AUDIO, payload_dict))
-        logger.info("[MANDATE:5:TTS] session=%s DONE mock_text", session_id)
+            cycle_id=cycle_id,
+        )
+
+        if needs_approval:
+            _clarification_state[session_id] = {
+                "pending":             True,
+                "type":                "intent_confirmation",
+                "original_transcript": transcript,
+                "question_asked":      response_text,
+                "context_capsule":     context_capsule,
+                "draft_id":            l1.draft_id,
+                "_cycle_id":           cycle_id,
+            }
+            logger.info("[MANDATE:5:INTENT_GATE] session=%s draft_id=%s — awaiting intent confirmation (Stage 1, tap only)",
+                        session_id, l1.draft_id)
+        else:
+            # Delegated mode: auto-execute immediately
+            auth_ctx = _session_auth.get(session_id, {})
+            asyncio.create_task(_handle_execute_request(
+                ws, session_id,
+                {"session_id": session_id, "draft_id": l1.draft_id},
+                subscription_status=auth_ctx.get("subscription_status", "ACTIVE"),
+                user_id=user_id,
+                tenant_id=auth_ctx.get("tenant_id", ""),
+                auth_token=auth_ctx.get("auth_token", ""),
+            ))
+            logger.info("[MANDATE:5:AUTO_EXECUTE] session=%s draft_id=%s", session_id, l1.draft_id)
+
+        logger.info("[MANDATE:5:TTS] session=%s synthesizing text='%s'", session_id, response_text[:60])
+        audio_size = await _send_tts(
+            ws, session_id, response_text,
+            auto_record=False,  # Execution approval = physical tap only, no voice
+            is_clarification=needs_approval,
+            ui_mode="approval" if needs_approval else "executing" if delegation_mode == "delegated" else "idle",
+            awaiting_command="approve_or_change" if needs_approval else "none",
+            draft_id=l1.draft_id if needs_approval else "",
+            requires_approval=needs_approval,
+        )
+        if audio_size:
+            logger.info("[MANDATE:5:TTS] session=%s DONE real_audio bytes=%d", session_id, audio_size)
+        else:
+            logger.info("[MANDATE:5:TTS] session=%s DONE mock_text", session_id)
+
+    # Pipeline-stage UI events, in the order the client expects them
+    stage_ui = {
+        "l1": ("digital_self", 1, "Classifying intent..."),
+        "dimensions": ("dimensions", 2, "Building mandate..."),
+        "response": ("mandate", 3, "Safety check..."),
+    }
+    stage_ms: Dict[str, float] = {}
+
+    async def _on_stage(name: str, status: str, elapsed_ms: float) -> None:
+        ui = stage_ui.get(name)
+        if status == "started":
+            if ui:
+                await _emit_stage(ui[0], ui[1], "active", ui[2])
+            return
+        stage_ms[name] = elapsed_ms
+        if ui and status in ("done", "fallback"):
+            await _emit_stage(ui[0], ui[1], "done")
 
+    pipeline_start = time.monotonic()
+    try:
+        results = await run_stages([
+            Stage("ds_recall", _ds_recall, timeout_s=MANDATE_DS_RECALL_TIMEOUT_S, fallback=[]),
+            Stage("gap_fill", _gap_fill, needs=("ds_recall",), timeout_s=MANDATE_GAP_FILL_TIMEOUT_S, fallback=transcript),
+            Stage("self_awareness", _self_awareness),
+            Stage("l1", _l1, needs=("gap_fill", "self_awareness")),
+            Stage("micro_questions", _micro_questions, needs=("l1", "gap_fill")),
+            Stage("dimensions", _dimensions, needs=("l1", "micro_questions")),
+            Stage("harm", _harm, needs=("self_awareness",)),
+            Stage("response", _response, needs=("l1", "dimensions", "harm")),
+            Stage("draft", _draft, needs=("l1", "dimensions", "response")),
+            Stage("deliver", _deliver, needs=("l1", "dimensions", "response", "draft")),
+        ], on_event=_on_stage)
+    except PipelineHalt as halt:
+        logger.info("[MANDATE:HALT] session=%s stage=%s reason=%s total=%.0fms",
+                    session_id, halt.stage, halt.reason, (time.monotonic() - pipeline_start) * 1000)
+        return
+
+    l1_draft = results["l1"]
     logger.info(
         "[MANDATE:COMPLETE] session=%s l1_mock=%s hypotheses=%d response='%s'",
         session_id, l1_draft.is_mock,
-        len(l1_draft.hypotheses), response_text[:60],
+        len(l1_draft.hypotheses), results["response"][:60],
+    )
+    logger.info(
+        "[MANDATE:TIMING] session=%s total=%.0fms stages_sum=%.0fms %s",
+        session_id, (time.monotonic() - pipeline_start) * 1000, sum(stage_ms.values()),
+        " ".join(f"{name}={ms:.0f}" for name, ms in stage_ms.items()),
     )
 
@@ -27,6 +27,8 @@ async def create_backup(user_id: str, include_audit: bool = True) -> Dict[str, A
 
     # MyndLens-owned: Digital Self
     graphs = await db.graphs.find({"user_id": user_id}).to_list(100)
+    graph_nodes = await db.graph_nodes.find({"user_id": user_id}).to_list(None)
+    graph_edges = await db.graph_edges.find({"user_id": user_id}).to_list(None)
     entities = await db.entity_registry.find({"user_id": user_id}).to_list(1000)
 
     # MyndLens-owned: Audit events (MyndLens side only)
@@ -34,7 +36,7 @@ async def create_backup(user_id: str, include_audit: bool = True) -> Dict[str, A
     if include_audit:
         audit_events = await db.audit_events.find({"user_id": user_id}).to_list(10000)
 
-    for collection in [graphs, entities, audit_events]:
+    for collection in [graphs, graph_nodes, graph_edges, entities, audit_events]:
         for doc in collection:
             doc.pop("_id", None)
 
@@ -45,11 +47,15 @@ async def create_backup(user_id: str, include_audit: bool = True) -> Dict[str, A
         "scope": "myndlens_owned_only",
         "data": {
             "graphs": graphs,
+            "graph_nodes": graph_nodes,
+            "graph_edges": graph_edges,
             "entities": entities,
             "audit_events": audit_events,
         },
         "counts": {
             "graphs": len(graphs),
+            "graph_nodes": len(graph_nodes),
+            "graph_edges": len(graph_edges),
             "entities": len(entities),
             "audit_events": len(audit_events),
         },
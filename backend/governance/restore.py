@@ -7,7 +7,10 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Dict
 
+from pymongo import UpdateOne
+
 from core.database import get_db
+from memory.client import graph, kv
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +20,8 @@ async def restore_from_backup(backup_id: str) -> Dict[str, Any]:
     
     Provenance preservation:
       - All restored nodes keep their original provenance flags
-      - Graph structure preserved via node_link_data format
+      - Graph structure preserved via per-node/per-edge documents
+        (older snapshots: node_link_data blob, converted on restore)
       - Entity references preserved via canonical IDs
     """
     db = get_db()
@@ -30,15 +34,42 @@ async def restore_from_backup(backup_id: str) -> Dict[str, Any]:
     data = snapshot["data"]
     counts = {}
 
-    # Restore graphs (provenance preserved in node attributes)
+    # Restore graphs (provenance preserved in node attributes). Older snapshots
+    # hold a node_link_data blob: it is written as per-node/per-edge documents,
+    # since load_graph() only reads the blob for users with no node documents.
+    node_docs = list(data.get("graph_nodes", []))
+    edge_docs = list(data.get("graph_edges", []))
     for graph_doc in data.get("graphs", []):
-        await db.graphs.update_one(
-            {"user_id": graph_doc["user_id"]},
-            {"$set": graph_doc},
-            upsert=True,
-        )
+        if "graph_data" in graph_doc:
+            nodes, edges = graph.legacy_documents(graph_doc["user_id"], graph_doc["graph_data"])
+            node_docs.extend(nodes)
+            edge_docs.extend(edges)
     counts["graphs"] = len(data.get("graphs", []))
 
+    node_ops = [
+        UpdateOne({"user_id": d["user_id"], "node_id": d["node_id"]}, {"$set": d}, upsert=True)
+        for d in node_docs
+    ]
+    if node_ops:
+        await db.graph_nodes.bulk_write(node_ops, ordered=False)
+    counts["graph_nodes"] = len(node_ops)
+
+    edge_ops = [
+        UpdateOne({"user_id": d["user_id"], "source": d["source"], "target": d["target"]}, {"$set": d}, upsert=True)
+        for d in edge_docs
+    ]
+    if edge_ops:
+        await db.graph_edges.bulk_write(edge_ops, ordered=False)
+    counts["graph_edges"] = len(edge_ops)
+
+    # Cached graphs predate the restore — a clean one would serve stale nodes,
+    # a dirty one would be flushed over the restored documents
+    graph_users = {user_id} | {
+        d["user_id"] for key in ("graphs", "graph_nodes", "graph_edges") for d in data.get(key, [])
+    }
+    for uid in graph_users:
+        graph.evict(uid)
+
     # Restore entities (canonical IDs preserved)
     for entity_doc in data.get("entities", []):
         await db.entity_registry.update_one(
@@ -47,6 +78,8 @@ async def restore_from_backup(backup_id: str) -> Dict[str, Any]:
             upsert=True,
         )
     counts["entities"] = len(data.get("entities", []))
+    for uid in {user_id} | {d["user_id"] for d in data.get("entities", [])}:
+        kv.evict_user(uid)
 
     # Restore sessions
     for session_doc in data.get("sessions", []):
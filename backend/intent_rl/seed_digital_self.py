@@ -137,28 +137,23 @@ async def clear_digital_self() -> dict:
 
     db = get_db()
 
-    # Clear vector store entries for this user
+    # Clear vector store entries for this user (memory, MongoDB and snapshot)
     try:
-        all_docs = vector._collection.get(where={"user_id": RL_USER_ID})
-        if all_docs and all_docs["ids"]:
-            vector._collection.delete(ids=all_docs["ids"])
-            deleted_vectors = len(all_docs["ids"])
-        else:
-            deleted_vectors = 0
-    except Exception:
+        deleted_vectors = await vector.delete_user(RL_USER_ID)
+    except Exception as e:
+        logger.warning("[RL Seed] Vector clear failed: %s", e)
         deleted_vectors = 0
 
-    # Clear graph
-    if RL_USER_ID in graph._graphs:
-        del graph._graphs[RL_USER_ID]
+    # Clear graph (memory + per-node/per-edge documents)
+    graph_docs_deleted = await graph.delete_graph(RL_USER_ID)
 
     # Clear from MongoDB
-    del_graph = await db.graphs.delete_many({"user_id": RL_USER_ID})
     del_entities = await db.entity_registry.delete_many({"user_id": RL_USER_ID})
+    kv.evict_user(RL_USER_ID)
 
     stats = {
         "vectors_deleted": deleted_vectors,
-        "graph_docs_deleted": del_graph.deleted_count,
+        "graph_docs_deleted": graph_docs_deleted,
         "entities_deleted": del_entities.deleted_count,
     }
     logger.info("[RL Seed] Digital Self cleared: %s", stats)
@@ -11,6 +11,7 @@ Architecture:
 
 Tools:
   search_memory     — RAG vector search across all DS data
+  search_memory_batch — several searches in one embedding/vector pass
   get_contact       — full contact profile with active threads
   get_pending_actions — all pending actions across all contacts
   get_active_threads — active conversations, filtered by type
@@ -87,6 +88,24 @@ async def search_memory(
     return {"results": results, "count": len(results)}
 
 
+@mcp_tool("search_memory_batch", "Run several Digital Self memory searches in one pass. Returns one result list per query, in order.")
+async def search_memory_batch(
+    user_id: str,
+    queries: List[str],
+    n_results: int = 5,
+    include_confidential: bool = False,
+) -> Dict[str, Any]:
+    """Batched RAG vector search — one embedding batch, one graph load."""
+    from memory.retriever import recall_many
+    rows = await recall_many(
+        user_id=user_id,
+        queries=queries,
+        n_results=n_results,
+        include_confidential=include_confidential,
+    )
+    return {"results": rows, "count": sum(len(r) for r in rows)}
+
+
 @mcp_tool("get_contact", "Get full Digital Self profile for a specific contact by name or phone.")
 async def get_contact(
     user_id: str,
@@ -95,29 +114,21 @@ async def get_contact(
     include_confidential: bool = False,
 ) -> Dict[str, Any]:
     """Full contact profile with active threads, pending actions, pattern."""
-    from memory.retriever import recall
+    from memory.retriever import lookup_by_name
 
     query = name or phone
     if not query:
         return {"error": "name or phone required"}
 
-    # Search vector store for this contact
-    results = await recall(
+    # Name / phone lookup in the lexical index — no embedding or vector search
+    contact_docs = await lookup_by_name(
         user_id=user_id,
-        query_text=f"contact {query}",
-        n_results=10,
+        name=name,
+        phone=phone,
         include_confidential=include_confidential,
+        limit=10,
     )
 
-    # Filter to results about this specific contact
-    contact_docs = []
-    for r in results:
-        meta = r.get("metadata", {})
-        contact_name = meta.get("contact_name", "").lower()
-        contact_id = meta.get("contact_id", "").lower()
-        if name.lower() in contact_name or (phone and phone in contact_id):
-            contact_docs.append(r)
-
     if not contact_docs:
         return {"found": False, "query": query}
 
@@ -139,17 +150,14 @@ async def get_pending_actions(
     include_confidential: bool = False,
 ) -> Dict[str, Any]:
     """All pending actions across all contacts."""
-    from memory.retriever import recall
+    from memory.retriever import recall_many
 
-    user_owes = await recall(
+    user_owes, they_owe = await recall_many(
         user_id=user_id,
-        query_text="user owes pending action commitment deadline",
-        n_results=10,
-        include_confidential=include_confidential,
-    )
-    they_owe = await recall(
-        user_id=user_id,
-        query_text="owes user waiting on promised committed",
+        queries=[
+            "user owes pending action commitment deadline",
+            "owes user waiting on promised committed",
+        ],
         n_results=10,
         include_confidential=include_confidential,
     )
@@ -9,9 +9,22 @@ Why ONNX over ChromaDB default:
 - Persistent: vectors can be stored + reloaded without re-embedding
 - Fast: ONNX Runtime is significantly faster than sentence-transformers
 - Portable: same model runs on any platform with onnxruntime
+
+Async callers should use embed_async() / embed_one_async(): requests from
+all sessions are queued and merged into a single ONNX batch that runs on a
+dedicated worker thread, so the event loop never blocks on inference.
+Batch size and max wait are tuned via EMBED_BATCH_MAX_SIZE / EMBED_BATCH_MAX_WAIT_MS.
+
+warm_up() loads the model and runs one dummy batch at startup; is_ready()
+stays False until it finishes, so readiness probes hold traffic back.
+ONNX Runtime threads and graph optimization come from EMBED_ONNX_* settings —
+match the thread counts to the container CPU limit.
 """
+import asyncio
 import logging
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -19,16 +32,61 @@ _model = None
 MODEL_NAME = "BAAI/bge-small-en-v1.5"  # 384-dim, quantized, fast
 
 
+_GRAPH_OPT_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+
 def _get_model():
     global _model
     if _model is None:
         from fastembed import TextEmbedding
+        from config.settings import get_settings
+        settings = get_settings()
         logger.info("[ONNX Embedder] Loading model: %s", MODEL_NAME)
-        _model = TextEmbedding(model_name=MODEL_NAME)
+        model = TextEmbedding(model_name=MODEL_NAME, threads=settings.EMBED_ONNX_INTRA_OP_THREADS or None)
+        _apply_session_options(model, settings)
+        _model = model
         logger.info("[ONNX Embedder] Model ready: %s", MODEL_NAME)
     return _model
 
 
+def _apply_session_options(model, settings) -> None:
+    """Rebuild the ONNX session when settings differ from fastembed's defaults.
+
+    fastembed sets intra- and inter-op threads to the same value and always
+    uses ORT_ENABLE_ALL; anything else needs our own SessionOptions.
+    """
+    intra = settings.EMBED_ONNX_INTRA_OP_THREADS
+    inter = settings.EMBED_ONNX_INTER_OP_THREADS
+    level = settings.EMBED_ONNX_GRAPH_OPT_LEVEL
+    if (not inter or inter == intra) and level == "all":
+        return
+    onnx_model = getattr(model, "model", None)
+    session = getattr(onnx_model, "model", None)
+    if session is None:
+        logger.warning("[ONNX Embedder] Session not reachable — EMBED_ONNX_* options ignored")
+        return
+
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, _GRAPH_OPT_LEVELS[level])
+    if intra:
+        options.intra_op_num_threads = intra
+    if inter:
+        options.inter_op_num_threads = inter
+        if inter > 1:
+            # Inter-op threads are only used in parallel execution mode
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    onnx_model.model = ort.InferenceSession(
+        session._model_path, sess_options=options, providers=session.get_providers(),
+    )
+    logger.info("[ONNX Embedder] Session options: intra=%s inter=%s graph=%s", intra or "auto", inter or "auto", level)
+
+
 def embed(texts: List[str]) -> List[List[float]]:
     """Generate embeddings for a list of texts.
 
@@ -48,3 +106,186 @@ def embed_one(text: str) -> List[float]:
 def dimension() -> int:
     """Return embedding dimension (384 for bge-small-en-v1.5)."""
     return 384
+
+
+# ── Async micro-batching service ────────────────────────────────────────────
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into single ONNX batches.
+
+    Callers await embed(); a worker task drains the queue, waiting at most
+    max_wait_ms for more requests once the first one arrives, and runs the
+    merged batch on a single dedicated thread (ONNX Runtime already
+    parallelises inside one call — extra threads only add contention).
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="onnx-embed")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch: List[Tuple[List[str], asyncio.Future]] = []  # taken off the queue, not yet resolved
+        self.batches_run = 0
+        self.texts_embedded = 0
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # Queue + worker are bound to the loop that created them
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        queue = self._ensure_worker()
+        fut = asyncio.get_running_loop().create_future()
+        queue.put_nowait((list(texts), fut))
+        return await fut
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[List[str], asyncio.Future]] = [await queue.get()]
+            self._batch = batch
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait_s
+            while size < self.max_batch_size:
+                remaining = deadline - loop.time()
+                try:
+                    item = queue.get_nowait() if remaining <= 0 else await asyncio.wait_for(queue.get(), remaining)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            flat = [t for texts, _ in batch for t in texts]
+            try:
+                vectors = await loop.run_in_executor(self._executor, embed, flat)
+            except Exception as e:
+                logger.error("[ONNX Embedder] Batch of %d failed: %s", len(flat), str(e))
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.texts_embedded += len(flat)
+            offset = 0
+            for texts, fut in batch:
+                if not fut.done():
+                    fut.set_result(vectors[offset:offset + len(texts)])
+                offset += len(texts)
+            logger.debug("[ONNX Embedder] Batch: requests=%d texts=%d", len(batch), len(flat))
+
+    async def close(self) -> None:
+        """Stop the worker and fail every request it will no longer serve.
+
+        Callers awaiting embed() — queued or in the batch being cancelled —
+        get RuntimeError instead of hanging past shutdown.
+        """
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        orphaned = [fut for _, fut in self._batch]
+        while self._queue is not None and not self._queue.empty():
+            orphaned.append(self._queue.get_nowait()[1])
+        for fut in orphaned:
+            if not fut.done():
+                fut.set_exception(RuntimeError("embedder shut down"))
+        self._batch = []
+        self._worker = None
+        self._queue = None
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches_run": self.batches_run,
+            "texts_embedded": self.texts_embedded,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_s * 1000.0,
+        }
+
+
+_batcher: Optional[EmbeddingBatcher] = None
+
+
+def get_batcher() -> EmbeddingBatcher:
+    global _batcher
+    if _batcher is None:
+        from config.settings import get_settings
+        settings = get_settings()
+        _batcher = EmbeddingBatcher(
+            max_batch_size=settings.EMBED_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBED_BATCH_MAX_WAIT_MS,
+        )
+    return _batcher
+
+
+async def embed_async(texts: List[str]) -> List[List[float]]:
+    """Embed texts via the shared micro-batcher without blocking the event loop."""
+    return await get_batcher().embed(texts)
+
+
+async def embed_one_async(text: str) -> List[float]:
+    """Embed a single text via the shared micro-batcher."""
+    return (await embed_async([text]))[0]
+
+
+# ── Warm-up / readiness ─────────────────────────────────────────────────────
+
+_warmup: Dict[str, Any] = {"state": "cold", "ms": None, "error": None}
+
+
+async def warm_up() -> None:
+    """Load the model and embed one dummy batch through the batcher (lifespan startup).
+
+    The first real request then pays neither the model load nor ONNX
+    Runtime's first-run allocation.
+    """
+    from config.settings import get_settings
+    settings = get_settings()
+    if not settings.EMBED_WARMUP:
+        _warmup["state"] = "skipped"
+        return
+    _warmup["state"] = "warming"
+    start = time.monotonic()
+    try:
+        await embed_async(["MyndLens warm-up"] * max(1, settings.EMBED_BATCH_MAX_SIZE))
+    except Exception as e:
+        _warmup.update(state="failed", error=str(e))
+        logger.error("[ONNX Embedder] Warm-up failed: %s", e)
+        return
+    _warmup.update(state="ready", ms=round((time.monotonic() - start) * 1000, 1))
+    logger.info("[ONNX Embedder] Warm-up complete in %.0fms", _warmup["ms"])
+
+
+def is_ready() -> bool:
+    """True once warm-up has finished (or was disabled)."""
+    return _warmup["state"] in ("ready", "skipped")
+
+
+def get_status() -> Dict[str, Any]:
+    return {
+        "model": MODEL_NAME,
+        "ready": is_ready(),
+        "warmup_state": _warmup["state"],
+        "warmup_ms": _warmup["ms"],
+        "warmup_error": _warmup["error"],
+    }
+
+
+async def shutdown_batcher() -> None:
+    """Stop the batching worker (called from the FastAPI lifespan shutdown)."""
+    global _batcher
+    if _batcher is not None:
+        await _batcher.close()
+        _batcher = None
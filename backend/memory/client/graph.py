@@ -2,28 +2,168 @@
 
 Deterministic layer: nodes with canonical UUIDs,
 typed relationships (FACT, PREFERENCE, ENTITY, HISTORY, POLICY).
-Persisted to MongoDB.
+Persisted to MongoDB incrementally: one document per node (`graph_nodes`)
+and per edge (`graph_edges`). Mutations mark nodes/edges dirty and
+persist_graph() upserts only those, so a write costs O(changed) and no
+user's graph is bound by the 16 MB document limit.
+
+In memory, per-user graphs live in a bounded LRU cache
+(GRAPH_CACHE_MAX_BYTES). Least-recently-used users are flushed and evicted
+when the estimated footprint exceeds the budget; ensure_loaded() brings
+them back. The budget is enforced on load and on persist_graph(), not per
+mutation: every write path (memory.retriever) ends its mutations with
+persist_graph(), so the cache overshoots by at most one call's writes. Each cached graph also keeps a compact index — interned node
+ids with array-backed type / provenance / out-degree — for the lookups
+recall() does per hit (node_summary).
 """
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import networkx as nx
+from pymongo import UpdateOne
 
+from config.settings import get_settings
 from core.database import get_db
 
 logger = logging.getLogger(__name__)
 
-# Per-user graphs
-_graphs: Dict[str, nx.DiGraph] = {}
-
 EDGE_TYPES = {"FACT", "PREFERENCE", "ENTITY", "HISTORY", "POLICY"}
 
+# Rough per-element costs of a NetworkX DiGraph (node: attr dict + succ/pred
+# adjacency dicts; edge: two adjacency entries + attr dict) plus the compact index.
+_NODE_OVERHEAD = 640
+_EDGE_OVERHEAD = 360
+
+# Interned type / provenance labels shared by every user's compact index (0 = unset)
+_labels: List[Optional[str]] = [None]
+_label_codes: Dict[Optional[str], int] = {None: 0}
+
+
+def _label(value: Any) -> int:
+    key = value if value is None else str(value)
+    code = _label_codes.get(key)
+    if code is None:
+        code = len(_labels)
+        _labels.append(key)
+        _label_codes[key] = code
+    return code
+
+
+def _attr_bytes(attrs: Dict[str, Any]) -> int:
+    return sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in attrs.items())
+
+
+class _UserGraph:
+    """One cached user graph: canonical DiGraph + compact hot-path index + dirty sets."""
+
+    __slots__ = ("g", "index", "free", "types", "provs", "out_deg", "nbytes",
+                 "dirty_nodes", "dirty_edges", "loaded")
+
+    def __init__(self, g: Optional[nx.DiGraph] = None, loaded: bool = False):
+        self.g = g if g is not None else nx.DiGraph()
+        self.index: Dict[str, int] = {}
+        self.free: List[int] = []   # slots of removed nodes, reused before growing
+        self.types = array("H")
+        self.provs = array("H")
+        self.out_deg = array("I")
+        self.nbytes = 0
+        self.dirty_nodes: Set[str] = set()
+        self.dirty_edges: Set[Tuple[str, str]] = set()
+        self.loaded = loaded
+        for node_id, attrs in self.g.nodes(data=True):
+            self._index_node(node_id, attrs)
+            self.nbytes += _NODE_OVERHEAD + _attr_bytes(attrs)
+        for u, _v, attrs in self.g.edges(data=True):
+            self.out_deg[self.index[u]] += 1
+            self.nbytes += _EDGE_OVERHEAD + _attr_bytes(attrs)
+
+    def _index_node(self, node_id: str, attrs: Dict[str, Any]) -> int:
+        slot = self.index.get(node_id)
+        if slot is None:
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = len(self.types)
+                self.types.append(0)
+                self.provs.append(0)
+                self.out_deg.append(0)
+            self.index[node_id] = slot
+        self.types[slot] = _label(attrs.get("type"))
+        self.provs[slot] = _label(attrs.get("provenance"))
+        return slot
+
+    def add_node(self, node_id: str, attrs: Dict[str, Any]) -> None:
+        if node_id in self.g:
+            self.nbytes -= _attr_bytes(self.g.nodes[node_id])
+        else:
+            self.nbytes += _NODE_OVERHEAD
+        self.g.add_node(node_id, **attrs)
+        merged = self.g.nodes[node_id]
+        self.nbytes += _attr_bytes(merged)
+        self._index_node(node_id, merged)
+        self.dirty_nodes.add(node_id)
+
+    def add_edge(self, source: str, target: str, attrs: Dict[str, Any]) -> None:
+        for endpoint in (source, target):
+            if endpoint not in self.g:
+                self.add_node(endpoint, {})   # created implicitly, as nx would
+        if self.g.has_edge(source, target):
+            self.nbytes -= _attr_bytes(self.g.edges[source, target])
+        else:
+            self.nbytes += _EDGE_OVERHEAD
+            self.out_deg[self.index[source]] += 1
+        self.g.add_edge(source, target, **attrs)
+        self.nbytes += _attr_bytes(self.g.edges[source, target])
+        self.dirty_edges.add((source, target))
+
+    def remove_node(self, node_id: str) -> None:
+        """Drop a node and its edges. Its compact-index slot goes on the free list."""
+        g = self.g
+        for u, _v, attrs in g.in_edges(node_id, data=True):
+            if u == node_id:
+                continue   # self-loop: counted once, with the out-edges
+            self.out_deg[self.index[u]] -= 1
+            self.nbytes -= _EDGE_OVERHEAD + _attr_bytes(attrs)
+        for _u, _v, attrs in g.out_edges(node_id, data=True):
+            self.nbytes -= _EDGE_OVERHEAD + _attr_bytes(attrs)
+        self.nbytes -= _NODE_OVERHEAD + _attr_bytes(g.nodes[node_id])
+        g.remove_node(node_id)
+        slot = self.index.pop(node_id)
+        self.types[slot] = self.provs[slot] = self.out_deg[slot] = 0
+        self.free.append(slot)
+        self.dirty_nodes.discard(node_id)
+        self.dirty_edges = {(u, v) for u, v in self.dirty_edges if node_id not in (u, v)}
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.dirty_nodes or self.dirty_edges)
+
+
+# Per-user graphs, least recently used first
+_cache: "OrderedDict[str, _UserGraph]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "eviction_flushes": 0}
+
+
+def _entry(user_id: str) -> _UserGraph:
+    entry = _cache.get(user_id)
+    if entry is None:
+        entry = _cache[user_id] = _UserGraph()
+    else:
+        _cache.move_to_end(user_id)
+    return entry
+
 
 def get_graph(user_id: str) -> nx.DiGraph:
-    if user_id not in _graphs:
-        _graphs[user_id] = nx.DiGraph()
-    return _graphs[user_id]
+    return _entry(user_id).g
+
+
+def is_loaded(user_id: str) -> bool:
+    entry = _cache.get(user_id)
+    return entry is not None and entry.loaded
 
 
 def add_node(
@@ -34,8 +174,7 @@ def add_node(
     provenance: str = "EXPLICIT",
 ) -> None:
     """Add a node to the user's graph."""
-    g = get_graph(user_id)
-    g.add_node(node_id, type=node_type, provenance=provenance, **data)
+    _entry(user_id).add_node(node_id, {**data, "type": node_type, "provenance": provenance})
     logger.debug("[Graph] Node added: user=%s node=%s type=%s", user_id, node_id, node_type)
 
 
@@ -49,8 +188,39 @@ def add_edge(
     """Add a typed edge."""
     if edge_type not in EDGE_TYPES:
         raise ValueError(f"Invalid edge type: {edge_type}. Must be one of {EDGE_TYPES}")
-    g = get_graph(user_id)
-    g.add_edge(source, target, type=edge_type, **(data or {}))
+    _entry(user_id).add_edge(source, target, {**(data or {}), "type": edge_type})
+
+
+async def merge_nodes(user_id: str, keep: str, drop: List[str]) -> int:
+    """Fold `drop` nodes into `keep`: their edges are re-pointed to `keep`,
+    then the nodes and their stored documents are deleted. Returns nodes removed.
+
+    Attributes are not merged — the caller updates `keep` first. The graph
+    should be loaded (ensure_loaded) so every edge is seen.
+    """
+    entry = _entry(user_id)
+    g = entry.g
+    drop = [n for n in drop if n != keep and n in g]
+    if not drop:
+        return 0
+    if keep not in g:
+        entry.add_node(keep, {})
+    for node_id in drop:
+        for u, _v, attrs in list(g.in_edges(node_id, data=True)):
+            if u != keep and u not in drop:
+                entry.add_edge(u, keep, dict(attrs))
+        for _u, v, attrs in list(g.out_edges(node_id, data=True)):
+            if v != keep and v not in drop:
+                entry.add_edge(keep, v, dict(attrs))
+        entry.remove_node(node_id)
+    db = get_db()
+    await db.graph_nodes.delete_many({"user_id": user_id, "node_id": {"$in": drop}})
+    await db.graph_edges.delete_many({
+        "user_id": user_id,
+        "$or": [{"source": {"$in": drop}}, {"target": {"$in": drop}}],
+    })
+    logger.info("[Graph] Merged nodes: user=%s keep=%s dropped=%d", user_id, keep, len(drop))
+    return len(drop)
 
 
 def get_node(user_id: str, node_id: str) -> Optional[Dict[str, Any]]:
@@ -60,6 +230,38 @@ def get_node(user_id: str, node_id: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+def node_summary(user_id: str, node_id: str) -> Optional[Dict[str, Any]]:
+    """Type, provenance and out-degree of a node, from the compact index.
+
+    Equivalent to get_node() + len(get_neighbors()) for recall, without
+    copying attribute dicts or walking adjacency.
+    """
+    entry = _entry(user_id)
+    slot = entry.index.get(node_id)
+    if slot is None:
+        return None
+    return {
+        "type": _labels[entry.types[slot]],
+        "provenance": _labels[entry.provs[slot]],
+        "degree": entry.out_deg[slot],
+    }
+
+
+def node_summaries(user_id: str, node_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """node_summary() for many nodes of one user, in input order."""
+    entry = _entry(user_id)
+    index, types, provs, out_deg = entry.index, entry.types, entry.provs, entry.out_deg
+    summaries: List[Optional[Dict[str, Any]]] = []
+    for node_id in node_ids:
+        slot = index.get(node_id)
+        summaries.append(None if slot is None else {
+            "type": _labels[types[slot]],
+            "provenance": _labels[provs[slot]],
+            "degree": out_deg[slot],
+        })
+    return summaries
+
+
 def get_neighbors(
     user_id: str,
     node_id: str,
@@ -87,26 +289,208 @@ def node_count(user_id: str) -> int:
     return get_graph(user_id).number_of_nodes()
 
 
+def _clean(attrs: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce attribute values to BSON-safe JSON types."""
+    return json.loads(json.dumps(attrs, default=str))
+
+
 async def persist_graph(user_id: str) -> None:
-    """Save graph to MongoDB."""
-    g = get_graph(user_id)
-    data = nx.node_link_data(g)
+    """Save the nodes/edges changed since the last persist to MongoDB."""
+    try:
+        await _flush(user_id)
+    finally:
+        await _enforce_budget(keep=user_id)
+
+
+async def _flush(user_id: str) -> None:
+    entry = _cache.get(user_id)
+    if entry is None or not entry.dirty:
+        return
+    g = entry.g
+    node_ids, entry.dirty_nodes = entry.dirty_nodes, set()
+    edge_keys, entry.dirty_edges = entry.dirty_edges, set()
+
+    node_ops = [
+        UpdateOne(
+            {"user_id": user_id, "node_id": n},
+            {"$set": {"user_id": user_id, "node_id": n, "attrs": _clean(g.nodes[n])}},
+            upsert=True,
+        )
+        for n in node_ids if n in g
+    ]
+    edge_ops = [
+        UpdateOne(
+            {"user_id": user_id, "source": u, "target": v},
+            {"$set": {"user_id": user_id, "source": u, "target": v, "attrs": _clean(g.edges[u, v])}},
+            upsert=True,
+        )
+        for u, v in edge_keys if g.has_edge(u, v)
+    ]
     db = get_db()
-    await db.graphs.update_one(
-        {"user_id": user_id},
-        {"$set": {"user_id": user_id, "graph_data": json.loads(json.dumps(data, default=str))}},
-        upsert=True,
-    )
-    logger.info("[Graph] Persisted: user=%s nodes=%d edges=%d", user_id, g.number_of_nodes(), g.number_of_edges())
+    try:
+        if node_ops:
+            await db.graph_nodes.bulk_write(node_ops, ordered=False)
+        if edge_ops:
+            await db.graph_edges.bulk_write(edge_ops, ordered=False)
+    except Exception:
+        # Keep them dirty so the next persist retries
+        entry.dirty_nodes |= node_ids
+        entry.dirty_edges |= edge_keys
+        raise
+    logger.info("[Graph] Persisted: user=%s nodes=%d/%d edges=%d/%d",
+                user_id, len(node_ops), g.number_of_nodes(), len(edge_ops), g.number_of_edges())
+
+
+async def ensure_loaded(user_id: str) -> None:
+    """Load the user's graph from MongoDB unless it is already cached in full."""
+    if is_loaded(user_id):
+        _cache.move_to_end(user_id)
+        _cache_stats["hits"] += 1
+        return
+    _cache_stats["misses"] += 1
+    await load_graph(user_id)
 
 
 async def load_graph(user_id: str) -> nx.DiGraph:
-    """Load graph from MongoDB."""
+    """Load graph from MongoDB (per-node/per-edge documents).
+
+    Unpersisted in-memory changes (written before the first load, or after
+    an eviction) are replayed on top of what was read.
+    """
+    db = get_db()
+    g = nx.DiGraph()
+    async for doc in db.graph_nodes.find({"user_id": user_id}, {"_id": 0, "node_id": 1, "attrs": 1}):
+        g.add_node(doc["node_id"], **doc.get("attrs", {}))
+    async for doc in db.graph_edges.find({"user_id": user_id}, {"_id": 0, "source": 1, "target": 1, "attrs": 1}):
+        g.add_edge(doc["source"], doc["target"], **doc.get("attrs", {}))
+
+    if g.number_of_nodes() == 0:
+        legacy = await db.graphs.find_one({"user_id": user_id})
+        if legacy and "graph_data" in legacy:
+            return await _migrate_legacy(user_id, legacy["graph_data"])
+
+    entry = _UserGraph(g, loaded=True)
+    _install(user_id, entry)
+    logger.info("[Graph] Loaded: user=%s nodes=%d edges=%d", user_id, g.number_of_nodes(), g.number_of_edges())
+    await _enforce_budget(keep=user_id)
+    return entry.g
+
+
+def _install(user_id: str, entry: _UserGraph) -> None:
+    """Cache a freshly loaded graph, replaying changes written before the load."""
+    pending = _cache.get(user_id)
+    if pending is not None:
+        for n in pending.dirty_nodes:
+            if n in pending.g:
+                entry.add_node(n, dict(pending.g.nodes[n]))
+        for u, v in pending.dirty_edges:
+            if pending.g.has_edge(u, v):
+                entry.add_edge(u, v, dict(pending.g.edges[u, v]))
+    _cache[user_id] = entry
+    _cache.move_to_end(user_id)
+
+
+def legacy_documents(user_id: str, graph_data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """graph_nodes / graph_edges documents for a node_link_data blob."""
+    g = nx.node_link_graph(graph_data)
+    nodes = [{"user_id": user_id, "node_id": n, "attrs": _clean(attrs)} for n, attrs in g.nodes(data=True)]
+    edges = [
+        {"user_id": user_id, "source": u, "target": v, "attrs": _clean(attrs)}
+        for u, v, attrs in g.edges(data=True)
+    ]
+    return nodes, edges
+
+
+async def _migrate_legacy(user_id: str, graph_data: Dict[str, Any]) -> nx.DiGraph:
+    """Convert a whole-graph node_link_data blob to per-node/per-edge documents."""
+    entry = _UserGraph(nx.node_link_graph(graph_data), loaded=True)
+    entry.dirty_nodes = set(entry.g.nodes)
+    entry.dirty_edges = set(entry.g.edges)
+    _install(user_id, entry)
+    await _flush(user_id)
+    await get_db().graphs.delete_one({"user_id": user_id})
+    logger.info("[Graph] Migrated legacy graph blob: user=%s nodes=%d", user_id, entry.g.number_of_nodes())
+    return entry.g
+
+
+async def _enforce_budget(keep: Optional[str] = None) -> None:
+    """Evict least-recently-used graphs until the cache fits its byte budget.
+
+    Dirty graphs are flushed first; a graph that fails to flush stays cached.
+    """
+    budget = get_settings().GRAPH_CACHE_MAX_BYTES
+    for user_id in list(_cache):
+        if _cache_bytes() <= budget:
+            return
+        if user_id == keep:
+            continue
+        entry = _cache.get(user_id)
+        if entry is None:
+            continue
+        if entry.dirty:
+            try:
+                await _flush(user_id)
+                _cache_stats["eviction_flushes"] += 1
+            except Exception as e:
+                logger.warning("[Graph] Eviction flush failed: user=%s error=%s", user_id, str(e)[:80])
+                continue
+            if entry.dirty:   # written to again while flushing
+                continue
+        if _cache.get(user_id) is entry:
+            del _cache[user_id]
+            _cache_stats["evictions"] += 1
+            logger.debug("[Graph] Evicted: user=%s bytes=%d", user_id, entry.nbytes)
+
+
+def _cache_bytes() -> int:
+    return sum(e.nbytes for e in _cache.values())
+
+
+async def flush_all() -> None:
+    """Persist every dirty cached graph (FastAPI lifespan shutdown)."""
+    for user_id in list(_cache):
+        try:
+            await _flush(user_id)
+        except Exception as e:
+            logger.error("[Graph] Shutdown flush failed: user=%s error=%s", user_id, str(e)[:80])
+
+
+def get_cache_stats(top_n: int = 20) -> Dict[str, Any]:
+    """Cache occupancy and the largest per-user footprints (metrics endpoint)."""
+    largest = sorted(_cache.items(), key=lambda kv: kv[1].nbytes, reverse=True)[:top_n]
+    return {
+        "users_cached": len(_cache),
+        "bytes_estimated": _cache_bytes(),
+        "max_bytes": get_settings().GRAPH_CACHE_MAX_BYTES,
+        **_cache_stats,
+        "users": {
+            user_id: {
+                "nodes": e.g.number_of_nodes(),
+                "edges": e.g.number_of_edges(),
+                "bytes": e.nbytes,
+                "dirty": e.dirty,
+            }
+            for user_id, e in largest
+        },
+    }
+
+
+def evict(user_id: str) -> bool:
+    """Drop a user's cached graph without flushing it.
+
+    For callers that rewrote the user's documents in MongoDB directly
+    (restore): the next ensure_loaded() reads them back. Unpersisted
+    changes are discarded. Returns True if the user was cached.
+    """
+    return _cache.pop(user_id, None) is not None
+
+
+async def delete_graph(user_id: str) -> int:
+    """Drop a user's graph from memory and MongoDB. Returns documents deleted."""
+    evict(user_id)
     db = get_db()
-    doc = await db.graphs.find_one({"user_id": user_id})
-    if doc and "graph_data" in doc:
-        g = nx.node_link_graph(doc["graph_data"])
-        _graphs[user_id] = g
-        logger.info("[Graph] Loaded: user=%s nodes=%d", user_id, g.number_of_nodes())
-        return g
-    return get_graph(user_id)
+    deleted = 0
+    for coll in (db.graph_nodes, db.graph_edges, db.graphs):
+        result = await coll.delete_many({"user_id": user_id})
+        deleted += result.deleted_count
+    return deleted
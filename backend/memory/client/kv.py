@@ -2,10 +2,20 @@
 
 Prevents wrong-entity execution (e.g., wrong contact).
 Stored in MongoDB `entity_registry` collection.
+
+Resolution is served from a per-user in-memory alias index, built from
+MongoDB on first use, updated on register and evicted with the user's
+session (evict_user). Besides exact matches it supports prefix lookups
+and edit-distance-1 matches for STT variants ("Jakob" → "jacob").
 """
+import asyncio
+import bisect
 import logging
+import re
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
+
+from pymongo import UpdateOne
 
 from core.database import get_db
 
@@ -36,37 +46,262 @@ async def register_entity(
         {"$set": doc},
         upsert=True,
     )
+    _index_add(user_id, [doc])
     logger.debug("[KV] Entity registered: user=%s id=%s refs=%s", user_id, canonical_id, human_refs)
 
 
+async def register_entities_bulk(
+    user_id: str,
+    entities: List[Dict[str, Any]],
+) -> None:
+    """Register many entities in one bulk_write.
+
+    Each entity dict carries the register_entity() arguments:
+    canonical_id, entity_type, human_refs, and optional data / provenance.
+    """
+    if not entities:
+        return
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    ops, docs = [], []
+    for e in entities:
+        doc = {
+            "user_id": user_id,
+            "canonical_id": e["canonical_id"],
+            "entity_type": e["entity_type"],
+            "human_refs": [r.lower() for r in e["human_refs"]],
+            "data": e.get("data") or {},
+            "provenance": e.get("provenance", "EXPLICIT"),
+            "updated_at": now,
+        }
+        docs.append(doc)
+        ops.append(UpdateOne(
+            {"user_id": user_id, "canonical_id": e["canonical_id"]},
+            {"$set": doc},
+            upsert=True,
+        ))
+    await db.entity_registry.bulk_write(ops, ordered=False)
+    _index_add(user_id, docs)
+    logger.debug("[KV] Entities registered (bulk): user=%s count=%d", user_id, len(ops))
+
+
 async def resolve_entity(
     user_id: str,
     human_ref: str,
 ) -> Optional[Dict[str, Any]]:
-    """Resolve a human reference to a canonical entity."""
-    db = get_db()
-    doc = await db.entity_registry.find_one({
-        "user_id": user_id,
-        "human_refs": human_ref.lower(),
-    })
-    if doc:
-        doc.pop("_id", None)
-        return doc
-    return None
+    """Resolve a human reference to a canonical entity.
+
+    Exact (normalized) match first; otherwise an edit-distance-1 match,
+    but only when it is unambiguous.
+    """
+    index = await _get_index(user_id)
+    matches = index.lookup(human_ref)
+    if not matches:
+        matches = index.fuzzy(human_ref)
+        if len(matches) != 1:
+            return None
+    return dict(matches[0])
 
 
 async def resolve_entities(
     user_id: str,
     human_ref: str,
 ) -> List[Dict[str, Any]]:
-    """Find all entities matching a reference (for disambiguation)."""
-    db = get_db()
-    cursor = db.entity_registry.find({
-        "user_id": user_id,
-        "human_refs": human_ref.lower(),
-    })
-    results = []
-    async for doc in cursor:
-        doc.pop("_id", None)
-        results.append(doc)
-    return results
+    """Find all entities matching a reference (for disambiguation).
+
+    Falls back to edit-distance-1 candidates when nothing matches exactly.
+    """
+    index = await _get_index(user_id)
+    matches = index.lookup(human_ref) or index.fuzzy(human_ref)
+    return [dict(doc) for doc in matches]
+
+
+async def resolve_many(
+    user_id: str,
+    human_refs: List[str],
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """resolve_entity() for many references against one index build."""
+    await _get_index(user_id)
+    return {ref: await resolve_entity(user_id, ref) for ref in human_refs}
+
+
+async def resolve_prefix(
+    user_id: str,
+    prefix: str,
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
+    """Entities with a human reference starting with `prefix` (partial utterances)."""
+    index = await _get_index(user_id)
+    return [dict(doc) for doc in index.prefix(prefix, limit)]
+
+
+# ── Alias index ─────────────────────────────────────────────────────────────
+
+_NON_WORD = re.compile(r"[^\w\s]")
+FUZZY_MIN_LENGTH = 4   # shorter refs are too ambiguous for edit-distance matching
+
+
+def normalize_ref(ref: str) -> str:
+    """Lowercase, drop punctuation, collapse whitespace ("Jacob's " → "jacobs")."""
+    return " ".join(_NON_WORD.sub("", ref.lower()).split())
+
+
+def _deletions(ref: str) -> Set[str]:
+    return {ref[:i] + ref[i + 1:] for i in range(len(ref))}
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    i = 0
+    while i < la and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1:] == b[i + 1:]     # one substitution
+    return a[i:] == b[i + 1:]             # one insertion into a
+
+
+class _AliasIndex:
+    """Normalized human refs → entity docs for one user.
+
+    Exact lookups hit a dict; prefix lookups bisect a sorted ref list;
+    edit-distance-1 lookups use a symmetric-delete map (each ref and its
+    one-character deletions → refs).
+    """
+
+    __slots__ = ("entities", "refs", "sorted_refs", "deletes")
+
+    def __init__(self):
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.refs: Dict[str, List[str]] = {}
+        self.sorted_refs: List[str] = []
+        self.deletes: Dict[str, Set[str]] = {}
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        canonical_id = doc["canonical_id"]
+        previous = self.entities.get(canonical_id)
+        if previous is not None:
+            self._remove_refs(canonical_id, previous.get("human_refs", []))
+        doc = {k: v for k, v in doc.items() if k != "_id"}
+        self.entities[canonical_id] = doc
+        for raw in doc.get("human_refs", []):
+            ref = normalize_ref(raw)
+            if not ref:
+                continue
+            ids = self.refs.get(ref)
+            if ids is None:
+                ids = self.refs[ref] = []
+                bisect.insort(self.sorted_refs, ref)
+                for variant in _deletions(ref) | {ref}:
+                    self.deletes.setdefault(variant, set()).add(ref)
+            if canonical_id not in ids:
+                ids.append(canonical_id)
+
+    def _remove_refs(self, canonical_id: str, human_refs: List[str]) -> None:
+        for raw in human_refs:
+            ref = normalize_ref(raw)
+            ids = self.refs.get(ref)
+            if not ids or canonical_id not in ids:
+                continue
+            ids.remove(canonical_id)
+            if not ids:
+                del self.refs[ref]
+                self.sorted_refs.pop(bisect.bisect_left(self.sorted_refs, ref))
+                for variant in _deletions(ref) | {ref}:
+                    refs = self.deletes.get(variant)
+                    if refs is not None:
+                        refs.discard(ref)
+                        if not refs:
+                            del self.deletes[variant]
+
+    def _docs(self, refs: List[str]) -> List[Dict[str, Any]]:
+        seen, docs = set(), []
+        for ref in refs:
+            for canonical_id in self.refs.get(ref, ()):
+                if canonical_id not in seen:
+                    seen.add(canonical_id)
+                    docs.append(self.entities[canonical_id])
+        return docs
+
+    def lookup(self, human_ref: str) -> List[Dict[str, Any]]:
+        return self._docs([normalize_ref(human_ref)])
+
+    def fuzzy(self, human_ref: str) -> List[Dict[str, Any]]:
+        query = normalize_ref(human_ref)
+        if len(query) < FUZZY_MIN_LENGTH:
+            return []
+        candidates: Set[str] = set()
+        for variant in _deletions(query) | {query}:
+            candidates |= self.deletes.get(variant, set())
+        return self._docs(sorted(r for r in candidates if within_one_edit(query, r)))
+
+    def prefix(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        query = normalize_ref(prefix)
+        if not query:
+            return []
+        start = bisect.bisect_left(self.sorted_refs, query)
+        refs = []
+        for ref in self.sorted_refs[start:]:
+            if not ref.startswith(query) or len(refs) >= limit:
+                break
+            refs.append(ref)
+        return self._docs(refs)[:limit]
+
+
+_indexes: Dict[str, _AliasIndex] = {}
+_index_builds: Dict[str, asyncio.Future] = {}
+
+
+async def _get_index(user_id: str) -> _AliasIndex:
+    """The user's alias index, built from MongoDB on first use."""
+    index = _indexes.get(user_id)
+    if index is not None:
+        return index
+    build = _index_builds.get(user_id)
+    if build is None:
+        build = asyncio.ensure_future(_build_index(user_id))
+        _index_builds[user_id] = build
+        build.add_done_callback(lambda f: _index_builds.pop(user_id) if _index_builds.get(user_id) is f else None)
+    return await asyncio.shield(build)
+
+
+async def _build_index(user_id: str) -> _AliasIndex:
+    index = _AliasIndex()
+    async for doc in get_db().entity_registry.find({"user_id": user_id}, {"_id": 0}):
+        index.add(doc)
+    if _index_builds.get(user_id) is asyncio.current_task():   # not evicted mid-build
+        _indexes[user_id] = index
+    logger.debug("[KV] Alias index built: user=%s entities=%d refs=%d",
+                 user_id, len(index.entities), len(index.refs))
+    return index
+
+
+def _index_add(user_id: str, docs: List[Dict[str, Any]]) -> None:
+    """Apply registrations to a built (or building) index; unbuilt users read Mongo later."""
+    index = _indexes.get(user_id)
+    if index is not None:
+        for doc in docs:
+            index.add(doc)
+        return
+    build = _index_builds.get(user_id)
+    if build is not None:
+        def _apply(f: asyncio.Future) -> None:
+            if not f.cancelled() and f.exception() is None:
+                for doc in docs:
+                    f.result().add(doc)
+        build.add_done_callback(_apply)
+
+
+def evict_user(user_id: str) -> None:
+    """Drop a user's alias index; rebuilt from MongoDB on next use.
+
+    Called at session teardown and by anything that writes entity_registry
+    without going through register_entity*() (restore, clear).
+    """
+    _indexes.pop(user_id, None)
+    _index_builds.pop(user_id, None)   # an in-flight build may have read pre-write docs
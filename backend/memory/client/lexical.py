@@ -0,0 +1,227 @@
+"""Lexical Index — inverted index kept next to each Chroma partition.
+
+Name lookups ("contact Jacob", get_contact) do not need an embedding or
+an ANN search: they are answered from token postings over document text
+and from the contact / entity names in metadata. vector.py keeps one
+LexicalIndex per partition in step with every Chroma upsert and delete.
+
+search() ranks by summed IDF of matched query tokens (name tokens count
+double), for fusing with semantic results (reciprocal rank fusion).
+find_by_hash() answers the write-time "is this text already stored?" check.
+"""
+import hashlib
+import math
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from memory.client.kv import normalize_ref, within_one_edit
+
+# Metadata fields that carry a person / entity name
+NAME_FIELDS = ("contact_name", "name")
+RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in normalize_ref(text).split() if len(t) > 1]
+
+
+def content_hash(text: str) -> str:
+    """Hash of a document's text, insensitive to case and whitespace only."""
+    return hashlib.sha256(" ".join(text.casefold().split()).encode("utf-8")).hexdigest()[:32]
+
+
+def where_matches(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate the subset of Chroma `where` syntax the retriever uses."""
+    if not where:
+        return True
+    for key, cond in where.items():
+        if key == "$and":
+            if not all(where_matches(metadata, c) for c in cond):
+                return False
+        elif key == "$or":
+            if not any(where_matches(metadata, c) for c in cond):
+                return False
+        elif isinstance(cond, dict):
+            value = metadata.get(key)
+            for op, operand in cond.items():
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$eq" and value != operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$nin" and value in operand:
+                    return False
+        elif metadata.get(key) != cond:
+            return False
+    return True
+
+
+_WHERE_OPS = {"$eq", "$ne", "$in", "$nin"}
+
+
+def where_supported(where: Optional[Dict[str, Any]]) -> bool:
+    """True if where_matches() evaluates every clause of `where` (no $gt, $contains, ...)."""
+    if not where:
+        return True
+    for key, cond in where.items():
+        if key in ("$and", "$or"):
+            if not all(where_supported(c) for c in cond):
+                return False
+        elif key.startswith("$"):
+            return False
+        elif isinstance(cond, dict) and not set(cond) <= _WHERE_OPS:
+            return False
+    return True
+
+
+class LexicalIndex:
+    """Token postings + name map + content-hash map for one partition."""
+
+    __slots__ = ("docs", "postings", "names", "hashes")
+
+    def __init__(self):
+        self.docs: Dict[str, Tuple[str, Dict[str, Any], Set[str], Set[str]]] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        self.names: Dict[str, Set[str]] = {}
+        self.hashes: Dict[str, Set[str]] = {}   # content_hash(text) → doc ids (docs with text only)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, doc_id: str, text: str, metadata: Dict[str, Any]) -> None:
+        self.remove(doc_id)
+        names = {normalize_ref(str(metadata[f])) for f in NAME_FIELDS if metadata.get(f)}
+        names.discard("")
+        tokens = set(tokenize(text or ""))
+        for name in names:
+            tokens.update(name.split())
+            self.names.setdefault(name, set()).add(doc_id)
+        for token in tokens:
+            self.postings.setdefault(token, set()).add(doc_id)
+        if text:
+            self.hashes.setdefault(content_hash(text), set()).add(doc_id)
+        self.docs[doc_id] = (text or "", metadata, tokens, names)
+
+    def remove(self, doc_id: str) -> None:
+        entry = self.docs.pop(doc_id, None)
+        if entry is None:
+            return
+        text, _, tokens, names = entry
+        if text:
+            h = content_hash(text)
+            ids = self.hashes.get(h)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.hashes[h]
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[token]
+        for name in names:
+            ids = self.names.get(name)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.names[name]
+
+    def row(self, doc_id: str) -> Dict[str, Any]:
+        text, metadata, _, _ = self.docs[doc_id]
+        return {"id": doc_id, "text": text, "metadata": metadata, "distance": None}
+
+    def match_name(self, query: str) -> Optional[str]:
+        """The indexed name an (near-)exact name query refers to, if unambiguous."""
+        q = normalize_ref(query)
+        if q.startswith("contact "):
+            q = q[len("contact "):]
+        if not q:
+            return None
+        if q in self.names:
+            return q
+        if len(q) < 4:
+            return None
+        close = [name for name in self.names if within_one_edit(q, name)]
+        return close[0] if len(close) == 1 else None
+
+    def find_by_name(
+        self,
+        name: str = "",
+        contact_id: str = "",
+        where: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Docs whose name contains `name`, or whose contact_id contains `contact_id`."""
+        q = normalize_ref(name)
+        ids: List[str] = []
+        if q:
+            for indexed, doc_ids in self.names.items():
+                if q in indexed:
+                    ids.extend(doc_ids)
+        if contact_id:
+            ids.extend(
+                doc_id for doc_id, (_, meta, _, _) in self.docs.items()
+                if contact_id in str(meta.get("contact_id", "")).lower()
+            )
+        rows, seen = [], set()
+        for doc_id in ids:
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            if where_matches(self.docs[doc_id][1], where):
+                rows.append(self.row(doc_id))
+                if len(rows) >= limit:
+                    break
+        return rows
+
+    def find_by_hash(self, text: str, where: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """A doc whose text equals `text` up to case and whitespace, if any."""
+        for doc_id in sorted(self.hashes.get(content_hash(text), ())):
+            if where_matches(self.docs[doc_id][1], where):
+                return self.row(doc_id)
+        return None
+
+    def search(
+        self,
+        query: str,
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Docs ranked by summed IDF of matched query tokens."""
+        total = len(self.docs)
+        if not total:
+            return []
+        scores: Dict[str, float] = {}
+        for token in set(tokenize(query)):
+            ids = self.postings.get(token)
+            if not ids:
+                continue
+            idf = math.log(1 + total / len(ids))
+            for doc_id in ids:
+                weight = 2.0 if any(token in n.split() for n in self.docs[doc_id][3]) else 1.0
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        rows = []
+        for doc_id, _ in ranked:
+            if where_matches(self.docs[doc_id][1], where):
+                rows.append(self.row(doc_id))
+                if len(rows) >= n_results:
+                    break
+        return rows
+
+
+def fuse(
+    semantic: List[Dict[str, Any]],
+    lexical: List[Dict[str, Any]],
+    n_results: int,
+) -> List[Dict[str, Any]]:
+    """Reciprocal rank fusion of two ranked row lists (semantic rows win ties)."""
+    scores: Dict[str, float] = {}
+    rows: Dict[str, Dict[str, Any]] = {}
+    for ranking in (semantic, lexical):
+        for rank, row in enumerate(ranking):
+            scores[row["id"]] = scores.get(row["id"], 0.0) + 1.0 / (RRF_K + rank + 1)
+            rows.setdefault(row["id"], row)
+    ranked = sorted(scores, key=lambda doc_id: -scores[doc_id])
+    return [rows[doc_id] for doc_id in ranked[:n_results]]
@@ -7,23 +7,57 @@ Persistence layer:
   - ChromaDB (in-memory): fast similarity search during runtime
   - MongoDB `vector_store` collection: durable storage across restarts
 
-On startup: reload_from_mongodb() rehydrates ChromaDB from MongoDB.
-On write:   add_document() writes to both ChromaDB and MongoDB atomically.
+Partitioning: every user gets their own Chroma collection, keyed by a hash
+of the user_id in the document metadata. Queries scoped with
+where={"user_id": uid} are routed to that partition only, so query cost and
+count() scale with the user's own documents and cross-user isolation holds
+by construction. Documents without a user_id (e.g. the skills library) live
+in the shared `digital_self` collection. Partitions load and evict
+independently (ensure_user_loaded / evict_user); delete_user() removes a
+user's vectors everywhere.
+
+On startup: reload_from_mongodb() streams the stored vectors into ChromaDB
+            (or, in lazy mode, ensure_user_loaded() does so per user on first use).
+            With VECTOR_SNAPSHOT_DIR set, partitions load from a local disk
+            snapshot and MongoDB supplies only what changed since it.
+On write:   add_document() writes text + vector to ChromaDB immediately and to
+            MongoDB through the batched write-behind queue (write_behind.py).
+
+Search: partitions up to VECTOR_EXACT_SEARCH_MAX_DOCS are answered by an
+exact NumPy top-k over a per-partition float32 matrix (exact.py); larger
+ones by Chroma's HNSW index.
+
+Async callers should prefer add_document_async() / query_async(): they embed
+through the shared micro-batcher off the event loop and hand Chroma the
+precomputed vectors.
 """
 import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import chromadb
 from chromadb import EmbeddingFunction, Documents, Embeddings
+from pymongo import UpdateOne
 
-from memory.client.embedder import embed
+from memory.client.embedder import MODEL_NAME, embed, embed_async, embed_one_async
+from memory.client.exact import ExactIndex
+from memory.client.lexical import LexicalIndex, content_hash, where_supported
+from memory.client import vector_codec, vector_snapshot
+from memory.client.write_behind import get_write_behind
+from memory import recall_memo
+from config.settings import get_settings
 from core.database import get_db
 
 logger = logging.getLogger(__name__)
 
 _client: Optional[chromadb.ClientAPI] = None
-_collection = None
+_collections: Dict[str, Any] = {}   # partition key (user_id, "" = shared) → collection
+_lexical: Dict[str, LexicalIndex] = {}   # partition key → inverted index over the same docs
+_exact: Dict[str, ExactIndex] = {}       # partition key → float32 matrix (small partitions only)
+_exact_oversized: Set[str] = set()       # partitions that outgrew VECTOR_EXACT_SEARCH_MAX_DOCS
 
 COLLECTION_NAME = "digital_self"
 
@@ -43,17 +77,53 @@ def _get_client():
     return _client
 
 
-def _get_collection():
-    global _collection
-    if _collection is None:
+def _partition_name(user_id: Optional[str]) -> str:
+    """Chroma collection name for a user's partition (user IDs are hashed — names are restricted)."""
+    if not user_id:
+        return COLLECTION_NAME
+    return f"{COLLECTION_NAME}_u_{hashlib.sha256(user_id.encode()).hexdigest()[:24]}"
+
+
+def _get_collection(user_id: Optional[str] = None):
+    key = user_id or ""
+    coll = _collections.get(key)
+    if coll is None:
         client = _get_client()
-        _collection = client.get_or_create_collection(
-            name=COLLECTION_NAME,
+        coll = client.get_or_create_collection(
+            name=_partition_name(user_id),
             embedding_function=ONNXEmbeddingFunction(),
             metadata={"hnsw:space": "cosine"},
         )
-        logger.info("[VectorStore] Collection '%s' ready (ONNX)", COLLECTION_NAME)
-    return _collection
+        _collections[key] = coll
+        logger.debug("[VectorStore] Partition ready: %s", _partition_name(user_id))
+    return coll
+
+
+def _partition_of(metadata: Dict[str, Any]) -> str:
+    return (metadata or {}).get("user_id") or ""
+
+
+def _split_where(where: Optional[Dict[str, Any]]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Extract the user_id scope from a Chroma where filter.
+
+    Returns (partition key, remaining filter). The user_id clause is implied by
+    the partition, so it is dropped from the filter Chroma evaluates.
+    """
+    if not where:
+        return "", None
+    uid = where.get("user_id")
+    if isinstance(uid, str):
+        rest = {k: v for k, v in where.items() if k != "user_id"}
+        return uid, rest or None
+    if "$and" in where:
+        clauses = list(where["$and"])
+        for i, clause in enumerate(clauses):
+            if set(clause) == {"user_id"} and isinstance(clause["user_id"], str):
+                rest = clauses[:i] + clauses[i + 1:]
+                if not rest:
+                    return clause["user_id"], None
+                return clause["user_id"], rest[0] if len(rest) == 1 else {"$and": rest}
+    return "", where
 
 
 def add_document(
@@ -62,19 +132,56 @@ def add_document(
     metadata: Dict[str, Any],
 ) -> None:
     """Add a document to the vector store and persist to MongoDB.
-    The ONNX embedding function generates the vector from `text`.
+    The ONNX embedder generates the vector from `text`; the vector is
+    persisted alongside the text so restarts never re-embed.
     """
-    coll = _get_collection()
-    coll.upsert(
-        ids=[doc_id],
-        documents=[text],
-        metadatas=[metadata],
-    )
-    # Persist to MongoDB immediately
-    _persist_one(doc_id, text, metadata)
+    embedding = embed([text])[0]
+    _upsert(doc_id, text, embedding, metadata)
     logger.debug("[VectorStore] Document added+persisted: id=%s", doc_id)
 
 
+async def add_document_async(
+    doc_id: str,
+    text: str,
+    metadata: Dict[str, Any],
+    embedding: Optional[List[float]] = None,
+) -> None:
+    """Async add_document(): embeds via the micro-batcher, never blocks the loop.
+    Waits for write-behind capacity first, so bulk writers feel backpressure.
+    Pass `embedding` when the text was already embedded (find_duplicates_async)."""
+    await get_write_behind().wait_for_capacity()
+    if embedding is None:
+        embedding = await embed_one_async(text)
+    _upsert(doc_id, text, embedding, metadata)
+    logger.debug("[VectorStore] Document added+persisted: id=%s", doc_id)
+
+
+def add_documents(
+    ids: List[str],
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+) -> None:
+    """Bulk add_document(): one ONNX batch, one Chroma upsert per partition."""
+    if not ids:
+        return
+    _upsert_many(ids, texts, embed(texts), metadatas)
+
+
+async def add_documents_async(
+    ids: List[str],
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+    embeddings: Optional[List[List[float]]] = None,
+) -> None:
+    """Bulk add_document_async(): texts are embedded in one micro-batcher request."""
+    if not ids:
+        return
+    await get_write_behind().wait_for_capacity()
+    if embeddings is None:
+        embeddings = await embed_async(texts)
+    _upsert_many(ids, texts, embeddings, metadatas)
+
+
 def add_document_with_embedding(
     doc_id: str,
     embedding: List[float],
@@ -85,43 +192,170 @@ def add_document_with_embedding(
     Used when the embedding is generated server-side from device-provided text.
     Text is NOT stored — only the vector + metadata.
     """
-    coll = _get_collection()
-    coll.upsert(
-        ids=[doc_id],
-        embeddings=[embedding],
-        documents=[""],   # Empty — text was discarded after embedding
-        metadatas=[metadata],
-    )
-    _persist_one(doc_id, "", metadata)
+    _upsert(doc_id, "", embedding, metadata)   # Empty — text was discarded after embedding
     logger.debug("[VectorStore] Embedding added (no text): id=%s dim=%d", doc_id, len(embedding))
 
 
-def _persist_one(doc_id: str, text: str, metadata: Dict[str, Any]) -> None:
-    """Write a single vector document to MongoDB (fire-and-forget via sync)."""
+def _upsert(doc_id: str, text: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
+    partition = _partition_of(metadata)
+    _put(partition, [doc_id], [text], [embedding], [metadata])
+    _partition_changed(partition)
+    # Persist to MongoDB immediately
+    _persist_one(doc_id, text, metadata, embedding)
+
+
+def _upsert_many(
+    ids: List[str],
+    texts: List[str],
+    embeddings: List[List[float]],
+    metadatas: List[Dict[str, Any]],
+) -> None:
+    by_partition: Dict[str, List[int]] = {}
+    for i, meta in enumerate(metadatas):
+        by_partition.setdefault(_partition_of(meta), []).append(i)
+    for partition, idx in by_partition.items():
+        _put(
+            partition,
+            [ids[i] for i in idx],
+            [texts[i] for i in idx],
+            [embeddings[i] for i in idx],
+            [metadatas[i] for i in idx],
+        )
+        _partition_changed(partition)
+    for doc_id, text, meta, embedding in zip(ids, texts, metadatas, embeddings):
+        _persist_one(doc_id, text, meta, embedding)
+    logger.debug("[VectorStore] Bulk add: docs=%d partitions=%d", len(ids), len(by_partition))
+
+
+def _put(
+    partition: str,
+    ids: List[str],
+    texts: List[str],
+    embeddings: Any,
+    metadatas: List[Dict[str, Any]],
+) -> None:
+    """Upsert into a partition's Chroma collection and its lexical / exact indexes."""
+    _get_collection(partition).upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+    lex = _lexical_index(partition)
+    for doc_id, text, meta in zip(ids, texts, metadatas):
+        lex.add(doc_id, text, meta)
+    _exact_add(partition, ids, texts, embeddings, metadatas)
+
+
+def _lexical_index(partition: str) -> LexicalIndex:
+    lex = _lexical.get(partition)
+    if lex is None:
+        lex = _lexical[partition] = LexicalIndex()
+    return lex
+
+
+# ── Exact search ────────────────────────────────────────────────────────────
+# Partitions with at most VECTOR_EXACT_SEARCH_MAX_DOCS documents are also
+# held as an ExactIndex (exact.py) and answered with one matmul — exact, and
+# faster than HNSW at that size (scripts/bench_vector_search.py). A partition
+# that outgrows the limit drops its matrix and is served by Chroma until it
+# is evicted and reloaded.
+
+def _exact_add(
+    partition: str,
+    ids: List[str],
+    texts: List[str],
+    embeddings: Any,
+    metadatas: List[Dict[str, Any]],
+) -> None:
+    limit = get_settings().VECTOR_EXACT_SEARCH_MAX_DOCS
+    if limit <= 0 or partition in _exact_oversized:
+        return
+    index = _exact.get(partition)
+    if index is None:
+        index = _exact[partition] = ExactIndex()
+    for doc_id, text, embedding, meta in zip(ids, texts, embeddings, metadatas):
+        index.add(doc_id, embedding, text, meta)
+    if len(index) > limit:
+        del _exact[partition]
+        _exact_oversized.add(partition)
+        logger.info("[VectorStore] Partition %s exceeds %d docs — HNSW search only", _partition_name(partition), limit)
+
+
+def _partition_changed(partition: str) -> None:
+    """A partition's contents changed: the next disk snapshot rewrites it."""
+    _snapshot_dirty.add(partition)
+    _invalidate_recall(partition)
+
+
+def _invalidate_recall(partition: str) -> None:
+    """A user's partition changed — memoized recall results for them are stale."""
+    if partition:
+        recall_memo.invalidate_user(partition)
+
+
+# ── Embedding persistence ───────────────────────────────────────────────────
+# Vectors are stored in MongoDB as packed bytes in VECTOR_STORAGE_ENCODING
+# (vector_codec; f16 by default = 768 B per doc) together with the model
+# and encoding that produced them. Docs without `embedding_encoding` are
+# legacy float32. A model change invalidates stored vectors and triggers a backfill.
+
+def _pack_embedding(embedding: List[float], encoding: Optional[str] = None) -> bytes:
+    return vector_codec.pack(embedding, encoding or get_settings().VECTOR_STORAGE_ENCODING)
+
+
+def _unpack_embedding(blob: bytes, encoding: str = "f32") -> List[float]:
+    return vector_codec.unpack(blob, encoding)
+
+
+def _embedding_fields(embedding: List[float]) -> Dict[str, Any]:
+    encoding = get_settings().VECTOR_STORAGE_ENCODING
+    return {
+        "embedding": _pack_embedding(embedding, encoding),
+        "embedding_model": MODEL_NAME,
+        "embedding_encoding": encoding,
+    }
+
+
+def _stored_embedding(doc: Dict[str, Any]) -> Optional[List[float]]:
+    """Return the persisted vector for a vector_store doc, or None if it must be re-embedded."""
+    blob = doc.get("embedding")
+    if not blob or doc.get("embedding_model") != MODEL_NAME:
+        return None
+    return _unpack_embedding(blob, doc.get("embedding_encoding", "f32"))
+
+
+def _persist_one(
+    doc_id: str,
+    text: str,
+    metadata: Dict[str, Any],
+    embedding: Optional[List[float]] = None,
+) -> None:
+    """Queue a vector document for MongoDB via the write-behind pipeline."""
+    doc: Dict[str, Any] = {
+        "doc_id": doc_id,
+        "text": text,
+        "metadata": metadata,
+        "updated_at": datetime.now(timezone.utc),   # compared against the snapshot watermark
+    }
+    if embedding is not None:
+        doc.update(_embedding_fields(embedding))
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            asyncio.ensure_future(_async_persist_one(doc_id, text, metadata))
-        else:
-            loop.run_until_complete(_async_persist_one(doc_id, text, metadata))
+        get_write_behind().submit_upsert(doc_id, doc)
     except Exception as e:
         logger.warning("[VectorStore] MongoDB persist failed: %s", str(e))
 
 
-async def _async_persist_one(doc_id: str, text: str, metadata: Dict[str, Any]) -> None:
-    db = get_db()
-    await db.vector_store.update_one(
-        {"doc_id": doc_id},
-        {"$set": {"doc_id": doc_id, "text": text, "metadata": metadata}},
-        upsert=True,
-    )
-
-
-async def reload_from_mongodb() -> int:
-    """Reload all vector documents from MongoDB into ChromaDB on startup.
+async def reload_from_mongodb(progress: Optional[Callable[[int], None]] = None) -> int:
+    """Reload vector documents from MongoDB into ChromaDB on startup.
 
     Fixes the restart-wipe bug: ChromaDB is in-memory; this restores
     all previously stored Digital Self facts after a server restart.
+    Documents are streamed through a cursor and upserted in batches of
+    VECTOR_REHYDRATE_BATCH_SIZE, so there is no cap and no full in-memory list.
+    Stored vectors are upserted directly — nothing is re-embedded. Documents
+    persisted before vectors were stored (or by a different model) are
+    backfilled in the background; they become searchable once embedded.
+
+    VECTOR_REHYDRATE_MODE=lazy loads only shared (non-user) documents here;
+    each user's vectors are loaded by ensure_user_loaded() on first recall.
+    With VECTOR_SNAPSHOT_DIR set, partitions come from the disk snapshot and
+    only documents written after its watermark are read from MongoDB.
     Returns number of documents reloaded.
 
     PRODUCTION NOTE:
@@ -130,21 +364,448 @@ async def reload_from_mongodb() -> int:
     - Test data must be scoped to test_user_* user_ids and cleared after tests.
     - All queries MUST filter by user_id (pass where={"user_id": uid} to query()).
     """
-    db = get_db()
-    coll = _get_collection()
+    if get_settings().VECTOR_SNAPSHOT_DIR:
+        restored = await _restore_snapshot(progress)
+        if restored is not None:
+            return restored
+
+    if get_settings().VECTOR_REHYDRATE_MODE == "lazy":
+        loaded = await _rehydrate({"metadata.user_id": {"$exists": False}}, "shared", progress)
+        logger.info("[VectorStore] Lazy mode: %d shared vectors loaded, users load on first recall", loaded)
+        return loaded
 
-    docs = await db.vector_store.find({}, {"_id": 0}).to_list(10000)
-    if not docs:
+    loaded = await _rehydrate({}, "all", progress, mark_loaded=True)
+    if not loaded and not _backfill_tasks:
         logger.info("[VectorStore] No persisted vectors found — fresh start")
+    return loaded
+
+
+async def ensure_user_loaded(user_id: str) -> None:
+    """Load a user's partition from MongoDB on first use (lazy mode, or after eviction)."""
+    if not user_id or user_id in _loaded_users:
+        return
+    task = _user_loads.get(user_id)
+    if task is None:
+        task = asyncio.ensure_future(_load_user(user_id))
+        _user_loads[user_id] = task
+    try:
+        await asyncio.shield(task)
+        _loaded_users.add(user_id)
+    finally:
+        if task.done():
+            _user_loads.pop(user_id, None)
+
+
+def evict_user(user_id: str) -> None:
+    """Drop a user's in-memory partition. MongoDB is untouched; the next
+    ensure_user_loaded() rehydrates it."""
+    _loaded_users.discard(user_id)
+    _lexical.pop(user_id, None)
+    _exact.pop(user_id, None)
+    _exact_oversized.discard(user_id)
+    _invalidate_recall(user_id)
+    if _collections.pop(user_id, None) is not None:
+        try:
+            _get_client().delete_collection(_partition_name(user_id))
+        except Exception as e:
+            logger.warning("[VectorStore] Partition drop failed for user=%s: %s", user_id, e)
+        logger.info("[VectorStore] Partition evicted: user=%s", user_id)
+
+
+async def delete_user(user_id: str) -> int:
+    """Delete all of a user's vectors from memory, MongoDB and the disk snapshot.
+
+    Unlike evict_user(), nothing comes back on the next recall or restart.
+    Returns the number of documents removed.
+    """
+    if not user_id:
         return 0
+    lex = _lexical.get(user_id)
+    in_memory = list(lex.docs) if lex is not None else []
+    evict_user(user_id)
+    _partition_changed(user_id)   # no longer in memory → the next snapshot drops its files
+
+    # Deletes supersede any upsert still queued for these docs; flushing first
+    # means no in-flight write can land after the bulk delete below
+    write_behind = get_write_behind()
+    for doc_id in in_memory:
+        write_behind.submit_delete(doc_id)
+    await write_behind.flush()
+    result = await get_db().vector_store.delete_many(_mongo_scope(user_id))
+    removed = len(in_memory) + result.deleted_count
+    logger.info("[VectorStore] User vectors deleted: user=%s docs=%d", user_id, removed)
+    return removed
 
-    coll.upsert(
-        ids=[d["doc_id"] for d in docs],
-        documents=[d["text"] for d in docs],
-        metadatas=[d["metadata"] for d in docs],
+
+async def _rehydrate(
+    mongo_filter: Dict[str, Any],
+    scope: str,
+    progress: Optional[Callable[[int], None]] = None,
+    mark_loaded: bool = False,
+) -> int:
+    """Stream vector_store docs matching mongo_filter into Chroma in batches.
+
+    mark_loaded records every user seen as fully loaded (full reload only).
+    """
+    db = get_db()
+    batch_size = get_settings().VECTOR_REHYDRATE_BATCH_SIZE
+    cursor = db.vector_store.find(mongo_filter, {"_id": 0}).batch_size(batch_size)
+
+    loaded = 0
+    seen: Set[str] = set()
+    batch: List[Dict[str, Any]] = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            loaded += _load_batch(batch, seen)
+            batch = []
+            logger.info("[VectorStore] Rehydrate progress: scope=%s loaded=%d", scope, loaded)
+            if progress:
+                progress(loaded)
+            await asyncio.sleep(0)  # let requests run between batches
+    if batch:
+        loaded += _load_batch(batch, seen)
+        if progress:
+            progress(loaded)
+    if mark_loaded:
+        _loaded_users.update(uid for uid in seen if uid)
+
+    _rehydrate_stats["docs_loaded"] += loaded
+    logger.info("[VectorStore] Reloaded %d vectors from MongoDB: scope=%s", loaded, scope)
+    return loaded
+
+
+def _load_batch(docs: List[Dict[str, Any]], seen: Set[str]) -> int:
+    """Upsert docs that have a stored vector; schedule the rest for backfill."""
+    ready: Dict[str, List[Tuple[Dict[str, Any], List[float]]]] = {}
+    pending = []
+    for d in docs:
+        embedding = _stored_embedding(d)
+        if embedding is not None:
+            ready.setdefault(_partition_of(d["metadata"]), []).append((d, embedding))
+        elif d.get("text"):
+            pending.append(d)
+        else:
+            logger.warning("[VectorStore] Unrecoverable doc (no text, no vector): id=%s", d["doc_id"])
+
+    for partition, group in ready.items():
+        seen.add(partition)
+        _put(
+            partition,
+            [d["doc_id"] for d, _ in group],
+            [d["text"] for d, _ in group],
+            [e for _, e in group],
+            [d["metadata"] for d, _ in group],
+        )
+        _partition_changed(partition)
+    if pending:
+        _rehydrate_stats["docs_backfill_queued"] += len(pending)
+        task = asyncio.ensure_future(_backfill_embeddings(pending))
+        _backfill_tasks.add(task)
+        task.add_done_callback(_backfill_tasks.discard)
+    return sum(len(g) for g in ready.values())
+
+
+_loaded_users: Set[str] = set()
+_user_loads: Dict[str, asyncio.Future] = {}
+_backfill_tasks: Set[asyncio.Future] = set()
+_rehydrate_stats: Dict[str, int] = {"docs_loaded": 0, "docs_backfill_queued": 0}
+_exact_stats: Dict[str, int] = {"queries": 0, "hnsw_queries": 0}
+BACKFILL_BATCH_SIZE = 256
+
+
+def get_rehydrate_status() -> Dict[str, Any]:
+    """Rehydration progress for health / metrics endpoints."""
+    return {
+        "mode": get_settings().VECTOR_REHYDRATE_MODE,
+        "users_loaded": len(_loaded_users),
+        "users_loading": len(_user_loads),
+        "backfills_in_flight": len(_backfill_tasks),
+        "partitions": len(_collections),
+        **_rehydrate_stats,
+        "exact_search": {
+            "partitions": len(_exact),
+            "oversized_partitions": len(_exact_oversized),
+            "matrix_bytes": sum(index.nbytes for index in _exact.values()),
+            **_exact_stats,
+        },
+        "snapshot": {
+            "enabled": bool(get_settings().VECTOR_SNAPSHOT_DIR),
+            "watermark": _snapshot["watermark"] if _snapshot else None,
+            "dirty_partitions": len(_snapshot_dirty),
+            **_snapshot_stats,
+        },
+    }
+
+
+async def wait_for_backfill() -> None:
+    """Await all in-flight embedding backfills (used by tests and shutdown)."""
+    while _backfill_tasks:
+        await asyncio.gather(*list(_backfill_tasks), return_exceptions=True)
+
+
+async def _backfill_embeddings(docs: List[Dict[str, Any]]) -> int:
+    """Embed docs that have no stored vector, load them into Chroma and write the vectors back."""
+    db = get_db()
+    done = 0
+    for i in range(0, len(docs), BACKFILL_BATCH_SIZE):
+        chunk = docs[i:i + BACKFILL_BATCH_SIZE]
+        try:
+            embeddings = await embed_async([d["text"] for d in chunk])
+            by_partition: Dict[str, List[int]] = {}
+            for j, d in enumerate(chunk):
+                by_partition.setdefault(_partition_of(d["metadata"]), []).append(j)
+            for partition, idx in by_partition.items():
+                _put(
+                    partition,
+                    [chunk[j]["doc_id"] for j in idx],
+                    [chunk[j]["text"] for j in idx],
+                    [embeddings[j] for j in idx],
+                    [chunk[j]["metadata"] for j in idx],
+                )
+                _partition_changed(partition)
+            await db.vector_store.bulk_write([
+                UpdateOne(
+                    {"doc_id": d["doc_id"]},
+                    {"$set": {**_embedding_fields(e), "updated_at": datetime.now(timezone.utc)}},
+                )
+                for d, e in zip(chunk, embeddings)
+            ], ordered=False)
+            done += len(chunk)
+        except Exception as e:
+            logger.warning("[VectorStore] Embedding backfill batch failed: %s", str(e))
+    logger.info("[VectorStore] Embedding backfill complete: %d/%d", done, len(docs))
+    return done
+
+
+# ── Disk snapshots ──────────────────────────────────────────────────────────
+# With VECTOR_SNAPSHOT_DIR set, every fully loaded partition is kept on
+# local disk (vector_snapshot.py); only partitions changed since the last
+# snapshot are rewritten. On restore, documents with updated_at at or after
+# the watermark are replayed from MongoDB, then each partition's size is
+# checked against MongoDB: a mismatch (deletes since the snapshot, writes
+# from another worker) reloads that one partition from MongoDB in full.
+
+SNAPSHOT_WATERMARK_SLACK_S = 60   # allowance for clock skew between workers
+
+_snapshot: Optional[Dict[str, Any]] = None   # manifest currently on disk (None = no usable snapshot)
+_snapshot_dirty: Set[str] = set()
+_snapshot_running = False
+_snapshot_stats: Dict[str, Any] = {
+    "snapshots": 0,
+    "partitions_written": 0,
+    "docs_from_snapshot": 0,
+    "partitions_repaired": 0,
+    "last_snapshot_ms": 0.0,
+}
+
+
+def _mongo_scope(partition: str) -> Dict[str, Any]:
+    """vector_store filter selecting one partition's documents."""
+    return {"metadata.user_id": partition} if partition else {"metadata.user_id": {"$exists": False}}
+
+
+def _snapshot_watermark() -> datetime:
+    return datetime.fromisoformat(_snapshot["watermark"])
+
+
+def _snapshot_complete(partition: str) -> bool:
+    """Only partitions holding all of their documents may be snapshotted."""
+    return (
+        not partition
+        or get_settings().VECTOR_REHYDRATE_MODE == "eager"
+        or partition in _loaded_users
+    )
+
+
+def _write_partition(directory: str, partition: str) -> Optional[str]:
+    """Write one partition's files (runs in a worker thread). Returns its stem, or None if empty."""
+    stem = _partition_name(partition)
+    coll = _collections.get(partition)
+    rows = coll.get(include=["embeddings", "documents", "metadatas"]) if coll is not None else None
+    if not rows or not rows["ids"]:
+        vector_snapshot.remove_partition(directory, stem)
+        return None
+    vector_snapshot.write_partition(
+        directory,
+        stem,
+        rows["ids"],
+        [d or "" for d in rows["documents"]],
+        rows["metadatas"],
+        rows["embeddings"],
+        MODEL_NAME,
+    )
+    return stem
+
+
+async def snapshot_to_disk() -> int:
+    """Write changed partitions and a new watermark to VECTOR_SNAPSHOT_DIR.
+
+    Runs every VECTOR_SNAPSHOT_INTERVAL_S (snapshot_loop) and once at
+    shutdown. Returns the number of partitions rewritten.
+    """
+    global _snapshot, _snapshot_running
+    directory = get_settings().VECTOR_SNAPSHOT_DIR
+    if not directory or _snapshot_running:
+        return 0
+    _snapshot_running = True
+    start = time.monotonic()
+    try:
+        # Taken before any partition is read: later writes are replayed from MongoDB
+        watermark = datetime.now(timezone.utc) - timedelta(seconds=SNAPSHOT_WATERMARK_SLACK_S)
+        manifest = vector_snapshot.read_manifest(directory)
+        if manifest is None or manifest.get("model") != MODEL_NAME:
+            partitions: Dict[str, str] = {}
+            changed = set(_collections) | _snapshot_dirty
+        else:
+            partitions = dict(manifest["partitions"])
+            changed = set(_snapshot_dirty)
+            if not changed:
+                return 0
+
+        written = 0
+        for partition in changed:
+            _snapshot_dirty.discard(partition)
+            if partition not in _collections or not _snapshot_complete(partition):
+                # Changed while not (fully) in memory — the file on disk is stale
+                if partitions.pop(partition, None) is not None:
+                    vector_snapshot.remove_partition(directory, _partition_name(partition))
+                continue
+            try:
+                stem = await asyncio.to_thread(_write_partition, directory, partition)
+            except Exception as e:
+                # Keep the previous watermark so the next start replays what this missed
+                _snapshot_dirty.update(changed)
+                logger.warning("[VectorStore] Snapshot of partition %s failed: %s", _partition_name(partition), e)
+                return written
+            if stem is None:
+                partitions.pop(partition, None)
+            else:
+                partitions[partition] = stem
+            written += 1
+
+        await asyncio.to_thread(
+            vector_snapshot.write_manifest, directory, MODEL_NAME, watermark.isoformat(), partitions,
+        )
+        _snapshot = {"model": MODEL_NAME, "watermark": watermark.isoformat(), "partitions": partitions}
+        elapsed_ms = (time.monotonic() - start) * 1000
+        _snapshot_stats["snapshots"] += 1
+        _snapshot_stats["partitions_written"] += written
+        _snapshot_stats["last_snapshot_ms"] = round(elapsed_ms, 2)
+        logger.info(
+            "[VectorStore] Snapshot written: partitions=%d/%d watermark=%s in %.1fms",
+            written, len(partitions), watermark.isoformat(), elapsed_ms,
+        )
+        return written
+    finally:
+        _snapshot_running = False
+
+
+async def snapshot_loop() -> None:
+    """Background task: snapshot changed partitions every VECTOR_SNAPSHOT_INTERVAL_S."""
+    settings = get_settings()
+    if not settings.VECTOR_SNAPSHOT_DIR:
+        return
+    while True:
+        await asyncio.sleep(settings.VECTOR_SNAPSHOT_INTERVAL_S)
+        try:
+            await snapshot_to_disk()
+        except Exception as e:
+            logger.warning("[VectorStore] Periodic snapshot failed: %s", e)
+
+
+async def _restore_snapshot(progress: Optional[Callable[[int], None]] = None) -> Optional[int]:
+    """Startup from the disk snapshot. Returns None when there is no usable snapshot."""
+    global _snapshot
+    settings = get_settings()
+    manifest = vector_snapshot.read_manifest(settings.VECTOR_SNAPSHOT_DIR)
+    if manifest is None or manifest.get("model") != MODEL_NAME:
+        logger.info("[VectorStore] No usable snapshot in %s — rehydrating from MongoDB", settings.VECTOR_SNAPSHOT_DIR)
+        return None
+    _snapshot = manifest
+    lazy = settings.VECTOR_REHYDRATE_MODE == "lazy"
+
+    for partition in ([""] if lazy else list(manifest["partitions"])):
+        if partition in manifest["partitions"]:
+            await _load_snapshot_partition(partition)
+    since: Dict[str, Any] = {"updated_at": {"$gte": _snapshot_watermark()}}
+    if lazy:
+        since.update(_mongo_scope(""))
+    await _rehydrate(since, "since-snapshot", progress)
+    await _repair_partitions([""] if lazy else None)
+    if not lazy:
+        _loaded_users.update(p for p in _collections if p)
+
+    loaded = count()
+    logger.info(
+        "[VectorStore] Restored %d vectors from snapshot (watermark=%s, %d from snapshot files)",
+        loaded, manifest["watermark"], _snapshot_stats["docs_from_snapshot"],
     )
-    logger.info("[VectorStore] Reloaded %d vectors from MongoDB", len(docs))
-    return len(docs)
+    return loaded
+
+
+async def _load_user(user_id: str) -> None:
+    """Lazy-mode user load: snapshot file + MongoDB delta when available, else MongoDB."""
+    if _snapshot is None or user_id not in _snapshot["partitions"]:
+        await _rehydrate(_mongo_scope(user_id), f"user={user_id}")
+        return
+    await _load_snapshot_partition(user_id)
+    await _rehydrate(
+        {**_mongo_scope(user_id), "updated_at": {"$gte": _snapshot_watermark()}},
+        f"user={user_id} since-snapshot",
+    )
+    await _repair_partitions([user_id])
+
+
+async def _load_snapshot_partition(partition: str) -> int:
+    """Upsert one partition's snapshot file into Chroma (embeddings are memory-mapped)."""
+    settings = get_settings()
+    stem = _snapshot["partitions"][partition]
+    snap = await asyncio.to_thread(vector_snapshot.read_partition, settings.VECTOR_SNAPSHOT_DIR, stem)
+    if snap is None or snap[0] != MODEL_NAME:
+        logger.warning("[VectorStore] Snapshot file unusable: %s", stem)
+        return 0
+    _, ids, documents, metadatas, matrix = snap
+    batch_size = settings.VECTOR_REHYDRATE_BATCH_SIZE
+    for i in range(0, len(ids), batch_size):
+        j = i + batch_size
+        _put(partition, ids[i:j], documents[i:j], matrix[i:j], metadatas[i:j])
+        await asyncio.sleep(0)
+    _invalidate_recall(partition)   # identical to the file — not marked dirty
+    _snapshot_stats["docs_from_snapshot"] += len(ids)
+    return len(ids)
+
+
+async def _repair_partitions(partitions: Optional[List[str]]) -> int:
+    """Reload from MongoDB every partition whose size disagrees with MongoDB.
+
+    partitions=None checks every partition known to either side.
+    """
+    db = get_db()
+    if partitions is None:
+        expected: Dict[str, int] = {}
+        async for row in db.vector_store.aggregate([{"$group": {"_id": "$metadata.user_id", "n": {"$sum": 1}}}]):
+            expected[row["_id"] or ""] = row["n"]
+        partitions = sorted(set(expected) | set(_collections))
+    else:
+        expected = {p: await db.vector_store.count_documents(_mongo_scope(p)) for p in partitions}
+
+    reloaded = 0
+    for partition in partitions:
+        have = _collections[partition].count() if partition in _collections else 0
+        if have == expected.get(partition, 0):
+            continue
+        logger.info(
+            "[VectorStore] Snapshot partition %s out of date (%d vs %d in MongoDB) — reloading",
+            _partition_name(partition), have, expected.get(partition, 0),
+        )
+        evict_user(partition)
+        reloaded += await _rehydrate(_mongo_scope(partition), f"repair={partition or 'shared'}")
+        if partition:
+            _loaded_users.add(partition)
+        _snapshot_dirty.add(partition)
+        _snapshot_stats["partitions_repaired"] += 1
+    return reloaded
 
 
 def query(
@@ -152,55 +813,263 @@ def query(
     n_results: int = 5,
     where: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
-    """Semantic similarity search using ONNX embeddings."""
-    coll = _get_collection()
+    """Semantic similarity search using ONNX embeddings.
+
+    A user_id clause in `where` selects that user's partition; queries
+    without one search only the shared (user-less) partition.
+    """
+    return _run_query({"query_texts": [query_text]}, n_results, where)
+
+
+async def query_async(
+    query_text: str,
+    n_results: int = 5,
+    where: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Async query(): the query embedding goes through the shared micro-batcher."""
+    partition, _ = _split_where(where)
+    if _get_collection(partition).count() == 0:
+        return []
+    embedding = await embed_one_async(query_text)
+    return _run_query({"query_embeddings": [embedding]}, n_results, where)
+
+
+async def query_many_async(
+    query_texts: List[str],
+    n_results: int = 5,
+    where: Optional[Dict[str, Any]] = None,
+) -> List[List[Dict[str, Any]]]:
+    """Several queries against one partition: one embedding batch, one Chroma call.
+
+    Returns one result list per query, in input order.
+    """
+    if not query_texts:
+        return []
+    partition, _ = _split_where(where)
+    if _get_collection(partition).count() == 0:
+        return [[] for _ in query_texts]
+    embeddings = await embed_async(query_texts)
+    return _run_queries({"query_embeddings": embeddings}, n_results, where, len(query_texts))
+
+
+# ── Lexical fast path ───────────────────────────────────────────────────────
+# Same partition routing and `where` semantics as query(); no embedding.
+
+def name_query(query_text: str, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+    """Rows for a query that is just a (near-)exact known name, else None."""
+    partition, residual = _split_where(where)
+    lex = _lexical.get(partition)
+    if lex is None:
+        return None
+    name = lex.match_name(query_text)
+    if name is None:
+        return None
+    return lex.find_by_name(name, where=residual, limit=n_results)
+
+
+def find_by_name(
+    name: str = "",
+    contact_id: str = "",
+    where: Optional[Dict[str, Any]] = None,
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
+    """Docs whose contact/entity name contains `name` (or contact_id contains `contact_id`)."""
+    partition, residual = _split_where(where)
+    lex = _lexical.get(partition)
+    if lex is None:
+        return []
+    return lex.find_by_name(name, contact_id.lower(), where=residual, limit=limit)
+
+
+def lexical_search(query_text: str, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Keyword (IDF-ranked) search over the partition's text and names."""
+    partition, residual = _split_where(where)
+    lex = _lexical.get(partition)
+    if lex is None:
+        return []
+    return lex.search(query_text, n_results, where=residual)
+
+
+def _run_query(
+    kwargs: Dict[str, Any],
+    n_results: int,
+    where: Optional[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    return _run_queries(kwargs, n_results, where, 1)[0]
+
+
+def _run_queries(
+    kwargs: Dict[str, Any],
+    n_results: int,
+    where: Optional[Dict[str, Any]],
+    n_queries: int,
+) -> List[List[Dict[str, Any]]]:
+    partition, residual = _split_where(where)
+    exact = _exact.get(partition)
+    if exact is not None and where_supported(residual):
+        if not len(exact):
+            return [[] for _ in range(n_queries)]
+        embeddings = kwargs["query_embeddings"] if "query_embeddings" in kwargs else embed(kwargs["query_texts"])
+        _exact_stats["queries"] += n_queries
+        return exact.search(embeddings, n_results, residual)
+
+    coll = _get_collection(partition)
     actual_count = coll.count()
     if actual_count == 0:
+        return [[] for _ in range(n_queries)]
+    _exact_stats["hnsw_queries"] += n_queries
+    kwargs["n_results"] = min(n_results, actual_count)
+    if residual:
+        kwargs["where"] = residual
+
+    results = coll.query(**kwargs)
+
+    rows: List[List[Dict[str, Any]]] = []
+    for q in range(n_queries):
+        docs = []
+        if results and results["ids"] and q < len(results["ids"]):
+            for i, doc_id in enumerate(results["ids"][q]):
+                docs.append({
+                    "id": doc_id,
+                    "text": results["documents"][q][i] if results["documents"] else "",
+                    "metadata": results["metadatas"][q][i] if results["metadatas"] else {},
+                    "distance": results["distances"][q][i] if results.get("distances") else None,
+                })
+        rows.append(docs)
+    return rows
+
+
+# ── Deduplication ───────────────────────────────────────────────────────────
+# Exact duplicates (same text up to case / whitespace) come from the lexical
+# index's content hashes; near-duplicates, when max_distance > 0, from a
+# top-1 vector query. Same partition routing and `where` semantics as query().
+
+async def find_duplicates_async(
+    texts: List[str],
+    wheres: List[Optional[Dict[str, Any]]],
+    max_distance: float = 0.0,
+) -> Tuple[List[Optional[Dict[str, Any]]], Optional[List[List[float]]]]:
+    """The stored row each text duplicates (or None), plus the texts' embeddings.
+
+    Embeddings are returned (in input order) only when the near-duplicate
+    check had to compute them, so callers can add the misses without
+    embedding twice; otherwise None.
+    """
+    rows: List[Optional[Dict[str, Any]]] = []
+    for text, where in zip(texts, wheres):
+        partition, residual = _split_where(where)
+        lex = _lexical.get(partition)
+        rows.append(lex.find_by_hash(text, residual) if lex is not None and text else None)
+    missing = [i for i, row in enumerate(rows) if row is None]
+    if max_distance <= 0 or not missing:
+        return rows, None
+    embeddings = await embed_async(texts)
+    for i in missing:
+        hits = _run_query({"query_embeddings": [embeddings[i]]}, 1, wheres[i])
+        if hits and hits[0]["distance"] is not None and hits[0]["distance"] <= max_distance:
+            rows[i] = hits[0]
+    return rows, embeddings
+
+
+def get_document(doc_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """A stored row (id, text, metadata) from the in-memory index, or None."""
+    lex = _lexical.get(user_id or "")
+    if lex is None or doc_id not in lex.docs:
+        return None
+    return lex.row(doc_id)
+
+
+def update_metadata(doc_id: str, metadata: Dict[str, Any], user_id: Optional[str] = None) -> bool:
+    """Replace a document's metadata in place — the vector is kept, nothing is re-embedded.
+
+    Returns False if the document is not in the (loaded) partition.
+    """
+    partition = user_id or ""
+    lex = _lexical.get(partition)
+    if lex is None or doc_id not in lex.docs:
+        return False
+    text = lex.docs[doc_id][0]
+    _get_collection(partition).update(ids=[doc_id], metadatas=[metadata])
+    lex.add(doc_id, text, metadata)
+    if partition in _exact:
+        _exact[partition].set_metadata(doc_id, metadata)
+    _partition_changed(partition)
+    _persist_one(doc_id, text, metadata)   # $set without the embedding fields keeps the stored vector
+    return True
+
+
+def duplicate_groups(
+    user_id: str,
+    max_distance: float = 0.0,
+    exclude_types: Tuple[str, ...] = (),
+) -> List[List[str]]:
+    """Groups of duplicate doc ids in a user's loaded partition, first id = survivor.
+
+    Docs only group with docs of the same metadata `type`. Exact duplicates
+    share a content hash; with max_distance > 0, near-duplicates within that
+    cosine distance of a survivor join its group too (one top-k query per doc).
+    """
+    lex = _lexical.get(user_id)
+    if lex is None:
         return []
-    n_results = min(n_results, actual_count)
+    groups: Dict[str, List[str]] = {}
+    for doc_id, (text, meta, _, _) in lex.docs.items():
+        if not text or meta.get("type") in exclude_types:
+            continue
+        groups.setdefault(f"{meta.get('type')}:{content_hash(text)}", []).append(doc_id)
+    survivors = list(groups.values())
+    if max_distance > 0 and len(survivors) > 1:
+        coll = _get_collection(user_id)
+        got = coll.get(ids=[ids[0] for ids in survivors], include=["embeddings"])
+        vectors = dict(zip(got["ids"], got["embeddings"]))
+        absorbed: Set[str] = set()
+        by_survivor = {ids[0]: ids for ids in survivors}
+        for ids in survivors:
+            head = ids[0]
+            if head in absorbed or head not in vectors:
+                continue
+            doc_type = lex.docs[head][1].get("type")
+            where = {"$and": [{"user_id": user_id}, {"type": doc_type}]} if doc_type else {"user_id": user_id}
+            for hit in _run_query({"query_embeddings": [vectors[head]]}, 10, where):
+                other = hit["id"]
+                if (other == head or other in absorbed or other not in by_survivor
+                        or lex.docs[other][1].get("type") != doc_type
+                        or hit["distance"] is None or hit["distance"] > max_distance):
+                    continue
+                ids.extend(by_survivor[other])
+                absorbed.add(other)
+        survivors = [ids for ids in survivors if ids[0] not in absorbed]
+    return [ids for ids in survivors if len(ids) > 1]
 
-    kwargs: Dict[str, Any] = {
-        "query_texts": [query_text],
-        "n_results": n_results,
-    }
-    if where:
-        kwargs["where"] = where
 
-    results = coll.query(**kwargs)
+def delete_document(doc_id: str, user_id: Optional[str] = None) -> None:
+    """Delete a document from ChromaDB and MongoDB.
 
-    docs = []
-    if results and results["ids"]:
-        for i, doc_id in enumerate(results["ids"][0]):
-            docs.append({
-                "id": doc_id,
-                "text": results["documents"][0][i] if results["documents"] else "",
-                "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                "distance": results["distances"][0][i] if results.get("distances") else None,
-            })
-    return docs
-
-
-def delete_document(doc_id: str) -> None:
-    """Delete a document from ChromaDB and MongoDB."""
-    coll = _get_collection()
-    coll.delete(ids=[doc_id])
+    Pass user_id to target the owning partition directly; without it every
+    loaded partition is checked.
+    """
+    if user_id is not None:
+        _get_collection(user_id).delete(ids=[doc_id])
+        _lexical_index(user_id).remove(doc_id)
+        if user_id in _exact:
+            _exact[user_id].remove(doc_id)
+        _partition_changed(user_id)
+    else:
+        for partition, coll in list(_collections.items()):
+            coll.delete(ids=[doc_id])
+            _lexical_index(partition).remove(doc_id)
+            if partition in _exact:
+                _exact[partition].remove(doc_id)
+            _partition_changed(partition)
     # Also remove from MongoDB so it doesn't reload on restart
     try:
-        import asyncio
-        from core.database import get_db
-        async def _del():
-            db = get_db()
-            await db.vector_store.delete_one({"doc_id": doc_id})
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            asyncio.ensure_future(_del())
-        else:
-            loop.run_until_complete(_del())
+        get_write_behind().submit_delete(doc_id)
     except Exception as e:
         logger.warning("[VectorStore] MongoDB delete failed for %s: %s", doc_id, e)
 
 
-def count() -> int:
-    coll = _get_collection()
-    return coll.count()
-
+def count(user_id: Optional[str] = None) -> int:
+    """Documents in a user's partition, or across all loaded partitions when user_id is None."""
+    if user_id is not None:
+        return _get_collection(user_id).count()
+    return sum(coll.count() for coll in _collections.values())
@@ -0,0 +1,75 @@
+"""Vector Codec — compact embedding encodings for storage and transport.
+
+Encodings (384-dim bge-small vector → bytes):
+  f32  little-endian float32                         1536 B  (reference)
+  f16  little-endian float16                          768 B  (2x smaller)
+  i8   float32 scale + int8 (v ≈ q * scale,           388 B  (4x smaller)
+       scale = max|v| / 127, per vector)
+
+pack()/unpack() produce raw bytes (MongoDB BinData); encode()/decode()
+wrap them in base64 for JSON (~4/3 of the raw size, still 4–8x smaller
+than a JSON float list).
+
+Accuracy check (tests/test_vector_codec.py): top-10 cosine neighbours
+over 2,000 clustered unit vectors, 50 noisy queries, compared with f32.
+Measured overlap: f16 ≈ 0.998, i8 ≈ 0.988. The test fails below 0.99 / 0.97.
+"""
+import base64
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+ENCODINGS = ("f32", "f16", "i8")
+
+
+def pack(vector: Sequence[float], encoding: str = "f32") -> bytes:
+    v = np.asarray(vector, dtype=np.float32)
+    if encoding == "f32":
+        return v.astype("<f4").tobytes()
+    if encoding == "f16":
+        return v.astype("<f2").tobytes()
+    if encoding == "i8":
+        peak = float(np.abs(v).max()) if v.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        q = np.clip(np.rint(v / scale), -127, 127).astype(np.int8)
+        return np.float32(scale).astype("<f4").tobytes() + q.tobytes()
+    raise ValueError(f"Unknown vector encoding: {encoding}. Must be one of {ENCODINGS}")
+
+
+def unpack(blob: bytes, encoding: str = "f32") -> List[float]:
+    if encoding == "f32":
+        return np.frombuffer(blob, dtype="<f4").tolist()
+    if encoding == "f16":
+        return np.frombuffer(blob, dtype="<f2").astype(np.float32).tolist()
+    if encoding == "i8":
+        scale = np.frombuffer(blob[:4], dtype="<f4")[0]
+        q = np.frombuffer(blob[4:], dtype=np.int8)
+        return (q.astype(np.float32) * scale).tolist()
+    raise ValueError(f"Unknown vector encoding: {encoding}. Must be one of {ENCODINGS}")
+
+
+def encode(vector: Sequence[float], encoding: str) -> str:
+    """Base64 text form of pack() for JSON payloads."""
+    return base64.b64encode(pack(vector, encoding)).decode("ascii")
+
+
+def decode(data: str, encoding: str) -> List[float]:
+    return unpack(base64.b64decode(data), encoding)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Vector encoding requested via an Accept media-type parameter.
+
+    `Accept: application/json; vector-encoding=f16` → "f16". Missing or
+    unknown values fall back to "f32" (plain JSON float lists).
+    """
+    if not accept:
+        return "f32"
+    for media_range in accept.split(","):
+        for param in media_range.split(";")[1:]:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "vector-encoding":
+                value = value.strip().strip('"').lower()
+                if value in ENCODINGS:
+                    return value
+    return "f32"
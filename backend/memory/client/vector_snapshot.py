@@ -0,0 +1,92 @@
+"""Vector Snapshot — on-disk snapshots of in-memory Chroma partitions.
+
+Chroma runs in-memory, so a cold start streams every vector back out of
+MongoDB. With VECTOR_SNAPSHOT_DIR set, vector.py writes each partition's
+ids, documents, metadatas and float32 embedding matrix to local disk
+periodically and at shutdown; on startup the files are loaded (embeddings
+memory-mapped) straight into Chroma and only documents written after the
+snapshot watermark are read from MongoDB.
+
+Layout:
+  <dir>/manifest.json    model, watermark, partition key → file stem
+  <dir>/<stem>.npy       float32 (n, dim) embeddings
+  <dir>/<stem>.json      {"model", "ids", "documents", "metadatas"}
+
+Every file is written to a temp path and os.replace()d, the manifest last:
+a crash mid-snapshot leaves the previous watermark in place, so the MongoDB
+delta on the next start is larger, never missing.
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+VERSION = 1
+
+
+def _replace(path: str, write) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def write_partition(
+    directory: str,
+    stem: str,
+    ids: Sequence[str],
+    documents: Sequence[str],
+    metadatas: Sequence[Dict[str, Any]],
+    embeddings: Any,
+    model: str = "",
+) -> None:
+    os.makedirs(directory, exist_ok=True)
+    matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+    rows = {"model": model, "ids": list(ids), "documents": list(documents), "metadatas": list(metadatas)}
+    _replace(os.path.join(directory, f"{stem}.npy"), lambda f: np.save(f, matrix))
+    _replace(os.path.join(directory, f"{stem}.json"), lambda f: f.write(json.dumps(rows).encode("utf-8")))
+
+
+def read_partition(
+    directory: str,
+    stem: str,
+) -> Optional[Tuple[str, List[str], List[str], List[Dict[str, Any]], np.ndarray]]:
+    """(model, ids, documents, metadatas, memory-mapped embeddings), or None if missing/corrupt."""
+    try:
+        with open(os.path.join(directory, f"{stem}.json"), "rb") as f:
+            rows = json.loads(f.read())
+        matrix = np.load(os.path.join(directory, f"{stem}.npy"), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if matrix.ndim != 2 or matrix.shape[0] != len(rows["ids"]):
+        return None
+    return rows.get("model", ""), rows["ids"], rows["documents"], rows["metadatas"], matrix
+
+
+def remove_partition(directory: str, stem: str) -> None:
+    for ext in (".npy", ".json"):
+        try:
+            os.remove(os.path.join(directory, f"{stem}{ext}"))
+        except FileNotFoundError:
+            pass
+
+
+def write_manifest(directory: str, model: str, watermark: str, partitions: Dict[str, str]) -> None:
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"version": VERSION, "model": model, "watermark": watermark, "partitions": partitions}
+    _replace(os.path.join(directory, MANIFEST), lambda f: f.write(json.dumps(manifest).encode("utf-8")))
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, MANIFEST), "rb") as f:
+            manifest = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != VERSION:
+        return None
+    return manifest
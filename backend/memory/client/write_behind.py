@@ -0,0 +1,230 @@
+"""Vector Write-Behind — batched MongoDB persistence for the vector store.
+
+Chroma is updated synchronously; the durable copy in `vector_store` is
+written behind through this queue:
+  - Ops are coalesced per doc_id: a delete wins over anything queued, an
+    upsert after an upsert merges into it (partial $set updates such as
+    update_metadata() keep the queued embedding fields)
+  - A flusher task drains them as unordered bulk_write batches
+  - Backlog is bounded: async writers wait for capacity (backpressure)
+  - Failed batches are retried with backoff; per-op write errors are dropped
+  - flush() / close() drain everything — close() runs in the lifespan shutdown
+
+Stats (queue depth, flush latency, failures) are reported via get_stats().
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from core.database import get_db
+
+logger = logging.getLogger(__name__)
+
+_UPSERT = "upsert"
+_DELETE = "delete"
+
+
+class VectorWriteBehind:
+    """Coalescing, bounded write-behind queue for `vector_store` documents."""
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        max_backlog: int = 10000,
+        flush_interval_ms: float = 50.0,
+        max_retries: int = 3,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.max_backlog = max(1, max_backlog)
+        self.flush_interval_s = max(0.0, flush_interval_ms) / 1000.0
+        self.max_retries = max(1, max_retries)
+
+        self._pending: "OrderedDict[str, Tuple[str, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+        self.ops_flushed = 0
+        self.ops_dropped = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    # ── Producer API ──────────────────────────────────────────────────────
+
+    def submit_upsert(self, doc_id: str, doc: Dict[str, Any]) -> None:
+        """Queue a $set upsert of doc's fields (fire-and-forget, needs a running loop)."""
+        self._submit(doc_id, (_UPSERT, doc))
+
+    def submit_delete(self, doc_id: str) -> None:
+        """Queue a delete (fire-and-forget, needs a running loop)."""
+        self._submit(doc_id, (_DELETE, None))
+
+    async def wait_for_capacity(self) -> None:
+        """Backpressure: async writers call this before submitting."""
+        self._bind()
+        while len(self._pending) >= self.max_backlog:
+            self._wakeup.set()
+            self._space.clear()
+            await self._space.wait()
+
+    def _submit(self, doc_id: str, op: Tuple[str, Optional[Dict[str, Any]]]) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # The flusher and the Motor client both need a loop; nothing is queued
+            raise RuntimeError(
+                "VectorWriteBehind requires a running event loop; "
+                "sync callers must wrap vector writes in asyncio.run()"
+            ) from None
+        queued = self._pending.pop(doc_id, None)   # coalesce: the merged op moves to the back
+        if queued is not None and queued[0] == _UPSERT and op[0] == _UPSERT:
+            op = (_UPSERT, {**queued[1], **op[1]})
+        self._pending[doc_id] = op
+        self._bind()
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    # ── Flushing ──────────────────────────────────────────────────────────
+
+    def _bind(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._flusher is None or self._flusher.done():
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._space = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._stopping = False
+            self._flusher = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        backoff = self.flush_interval_s
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(backoff, 0.001))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            if not self._pending:
+                continue
+            ok = await self._flush_batch()
+            # Back off while Mongo is failing; reset once a batch lands
+            backoff = self.flush_interval_s if ok else min(max(backoff, 0.05) * 2, 5.0)
+
+    async def _flush_batch(self) -> bool:
+        async with self._flush_lock:
+            batch: List[Tuple[str, Tuple[str, Optional[Dict[str, Any]]]]] = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popitem(last=False))
+            if not batch:
+                return True
+            self._space.set()
+
+            ops = [
+                UpdateOne({"doc_id": doc_id}, {"$set": doc}, upsert=True) if kind == _UPSERT
+                else DeleteOne({"doc_id": doc_id})
+                for doc_id, (kind, doc) in batch
+            ]
+            start = time.monotonic()
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    await get_db().vector_store.bulk_write(ops, ordered=False)
+                    break
+                except BulkWriteError as e:
+                    # Unordered: everything except the reported ops was applied
+                    errors = e.details.get("writeErrors", [])
+                    self.ops_dropped += len(errors)
+                    logger.error("[WriteBehind] %d vector ops rejected: %s", len(errors), str(errors[:1])[:200])
+                    break
+                except Exception as e:
+                    logger.warning("[WriteBehind] bulk_write failed (attempt %d/%d): %s", attempt, self.max_retries, str(e))
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(0.05 * (2 ** attempt))
+            else:
+                self.flush_failures += 1
+                self._requeue(batch)
+                return False
+
+            elapsed_ms = (time.monotonic() - start) * 1000
+            self.flushes += 1
+            self.ops_flushed += len(batch)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            logger.debug("[WriteBehind] Flushed %d vector ops in %.1fms", len(batch), elapsed_ms)
+            return True
+
+    def _requeue(self, batch: List[Tuple[str, Tuple[str, Optional[Dict[str, Any]]]]]) -> None:
+        """Put a failed batch back at the front, unless a newer op superseded it."""
+        survivors = [(doc_id, op) for doc_id, op in batch if doc_id not in self._pending]
+        for doc_id, op in reversed(survivors):
+            self._pending[doc_id] = op
+            self._pending.move_to_end(doc_id, last=False)
+
+    async def flush(self) -> None:
+        """Drain the queue completely (stops early if Mongo keeps failing)."""
+        if self._flush_lock is None or self._loop is not asyncio.get_running_loop():
+            self._flush_lock = asyncio.Lock()
+            self._space = asyncio.Event()
+        while self._pending:
+            if not await self._flush_batch():
+                logger.error("[WriteBehind] Flush aborted: %d vector ops still pending", len(self._pending))
+                return
+
+    async def close(self) -> None:
+        """Stop the flusher task and flush (FastAPI lifespan shutdown).
+
+        The flusher is signalled rather than cancelled: a batch it has already
+        taken off the queue is written (or requeued) before it exits.
+        """
+        if self._flusher and not self._flusher.done():
+            self._stopping = True
+            self._wakeup.set()
+            await self._flusher
+        self._flusher = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": len(self._pending),
+            "max_backlog": self.max_backlog,
+            "flushes": self.flushes,
+            "ops_flushed": self.ops_flushed,
+            "ops_dropped": self.ops_dropped,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+
+_write_behind: Optional[VectorWriteBehind] = None
+
+
+def get_write_behind() -> VectorWriteBehind:
+    global _write_behind
+    if _write_behind is None:
+        from config.settings import get_settings
+        settings = get_settings()
+        _write_behind = VectorWriteBehind(
+            batch_size=settings.VECTOR_PERSIST_BATCH_SIZE,
+            max_backlog=settings.VECTOR_PERSIST_MAX_BACKLOG,
+            flush_interval_ms=settings.VECTOR_PERSIST_FLUSH_INTERVAL_MS,
+        )
+    return _write_behind
+
+
+async def shutdown_write_behind() -> None:
+    """Flush every pending vector write — must run before the DB client closes."""
+    if _write_behind is not None:
+        await _write_behind.close()
+        logger.info("[WriteBehind] Shutdown flush complete: %s", _write_behind.get_stats())
@@ -14,9 +14,12 @@ Confidential contacts are stored with confidential=true in metadata.
 RAG queries filter them out unless biometric-unlocked.
 """
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
-from memory.client.vector import add_document
+from pymongo import UpdateOne
+
+from core.database import get_db
+from memory.client.vector import add_documents, add_documents_async
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +28,15 @@ def ingest_contact(user_id: str, contact: Dict[str, Any]) -> int:
     """Ingest a single distilled contact into the vector store.
     Returns number of documents added.
     """
+    docs = contact_documents(user_id, contact)
+    if docs:
+        ids, texts, metas = (list(col) for col in zip(*docs))
+        add_documents(ids, texts, metas)
+    return len(docs)
+
+
+def contact_documents(user_id: str, contact: Dict[str, Any]) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Build the (doc_id, text, metadata) vector documents for one distilled contact."""
     identity = contact.get("identity", {})
     name = identity.get("name", "unknown")
     phone = identity.get("phone", identity.get("email", ""))
@@ -35,9 +47,9 @@ def ingest_contact(user_id: str, contact: Dict[str, Any]) -> int:
 
     # Skip contacts with no useful data
     if not name or name == "unknown":
-        return 0
+        return []
     if relationship == "unknown" and not contact.get("active_threads"):
-        return 0
+        return []
 
     base_meta = {
         "user_id": user_id,
@@ -48,7 +60,7 @@ def ingest_contact(user_id: str, contact: Dict[str, Any]) -> int:
         "inner_circle_rank": rank,
     }
 
-    docs_added = 0
+    docs: List[Tuple[str, str, Dict[str, Any]]] = []
     slug = name.lower().replace(" ", "_").replace("@", "_at_")[:30]
 
     # 1. Identity document
@@ -65,12 +77,7 @@ def ingest_contact(user_id: str, contact: Dict[str, Any]) -> int:
     if sentiment and sentiment != "unknown":
         identity_text += f" Relationship sentiment: {sentiment}."
 
-    add_document(
-        doc_id=f"ds_{source}_{slug}_identity",
-        text=identity_text,
-        metadata={**base_meta, "doc_type": "identity"},
-    )
-    docs_added += 1
+    docs.append((f"ds_{source}_{slug}_identity", identity_text, {**base_meta, "doc_type": "identity"}))
 
     # 2. Active threads — each thread is a separate document (high recall priority)
     for i, thread in enumerate(contact.get("active_threads", [])[:5]):
@@ -100,12 +107,7 @@ def ingest_contact(user_id: str, contact: Dict[str, Any]) -> int:
         if tension and tension != "none":
             thread_text += f" Tension level: {tension}."
 
-        add_document(
-            doc_id=f"ds_{source}_{slug}_thread_{i}",
-            text=thread_text,
-            metadata={**base_meta, "doc_type": "active_thread", "thread_type": thread_type, "tension": tension},
-        )
-        docs_added += 1
+        docs.append((f"ds_{source}_{slug}_thread_{i}", thread_text, {**base_meta, "doc_type": "active_thread", "thread_type": thread_type, "tension": tension}))
 
     # 3. Pending actions — user owes and they owe
     pending = contact.get("pending_actions", {})
@@ -114,32 +116,17 @@ def ingest_contact(user_id: str, contact: Dict[str, Any]) -> int:
 
     if user_owes:
         text = f"User owes {name}: {'; '.join(user_owes)}."
-        add_document(
-            doc_id=f"ds_{source}_{slug}_user_owes",
-            text=text,
-            metadata={**base_meta, "doc_type": "pending_action", "direction": "user_owes"},
-        )
-        docs_added += 1
+        docs.append((f"ds_{source}_{slug}_user_owes", text, {**base_meta, "doc_type": "pending_action", "direction": "user_owes"}))
 
     if they_owe:
         text = f"{name} owes user: {'; '.join(they_owe)}."
-        add_document(
-            doc_id=f"ds_{source}_{slug}_they_owe",
-            text=text,
-            metadata={**base_meta, "doc_type": "pending_action", "direction": "they_owe"},
-        )
-        docs_added += 1
+        docs.append((f"ds_{source}_{slug}_they_owe", text, {**base_meta, "doc_type": "pending_action", "direction": "they_owe"}))
 
     # 4. Aspirations
     aspirations = contact.get("aspirations_mentioned", [])
     if aspirations:
         text = f"Aspirations mentioned with {name}: {'; '.join(aspirations)}."
-        add_document(
-            doc_id=f"ds_{source}_{slug}_aspirations",
-            text=text,
-            metadata={**base_meta, "doc_type": "aspiration"},
-        )
-        docs_added += 1
+        docs.append((f"ds_{source}_{slug}_aspirations", text, {**base_meta, "doc_type": "aspiration"}))
 
     # 5. Emotional context
     emo = contact.get("emotional_context", {})
@@ -149,24 +136,20 @@ def ingest_contact(user_id: str, contact: Dict[str, Any]) -> int:
         text = f"Relationship with {name}: {mood}."
         if events:
             text += f" Recent: {'; '.join(events)}."
-        add_document(
-            doc_id=f"ds_{source}_{slug}_emotional",
-            text=text,
-            metadata={**base_meta, "doc_type": "emotional_context"},
-        )
-        docs_added += 1
+        docs.append((f"ds_{source}_{slug}_emotional", text, {**base_meta, "doc_type": "emotional_context"}))
 
     logger.info("[DS_INGEST] user=%s contact=%s docs=%d confidential=%s",
-                user_id, name, docs_added, confidential)
-    return docs_added
+                user_id, name, len(docs), confidential)
+    return docs
 
 
-def ingest_extraction_results(user_id: str, contacts: List[Dict[str, Any]], source: str = "unknown") -> Dict[str, int]:
+async def ingest_extraction_results(user_id: str, contacts: List[Dict[str, Any]], source: str = "unknown") -> Dict[str, int]:
     """Ingest all contacts from a DS extraction into the vector store.
-    Also persists to MongoDB for durability.
+    All documents are embedded in one batch and upserted in one call;
+    distilled contacts are persisted to MongoDB in one bulk_write.
     Returns stats: { contacts_ingested, documents_added }
     """
-    total_docs = 0
+    docs: List[Tuple[str, str, Dict[str, Any]]] = []
     total_contacts = 0
 
     for contact in contacts:
@@ -174,33 +157,32 @@ def ingest_extraction_results(user_id: str, contacts: List[Dict[str, Any]], sour
             continue
         if "source" not in contact:
             contact["source"] = source
-        docs = ingest_contact(user_id, contact)
-        total_docs += docs
+        docs.extend(contact_documents(user_id, contact))
         total_contacts += 1
 
+    if docs:
+        ids, texts, metas = (list(col) for col in zip(*docs))
+        await add_documents_async(ids, texts, metas)
+
     # Persist distilled contacts to MongoDB for durability
     try:
-        import os
-        from pymongo import MongoClient
-        mongo_url = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
-        db_name = os.environ.get("DB_NAME", "myndlens_prod")
-        client = MongoClient(mongo_url)
-        db = client[db_name]
+        ops = []
         for contact in contacts:
             name = contact.get("identity", {}).get("name", "")
             if not name:
                 continue
             contact_id = contact.get("identity", {}).get("phone") or contact.get("identity", {}).get("email") or name
             clean = {k: v for k, v in contact.items() if k != "thread_contents"}
-            db.ds_contacts.update_one(
+            ops.append(UpdateOne(
                 {"user_id": user_id, "contact_id": contact_id},
                 {"$set": {"user_id": user_id, "contact_id": contact_id, "source": source, **clean}},
                 upsert=True,
-            )
-        client.close()
+            ))
+        if ops:
+            await get_db().ds_contacts.bulk_write(ops, ordered=False)
     except Exception as e:
         logger.warning("[DS_INGEST] MongoDB persist failed (non-fatal): %s", str(e)[:60])
 
     logger.info("[DS_INGEST] user=%s source=%s contacts=%d docs=%d",
-                user_id, source, total_contacts, total_docs)
-    return {"contacts_ingested": total_contacts, "documents_added": total_docs}
+                user_id, source, total_contacts, len(docs))
+    return {"contacts_ingested": total_contacts, "documents_added": len(docs)}
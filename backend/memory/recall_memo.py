@@ -0,0 +1,145 @@
+"""Recall Memo — mandate-scoped memoization of Digital Self vector searches.
+
+One mandate hits recall() several times with the same transcript
+(gap fill, L1 Scout, Dimension Extractor, L2 Sentry). While a mandate
+cycle is bound (bind_cycle), vector search results are memoized per
+(cycle_id, user_id, normalized query, filter):
+  - A cached result for n results also answers any request for fewer
+  - Searches run outside a mandate cycle are never memoized
+  - Any vector write for a user invalidates that user's entries
+  - Entries expire after RECALL_MEMO_TTL_S; the memo is LRU-bounded
+
+Writes are stamped from one global sequence. put() rejects rows whose
+search started before the user's last write. The per-user stamps are
+LRU-bounded like the entries; an evicted user falls back to the newest
+evicted stamp, which can only reject a put, never admit a stale one.
+
+Only the raw vector rows are memoized — graph enrichment is re-read on
+every recall, so it is never stale.
+"""
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Mandate cycle the current task is working on ("" = none — no memoization)
+_cycle: ContextVar[str] = ContextVar("recall_memo_cycle", default="")
+
+_Key = Tuple[str, str, str, str]
+
+
+class _Entry:
+    __slots__ = ("rows", "n_results", "expires_at")
+
+    def __init__(self, rows: List[Dict[str, Any]], n_results: int, expires_at: float):
+        self.rows = rows
+        self.n_results = n_results
+        self.expires_at = expires_at
+
+
+_entries: "OrderedDict[_Key, _Entry]" = OrderedDict()
+_user_keys: Dict[str, Set[_Key]] = {}
+_write_seq = 0
+_last_write: "OrderedDict[str, int]" = OrderedDict()
+_evicted_write = 0   # newest stamp dropped from _last_write
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def bind_cycle(cycle_id: str) -> None:
+    """Scope recalls made by the current task (and tasks it spawns) to a mandate cycle."""
+    _cycle.set(cycle_id or "")
+
+
+def current_cycle() -> str:
+    return _cycle.get()
+
+
+def normalize_query(query_text: str) -> str:
+    return " ".join(query_text.lower().split())
+
+
+def generation(user_id: str) -> int:
+    """Write sequence captured before a search, checked by put()."""
+    return _write_seq
+
+
+def _last_write_for(user_id: str) -> int:
+    return _last_write.get(user_id, _evicted_write)
+
+
+def _key(user_id: str, query_text: str, filter_key: str) -> Optional[_Key]:
+    cycle_id = _cycle.get()
+    if not cycle_id:
+        return None
+    return (cycle_id, user_id, normalize_query(query_text), filter_key)
+
+
+def get(user_id: str, query_text: str, filter_key: str, n_results: int) -> Optional[List[Dict[str, Any]]]:
+    """Memoized rows for this query in the current cycle, or None."""
+    key = _key(user_id, query_text, filter_key)
+    if key is None:
+        return None
+    entry = _entries.get(key)
+    if entry is None or entry.expires_at < time.monotonic():
+        _stats["misses"] += 1
+        return None
+    # A shorter result than asked for means the partition had no more docs
+    if entry.n_results < n_results and len(entry.rows) >= entry.n_results:
+        _stats["misses"] += 1
+        return None
+    _entries.move_to_end(key)
+    _stats["hits"] += 1
+    return entry.rows[:n_results]
+
+
+def put(
+    user_id: str,
+    query_text: str,
+    filter_key: str,
+    n_results: int,
+    rows: List[Dict[str, Any]],
+    gen: int,
+) -> None:
+    """Memoize rows fetched with n_results, unless the user was written to since `gen`."""
+    key = _key(user_id, query_text, filter_key)
+    if key is None or _last_write_for(user_id) > gen:
+        return
+    settings = get_settings()
+    previous = _entries.get(key)
+    if previous is not None and previous.n_results > n_results:
+        return
+    _entries[key] = _Entry(list(rows), n_results, time.monotonic() + settings.RECALL_MEMO_TTL_S)
+    _entries.move_to_end(key)
+    _user_keys.setdefault(user_id, set()).add(key)
+    while len(_entries) > settings.RECALL_MEMO_MAX_ENTRIES:
+        old_key, _ = _entries.popitem(last=False)
+        keys = _user_keys.get(old_key[1])
+        if keys is not None:
+            keys.discard(old_key)
+            if not keys:
+                del _user_keys[old_key[1]]
+
+
+def invalidate_user(user_id: str) -> None:
+    """Drop every memoized search for a user (called on any vector write)."""
+    global _write_seq, _evicted_write
+    _write_seq += 1
+    _last_write[user_id] = _write_seq
+    _last_write.move_to_end(user_id)
+    while len(_last_write) > get_settings().RECALL_MEMO_MAX_ENTRIES:
+        _, stamp = _last_write.popitem(last=False)
+        _evicted_write = max(_evicted_write, stamp)
+    keys = _user_keys.pop(user_id, None)
+    if keys:
+        for key in keys:
+            _entries.pop(key, None)
+        _stats["invalidations"] += 1
+
+
+def get_stats() -> Dict[str, Any]:
+    return {"entries": len(_entries), "users": len(_user_keys), "write_stamps": len(_last_write), **_stats}
@@ -6,11 +6,16 @@ Other services NEVER access memory storage directly.
 Read: allowed for L1 (suggestive), authoritative for L2 (verification)
 Write: only post-execution OR via explicit user confirmation
 """
+import asyncio
 import logging
 import uuid
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from config.settings import get_settings
+from memory import recall_memo
 from memory.client import vector, graph, kv
+from memory.client.lexical import content_hash, fuse
 
 logger = logging.getLogger(__name__)
 
@@ -31,38 +36,124 @@ async def recall(
       - Data shown in chat → biometric required
     Internal processing (L1 Scout, Gap Filler, Dimensions) → NO gate.
     """
-    # Build where filter — scope to user
-    where_filter: Dict[str, Any] = {"user_id": user_id}
-    if not include_confidential:
-        where_filter = {"$and": [{"user_id": user_id}, {"confidential": {"$ne": True}}]}
-
-    # 1. Semantic search in vector store — scoped to this user only
-    vector_results = vector.query(query_text, n_results=n_results, where=where_filter)
-
-    # 2. Enrich with graph context — load from DB if not in memory
-    enriched = []
-    for vr in vector_results:
-        node_id = vr.get("metadata", {}).get("node_id", vr["id"])
-        if user_id not in graph._graphs:
-            await graph.load_graph(user_id)
-        graph_node = graph.get_node(user_id, node_id)
-        neighbors = graph.get_neighbors(user_id, node_id)
-
-        enriched.append({
-            "node_id": node_id,
-            "text": vr["text"],
-            "distance": vr.get("distance"),
-            "provenance": (graph_node or {}).get("provenance", "OBSERVED"),
-            "graph_type": (graph_node or {}).get("type"),
-            "neighbors": len(neighbors),
-            "metadata": vr.get("metadata", {}),
-        })
+    results = await recall_many(user_id, [query_text], n_results, include_confidential)
+    return results[0]
+
+
+async def recall_many(
+    user_id: str,
+    queries: List[str],
+    n_results: int = 3,
+    include_confidential: bool = True,
+    lexical_fusion: bool = False,
+) -> List[List[Dict[str, Any]]]:
+    """recall() for several queries in one pass. Returns one list per query.
+
+    All queries are embedded in one batch and searched in one vector call;
+    the graph is loaded at most once and node degrees are read in bulk.
+    Queries that are just a known contact/entity name are answered from the
+    lexical index without embedding. lexical_fusion=True fuses keyword and
+    semantic rankings (reciprocal rank fusion) for the remaining queries.
+    Same confidentiality semantics as recall().
+    """
+    if not queries:
+        return []
+
+    where_filter = _where_for(user_id, include_confidential)
+    await vector.ensure_user_loaded(user_id)
+
+    # 1a. Name lookups — no embedding, no ANN search
+    vector_rows: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+    if get_settings().RECALL_NAME_FAST_PATH:
+        for i, q in enumerate(queries):
+            vector_rows[i] = vector.name_query(q, n_results=n_results, where=where_filter)
+
+    # 1b. Semantic search in vector store — scoped to this user only.
+    #     Inside a mandate cycle, searches already run this cycle are reused.
+    filter_key = ("all" if include_confidential else "non_confidential") + ("+lexical" if lexical_fusion else "")
+    for i, q in enumerate(queries):
+        if vector_rows[i] is None:
+            vector_rows[i] = recall_memo.get(user_id, q, filter_key, n_results)
+    missing = [i for i, row in enumerate(vector_rows) if row is None]
+    if missing:
+        gen = recall_memo.generation(user_id)
+        n_fetch = n_results
+        if recall_memo.current_cycle():
+            n_fetch = max(n_results, get_settings().RECALL_MEMO_MIN_RESULTS)
+        texts = [queries[i] for i in missing]
+        if len(texts) == 1:
+            fetched = [await vector.query_async(texts[0], n_results=n_fetch, where=where_filter)]
+        else:
+            fetched = await vector.query_many_async(texts, n_results=n_fetch, where=where_filter)
+        for i, rows in zip(missing, fetched):
+            if lexical_fusion:
+                keyword = vector.lexical_search(queries[i], n_results=n_fetch, where=where_filter)
+                rows = fuse(rows, keyword, n_fetch)
+            recall_memo.put(user_id, queries[i], filter_key, n_fetch, rows, gen)
+            vector_rows[i] = rows[:n_results]
 
+    enriched_rows = await _enrich(user_id, vector_rows)
     logger.info(
-        "[DigitalSelf] Recall: user=%s query='%s' results=%d",
-        user_id, query_text[:40], len(enriched),
+        "[DigitalSelf] Recall: user=%s queries=%d first='%s' results=%d",
+        user_id, len(queries), queries[0][:40], sum(len(r) for r in enriched_rows),
     )
-    return enriched
+    return enriched_rows
+
+
+async def lookup_by_name(
+    user_id: str,
+    name: str = "",
+    phone: str = "",
+    include_confidential: bool = True,
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
+    """Every memory about a named contact (name substring or phone match).
+
+    Served from the lexical index — no embedding. Results have the recall() shape.
+    """
+    await vector.ensure_user_loaded(user_id)
+    rows = vector.find_by_name(
+        name=name, contact_id=phone, where=_where_for(user_id, include_confidential), limit=limit,
+    )
+    return (await _enrich(user_id, [rows]))[0]
+
+
+def _where_for(user_id: str, include_confidential: bool) -> Dict[str, Any]:
+    """Vector where filter — always scoped to the user."""
+    if include_confidential:
+        return {"user_id": user_id}
+    return {"$and": [{"user_id": user_id}, {"confidential": {"$ne": True}}]}
+
+
+async def _enrich(
+    user_id: str,
+    vector_rows: List[List[Dict[str, Any]]],
+) -> List[List[Dict[str, Any]]]:
+    """Attach graph context (type, provenance, degree) — graph loaded at most once."""
+    if any(vector_rows):
+        await graph.ensure_loaded(user_id)
+    node_ids = [
+        [vr.get("metadata", {}).get("node_id", vr["id"]) for vr in row]
+        for row in vector_rows
+    ]
+    summaries = iter(graph.node_summaries(user_id, [n for row in node_ids for n in row]))
+
+    enriched_rows = []
+    for row, row_ids in zip(vector_rows, node_ids):
+        enriched = []
+        for vr, node_id in zip(row, row_ids):
+            summary = next(summaries) or {}
+            enriched.append({
+                "node_id": node_id,
+                "text": vr["text"],
+                "distance": vr.get("distance"),
+                "provenance": summary.get("provenance") or "OBSERVED",
+                "graph_type": summary.get("type"),
+                "neighbors": summary.get("degree", 0),
+                "metadata": vr.get("metadata", {}),
+            })
+        enriched_rows.append(enriched)
+    return enriched_rows
 
 
 async def resolve_entity(
@@ -73,6 +164,14 @@ async def resolve_entity(
     return await kv.resolve_entity(user_id, human_ref)
 
 
+async def resolve_many(
+    user_id: str,
+    human_refs: List[str],
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Resolve several human references at once (in-memory alias index)."""
+    return await kv.resolve_many(user_id, human_refs)
+
+
 async def store_fact(
     user_id: str,
     text: str,
@@ -84,11 +183,31 @@ async def store_fact(
     """Store a new fact in the Digital Self. Returns node_id.
 
     Write rules: only post-execution OR via explicit user confirmation.
+    A fact that duplicates a stored one of the same type (see _find_duplicates)
+    is merged into it and the existing node_id is returned.
     """
+    async with _fact_write_lock(user_id):
+        return await _store_fact(user_id, text, fact_type, provenance, related_to, metadata)
+
+
+async def _store_fact(
+    user_id: str,
+    text: str,
+    fact_type: str,
+    provenance: str,
+    related_to: Optional[str],
+    metadata: Optional[Dict[str, Any]],
+) -> str:
+    duplicates, embeddings = await _find_duplicates(user_id, [text], [fact_type])
+    if duplicates[0] is not None:
+        node_id = _merge_duplicate(user_id, duplicates[0], metadata, related_to, fact_type)
+        await graph.persist_graph(user_id)
+        return node_id
+
     node_id = str(uuid.uuid4())
 
     # Add to vector store
-    vector.add_document(
+    await vector.add_document_async(
         doc_id=node_id,
         text=text,
         metadata={
@@ -98,6 +217,7 @@ async def store_fact(
             "provenance": provenance,
             **(metadata or {}),
         },
+        embedding=embeddings[0] if embeddings else None,
     )
 
     # Add to graph
@@ -123,6 +243,142 @@ async def store_fact(
     return node_id
 
 
+# ── Write-time deduplication ────────────────────────────────────────────────
+# Facts are compared with the user's stored docs of the same type: same text
+# up to case / whitespace always counts (FACT_DEDUP_ENABLED), and with
+# FACT_DEDUP_MAX_DISTANCE > 0 so does the nearest doc within that cosine
+# distance. A duplicate's metadata is merged into the existing node instead
+# of minting a new one. compact_duplicates() applies the same rules offline.
+
+_IDENTITY_FIELDS = ("node_id", "user_id", "type", "provenance")
+
+# user_id → [lock, holders]. The duplicate check and the write it guards
+# await in between (embedding), so a user's fact writes run one at a time.
+_write_locks: Dict[str, list] = {}
+
+
+@asynccontextmanager
+async def _fact_write_lock(user_id: str) -> AsyncIterator[None]:
+    entry = _write_locks.setdefault(user_id, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _write_locks[user_id]
+
+
+async def _find_duplicates(
+    user_id: str,
+    texts: List[str],
+    fact_types: List[str],
+) -> Tuple[List[Optional[Dict[str, Any]]], Optional[List[List[float]]]]:
+    """Stored row each text duplicates (or None), plus embeddings if they were computed."""
+    settings = get_settings()
+    if not settings.FACT_DEDUP_ENABLED:
+        return [None] * len(texts), None
+    await vector.ensure_user_loaded(user_id)
+    wheres = [{"$and": [{"user_id": user_id}, {"type": t}]} for t in fact_types]
+    return await vector.find_duplicates_async(texts, wheres, settings.FACT_DEDUP_MAX_DISTANCE)
+
+
+def _merge_duplicate(
+    user_id: str,
+    row: Dict[str, Any],
+    metadata: Optional[Dict[str, Any]],
+    related_to: Optional[str],
+    fact_type: str,
+) -> str:
+    """Merge a duplicate write into the stored row's node. Returns its node_id."""
+    existing = row["metadata"]
+    node_id = existing.get("node_id", row["id"])
+    merged = _merged_metadata(existing, metadata)
+    vector.update_metadata(row["id"], merged, user_id)
+    _merge_into_node(user_id, node_id, existing, metadata, related_to, fact_type)
+    logger.info(
+        "[DigitalSelf] Fact deduplicated: user=%s node=%s occurrences=%d",
+        user_id, node_id, merged["occurrences"],
+    )
+    return node_id
+
+
+def _merged_metadata(existing: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """A duplicate's metadata folded into the kept doc's; identity fields are kept."""
+    merged = {**existing, **(metadata or {})}
+    merged.update({k: existing[k] for k in _IDENTITY_FIELDS if k in existing})
+    merged["occurrences"] = int(existing.get("occurrences", 1)) + 1
+    return merged
+
+
+def _merge_into_node(
+    user_id: str,
+    node_id: str,
+    existing: Dict[str, Any],
+    metadata: Optional[Dict[str, Any]],
+    related_to: Optional[str],
+    fact_type: str,
+) -> None:
+    """Apply a duplicate's metadata and related_to edge to the kept graph node."""
+    if metadata:
+        graph.add_node(
+            user_id=user_id,
+            node_id=node_id,
+            node_type=existing.get("type", fact_type),
+            data=metadata,
+            provenance=existing.get("provenance", "EXPLICIT"),
+        )
+    if related_to and related_to != node_id:
+        graph.add_edge(user_id, related_to, node_id, edge_type=fact_type)
+
+
+async def compact_duplicates(
+    user_id: str,
+    max_distance: Optional[float] = None,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Collapse duplicate facts already stored for a user (offline maintenance).
+
+    Each group of duplicates (same type; same text, or within max_distance —
+    default FACT_DEDUP_MAX_DISTANCE) keeps its first doc: the others' metadata
+    is merged into it, their graph edges are re-pointed to it, and their
+    vector docs and graph nodes are deleted. ENTITY docs are left alone —
+    the KV alias registry points at them.
+    """
+    if max_distance is None:
+        max_distance = get_settings().FACT_DEDUP_MAX_DISTANCE
+    await vector.ensure_user_loaded(user_id)
+    groups = vector.duplicate_groups(user_id, max_distance, exclude_types=("ENTITY",))
+    stats = {"groups": len(groups), "docs_removed": sum(len(ids) - 1 for ids in groups)}
+    if dry_run or not groups:
+        return stats
+
+    await graph.ensure_loaded(user_id)
+    for survivor, *dropped in groups:
+        keep = vector.get_document(survivor, user_id)
+        merged = dict(keep["metadata"])
+        occurrences = int(merged.get("occurrences", 1))
+        for doc_id in dropped:
+            row = vector.get_document(doc_id, user_id)
+            merged = {**row["metadata"], **merged}
+            occurrences += int(row["metadata"].get("occurrences", 1))
+        merged["occurrences"] = occurrences
+        vector.update_metadata(survivor, merged, user_id)
+        keep_node = merged.get("node_id", survivor)
+        drop_nodes = [vector.get_document(d, user_id)["metadata"].get("node_id", d) for d in dropped]
+        await graph.merge_nodes(user_id, keep_node, drop_nodes)
+        for doc_id in dropped:
+            vector.delete_document(doc_id, user_id)
+    await graph.persist_graph(user_id)
+
+    logger.info(
+        "[DigitalSelf] Duplicates compacted: user=%s groups=%d removed=%d",
+        user_id, stats["groups"], stats["docs_removed"],
+    )
+    return stats
+
+
 async def register_entity(
     user_id: str,
     entity_type: str,
@@ -155,7 +411,7 @@ async def register_entity(
     )
 
     # Vector store
-    vector.add_document(
+    await vector.add_document_async(
         doc_id=canonical_id,
         text=f"{entity_type}: {name}",
         metadata={"node_id": canonical_id, "user_id": user_id, "type": "ENTITY", "provenance": provenance},
@@ -170,9 +426,127 @@ async def register_entity(
     return canonical_id
 
 
+async def store_facts_bulk(
+    user_id: str,
+    facts: List[Dict[str, Any]],
+) -> List[str]:
+    """Store many facts at once. Returns node_ids in input order.
+
+    Each fact dict takes the store_fact() keyword arguments (text, fact_type,
+    provenance, related_to, metadata). All texts are embedded in one batch,
+    vectors are upserted in one call, graph mutations are applied in memory
+    and the graph is persisted once — instead of once per fact. Duplicates
+    of stored facts are merged as in store_fact(), and so is a repeat of an
+    earlier fact in the same batch (it gets that fact's node_id).
+    """
+    if not facts:
+        return []
+    async with _fact_write_lock(user_id):
+        return await _store_facts_bulk(user_id, facts)
+
+
+async def _store_facts_bulk(user_id: str, facts: List[Dict[str, Any]]) -> List[str]:
+    duplicates, embeddings = await _find_duplicates(
+        user_id, [f["text"] for f in facts], [f.get("fact_type", "FACT") for f in facts],
+    )
+    node_ids: List[str] = []
+    new_ids, texts, metadatas, new_embeddings = [], [], [], []
+    first_in_batch: Dict[Tuple[str, str], int] = {}   # → position in new_ids / metadatas
+    for i, f in enumerate(facts):
+        fact_type = f.get("fact_type", "FACT")
+        if duplicates[i] is not None:
+            # Re-read: an earlier fact in this batch may already have merged into the row
+            row = vector.get_document(duplicates[i]["id"], user_id) or duplicates[i]
+            node_ids.append(_merge_duplicate(user_id, row, f.get("metadata"), f.get("related_to"), fact_type))
+            continue
+        batch_key = (fact_type, content_hash(f["text"]))
+        if get_settings().FACT_DEDUP_ENABLED and batch_key in first_in_batch:
+            j = first_in_batch[batch_key]
+            first = metadatas[j]
+            metadatas[j] = _merged_metadata(first, f.get("metadata"))
+            _merge_into_node(user_id, new_ids[j], first, f.get("metadata"), f.get("related_to"), fact_type)
+            node_ids.append(new_ids[j])
+            continue
+        node_id = str(uuid.uuid4())
+        first_in_batch[batch_key] = len(new_ids)
+        node_ids.append(node_id)
+        new_ids.append(node_id)
+        if embeddings is not None:
+            new_embeddings.append(embeddings[i])
+        provenance = f.get("provenance", "EXPLICIT")
+        metadata = f.get("metadata") or {}
+        texts.append(f["text"])
+        metadatas.append({
+            "node_id": node_id,
+            "user_id": user_id,
+            "type": fact_type,
+            "provenance": provenance,
+            **metadata,
+        })
+        graph.add_node(
+            user_id=user_id,
+            node_id=node_id,
+            node_type=fact_type,
+            data={"text": f["text"], **metadata},
+            provenance=provenance,
+        )
+        if f.get("related_to"):
+            graph.add_edge(user_id, f["related_to"], node_id, edge_type=fact_type)
+
+    await vector.add_documents_async(new_ids, texts, metadatas, embeddings=new_embeddings or None)
+    await graph.persist_graph(user_id)
+
+    logger.info(
+        "[DigitalSelf] Facts stored (bulk): user=%s count=%d new=%d",
+        user_id, len(node_ids), len(new_ids),
+    )
+    return node_ids
+
+
+async def register_entities_bulk(
+    user_id: str,
+    entities: List[Dict[str, Any]],
+) -> List[str]:
+    """Register many named entities at once. Returns canonical_ids in input order.
+
+    Each entity dict takes the register_entity() keyword arguments
+    (entity_type, name, aliases, data, provenance). One KV bulk_write, one
+    embedding batch, one vector upsert, one graph persist.
+    """
+    if not entities:
+        return []
+    canonical_ids = [str(uuid.uuid4()) for _ in entities]
+    kv_entities, texts, metadatas = [], [], []
+    for canonical_id, e in zip(canonical_ids, entities):
+        provenance = e.get("provenance", "EXPLICIT")
+        kv_entities.append({
+            "canonical_id": canonical_id,
+            "entity_type": e["entity_type"],
+            "human_refs": [e["name"]] + (e.get("aliases") or []),
+            "data": e.get("data"),
+            "provenance": provenance,
+        })
+        graph.add_node(
+            user_id=user_id,
+            node_id=canonical_id,
+            node_type="ENTITY",
+            data={"name": e["name"], "entity_type": e["entity_type"], **(e.get("data") or {})},
+            provenance=provenance,
+        )
+        texts.append(f"{e['entity_type']}: {e['name']}")
+        metadatas.append({"node_id": canonical_id, "user_id": user_id, "type": "ENTITY", "provenance": provenance})
+
+    await kv.register_entities_bulk(user_id, kv_entities)
+    await vector.add_documents_async(canonical_ids, texts, metadatas)
+    await graph.persist_graph(user_id)
+
+    logger.info("[DigitalSelf] Entities registered (bulk): user=%s count=%d", user_id, len(canonical_ids))
+    return canonical_ids
+
+
 def get_memory_stats(user_id: str) -> Dict[str, Any]:
     """Get memory statistics for a user."""
     return {
-        "vector_count": vector.count(),
+        "vector_count": vector.count(user_id),
         "graph_nodes": graph.node_count(user_id),
     }
@@ -10,6 +10,9 @@ from typing import Any, Dict
 from core.database import get_db
 from abuse.circuit_breakers import get_all_breaker_statuses
 from gateway.ws_server import get_active_session_count
+from memory import recall_memo
+from memory.client import graph
+from memory.client.write_behind import get_write_behind
 
 logger = logging.getLogger(__name__)
 
@@ -42,4 +45,7 @@ async def get_system_metrics() -> Dict[str, Any]:
             "bypass_attempts": bypass_attempts,
         },
         "circuit_breakers": get_all_breaker_statuses(),
+        "vector_persistence": get_write_behind().get_stats(),
+        "graph_cache": graph.get_cache_stats(),
+        "recall_memo": recall_memo.get_stats(),
     }
@@ -33,6 +33,8 @@ class WSMessageType(str, Enum):
     TRANSCRIPT_FINAL = "transcript_final"
     DRAFT_UPDATE = "draft_update"
     TTS_AUDIO = "tts_audio"
+    TTS_AUDIO_CHUNK = "tts_audio_chunk"       # Backend → Device: next piece of a streamed TTS response
+    TTS_AUDIO_END = "tts_audio_end"           # Backend → Device: streamed TTS response complete
     EXECUTE_BLOCKED = "execute_blocked"
     EXECUTE_OK = "execute_ok"
     PIPELINE_STAGE = "pipeline_stage"
@@ -72,6 +74,7 @@ class AuthPayload(BaseModel):
     delegation_mode: str = "assisted"   # advisory | assisted | delegated
     ds_paused: bool = False             # Pause Digital Self signal ingestion
     data_residency: str = "on_device"  # on_device | cloud_backup
+    tts_streaming: bool = False         # Client plays tts_audio_chunk streams (else one tts_audio with full audio)
 
 
 class HeartbeatPayload(BaseModel):
@@ -160,6 +163,24 @@ class TTSAudioPayload(BaseModel):
     skip_chat: bool = False      # True = don't add this TTS text to chat history
     awaiting_command: Optional[str] = None  # "approve_or_change" | None — drives frontend button state
     draft_id: Optional[str] = None  # For mandate resume — lets frontend track which draft to approve
+    stream_id: Optional[str] = None  # Set = audio follows as tts_audio_chunk envelopes, closed by tts_audio_end
+
+
+class TTSAudioChunkPayload(BaseModel):
+    """One piece of a streamed TTS response. Chunks are sent in seq order (0, 1, ...)."""
+    stream_id: str
+    session_id: str
+    seq: int
+    audio: str  # base64 MP3 bytes — concatenating all chunks gives the full file
+
+
+class TTSAudioEndPayload(BaseModel):
+    """End marker for a streamed TTS response."""
+    stream_id: str
+    session_id: str
+    chunk_count: int
+    audio_size_bytes: int
+    complete: bool = True  # False = provider failed mid-stream; play what arrived
 
 
 class ExecuteBlockedPayload(BaseModel):
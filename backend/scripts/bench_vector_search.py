@@ -0,0 +1,111 @@
+"""
+Vector search benchmark — exact NumPy top-k vs Chroma HNSW per partition size.
+
+For each partition size builds one Chroma collection (cosine, like the
+Digital Self partitions) and one ExactIndex over the same clustered 384-dim
+vectors, then times top-k queries twice: unfiltered (recall() with
+confidential docs included — the user_id scope is the partition itself)
+and with the {"confidential": {"$ne": True}} filter. Reports median / p95
+latency per query and HNSW recall@k against the exact result. The
+crossover is the first size where HNSW's median latency beats the exact
+path; set VECTOR_EXACT_SEARCH_MAX_DOCS just below it.
+
+Run: cd /app/backend && python scripts/bench_vector_search.py [--sizes 500,2000,10000] [--queries 200]
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import chromadb  # noqa: E402
+
+from memory.client.exact import ExactIndex  # noqa: E402
+
+DIM = 384
+FILTERS = {"none": None, "confidential": {"confidential": {"$ne": True}}}
+
+
+def _dataset(n: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.normal(size=(max(8, n // 50), DIM)).astype(np.float32)
+    points = centers[rng.integers(0, len(centers), n)] + 0.35 * rng.normal(size=(n, DIM)).astype(np.float32)
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+def _timed(fn, queries):
+    latencies, results = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(fn(q))
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1], results
+
+
+def bench(size: int, n_queries: int, k: int, rng: np.random.Generator) -> list:
+    vectors = _dataset(size, rng)
+    ids = [f"d{i}" for i in range(size)]
+    metas = [{"user_id": "bench", "confidential": bool(i % 10 == 0)} for i in range(size)]
+
+    coll = chromadb.Client().get_or_create_collection(
+        name=f"bench_{uuid.uuid4().hex[:8]}", metadata={"hnsw:space": "cosine"},
+    )
+    for i in range(0, size, 5000):
+        coll.add(ids=ids[i:i + 5000], embeddings=vectors[i:i + 5000], metadatas=metas[i:i + 5000])
+    index = ExactIndex()
+    for doc_id, vec, meta in zip(ids, vectors, metas):
+        index.add(doc_id, vec, "", meta)
+
+    queries = vectors[rng.integers(0, size, n_queries)] + 0.1 * rng.normal(size=(n_queries, DIM)).astype(np.float32)
+    rows = []
+    for name, where in FILTERS.items():
+        exact_med, exact_p95, exact_hits = _timed(
+            lambda q: [h["id"] for h in index.search([q], k, where)[0]], queries,
+        )
+        hnsw_med, hnsw_p95, hnsw_hits = _timed(
+            lambda q: coll.query(query_embeddings=[q], n_results=k, where=where)["ids"][0], queries,
+        )
+        rows.append({
+            "size": size,
+            "filter": name,
+            "exact_med_us": exact_med,
+            "exact_p95_us": exact_p95,
+            "hnsw_med_us": hnsw_med,
+            "hnsw_p95_us": hnsw_p95,
+            "hnsw_recall": np.mean([len(set(h) & set(e)) / k for h, e in zip(hnsw_hits, exact_hits)]),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,500,1000,2000,5000,10000,20000,50000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    print(
+        f"{'docs':>7} {'filter':>12} {'exact med':>10} {'exact p95':>10} "
+        f"{'hnsw med':>10} {'hnsw p95':>10} {'hnsw recall':>12}"
+    )
+    crossover = {name: None for name in FILTERS}
+    for size in (int(s) for s in args.sizes.split(",")):
+        for r in bench(size, args.queries, args.k, rng):
+            print(
+                f"{r['size']:>7} {r['filter']:>12} {r['exact_med_us']:>8.0f}us {r['exact_p95_us']:>8.0f}us "
+                f"{r['hnsw_med_us']:>8.0f}us {r['hnsw_p95_us']:>8.0f}us {r['hnsw_recall']:>12.3f}"
+            )
+            if crossover[r["filter"]] is None and r["hnsw_med_us"] < r["exact_med_us"]:
+                crossover[r["filter"]] = size
+    for name, size in crossover.items():
+        print(f"crossover ({name}): {size or 'not reached'} docs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+WS envelope benchmark — WSEnvelope.model_dump_json() vs gateway.envelope fast path.
+
+For the gateway's hot outbound message types (heartbeat_ack, transcript
+partials, pipeline stages, TTS text and TTS with base64 audio) times the
+legacy path (payload model → dict → validated WSEnvelope → JSON) against
+encode_envelope(), and reports median cost per envelope plus the CPU that
+difference is worth at --sessions concurrent sessions sending --rate
+messages per second each.
+
+Run: cd /app/backend && python scripts/bench_ws_envelope.py [--iterations 20000] [--sessions 500] [--rate 20]
+"""
+import argparse
+import base64
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gateway.envelope import encode_envelope  # noqa: E402
+from schemas.ws_messages import (  # noqa: E402
+    HeartbeatAckPayload,
+    TranscriptPayload,
+    TTSAudioPayload,
+    WSEnvelope,
+    WSMessageType,
+)
+
+
+def _cases():
+    audio = base64.b64encode(os.urandom(36 * 1024)).decode()
+    return {
+        "heartbeat_ack": (WSMessageType.HEARTBEAT_ACK, HeartbeatAckPayload(seq=12)),
+        "transcript_partial": (WSMessageType.TRANSCRIPT_PARTIAL, TranscriptPayload(
+            text="book a table for four at the italian place near the office on friday",
+            fragment_count=3, confidence=0.93, span_ids=["s1", "s2", "s3"],
+        )),
+        "pipeline_stage": (WSMessageType.PIPELINE_STAGE, {
+            "stage_id": "dimensions", "stage_index": 4, "total_stages": 10,
+            "status": "active", "sub_status": "Extracting who / when / where", "progress": 50,
+        }),
+        "tts_text": (WSMessageType.TTS_AUDIO, TTSAudioPayload(
+            text="Got it. Shall I book Trattoria Roma for four on Friday at seven?",
+            session_id="sess_0123456789", is_clarification=True, awaiting_command="approve_or_change",
+        )),
+        "tts_audio_48kb": (WSMessageType.TTS_AUDIO, {
+            "text": "Here is your summary.", "session_id": "sess_0123456789",
+            "format": "mp3", "audio": audio, "is_mock": False,
+        }),
+    }
+
+
+def _legacy(msg_type, payload):
+    if not isinstance(payload, dict):
+        payload = payload.model_dump()
+    return WSEnvelope(type=msg_type, payload=payload).model_dump_json()
+
+
+def _median_us(fn, msg_type, payload, iterations: int, repeats: int = 5) -> float:
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn(msg_type, payload)
+        runs.append((time.perf_counter() - start) / iterations * 1e6)
+    return statistics.median(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=20.0, help="outbound messages per second per session")
+    args = parser.parse_args()
+
+    print(f"{'envelope':>20} {'bytes':>7} {'legacy':>9} {'fast':>9} {'speedup':>8} {'CPU saved':>12}")
+    for name, (msg_type, payload) in _cases().items():
+        iterations = max(200, args.iterations // 20) if name == "tts_audio_48kb" else args.iterations
+        legacy = _median_us(_legacy, msg_type, payload, iterations)
+        fast = _median_us(encode_envelope, msg_type, payload, iterations)
+        saved_ms_per_s = (legacy - fast) * args.sessions * args.rate / 1000
+        print(
+            f"{name:>20} {len(encode_envelope(msg_type, payload)):>7} {legacy:>7.1f}us {fast:>7.1f}us "
+            f"{legacy / fast:>7.1f}x {saved_ms_per_s:>7.0f}ms/s"
+        )
+    print(f"CPU saved assumes {args.sessions} sessions x {args.rate:g} msg/s of that type (1000ms/s = one core)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Digital Self Compactor — collapse duplicate facts already in the vector store.
+
+For each user (or just --user):
+  - Load the user's vector partition and graph
+  - Group facts of the same type whose text matches (case / whitespace
+    insensitive), plus near-duplicates within --max-distance if given
+  - Keep the first fact of each group: merge the others' metadata into it,
+    re-point their graph edges, delete their vector docs and graph nodes
+
+ENTITY docs are never merged. --dry-run only reports what would be removed.
+
+Run: cd /app/backend && python scripts/compact_digital_self.py [--user UID] [--max-distance 0.05] [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import get_db  # noqa: E402
+from memory import retriever  # noqa: E402
+from memory.client import vector  # noqa: E402
+from memory.client.write_behind import shutdown_write_behind  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+logger = logging.getLogger("compactor")
+
+
+async def compact(user_id: str, max_distance: float, dry_run: bool) -> int:
+    users = [user_id] if user_id else [u for u in await get_db().vector_store.distinct("metadata.user_id") if u]
+    removed = 0
+    for uid in users:
+        stats = await retriever.compact_duplicates(uid, max_distance=max_distance, dry_run=dry_run)
+        if stats["groups"]:
+            logger.info("user=%s groups=%d removed=%d%s", uid, stats["groups"], stats["docs_removed"],
+                        " (dry run)" if dry_run else "")
+        removed += stats["docs_removed"]
+        vector.evict_user(uid)   # one partition in memory at a time
+    await shutdown_write_behind()   # flush vector deletes / metadata merges
+    logger.info("Done: users=%d docs_removed=%d%s", len(users), removed, " (dry run)" if dry_run else "")
+    return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user", default="", help="compact one user (default: every user)")
+    parser.add_argument("--max-distance", type=float, default=None,
+                        help="cosine distance for near-duplicates (default: FACT_DEDUP_MAX_DISTANCE)")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(compact(args.user, args.max_distance, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
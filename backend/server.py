@@ -13,6 +13,7 @@ import asyncio
 import jwt
 from dotenv import load_dotenv
 from fastapi import FastAPI, APIRouter, WebSocket, HTTPException, Header, Request
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
@@ -27,7 +28,7 @@ from core.logging_config import setup_logging
 from core.database import get_db, init_indexes, close_db
 from core.exceptions import DispatchBlockedError
 from auth.device_binding import get_session
-from gateway.ws_server import handle_ws_connection, get_active_session_count
+from gateway.ws_server import handle_ws_connection, get_active_session_count, get_session_registry_stats
 from presence.heartbeat import check_presence
 from stt.orchestrator import get_stt_provider
 from tts.orchestrator import get_tts_provider as get_tts
@@ -35,6 +36,7 @@ from prompting.orchestrator import PromptOrchestrator
 from prompting.types import PromptContext, PromptPurpose, PromptMode
 from prompting.storage.mongo import save_prompt_snapshot
 from memory import retriever as digital_self
+from memory.client.embedder import get_status as get_embedder_status
 from commit.state_machine import (
     create_commit, transition as commit_transition,
     get_commit, get_session_commits, recover_pending,
@@ -70,6 +72,9 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     logger.info("MyndLens BE starting — env=%s", settings.ENV)
     await init_indexes()
+    # Warm the ONNX embedder in the background — /api/health/ready reports 503 until done
+    from memory.client.embedder import warm_up
+    warmup_task = asyncio.create_task(warm_up())
     # Initialize base soul in vector memory
     from soul.store import initialize_base_soul
     await initialize_base_soul()
@@ -87,13 +92,24 @@ async def lifespan(app: FastAPI):
     # Start proactive intelligence scheduler (background task)
     from proactive.scheduler import scheduler_loop
     scheduler_task = asyncio.create_task(scheduler_loop())
+    # Join the cross-worker session backplane (WS_BACKPLANE)
+    from gateway.ws_server import start_backplane, stop_backplane
+    await start_backplane()
     # Start session cleanup loop (memory management)
     from gateway.ws_server import _session_cleanup_loop
     cleanup_task = asyncio.create_task(_session_cleanup_loop())
+    # Periodic vector snapshots to local disk (no-op unless VECTOR_SNAPSHOT_DIR is set)
+    from memory.client.vector import snapshot_loop
+    from soul.store import soul_snapshot_loop
+    snapshot_task = asyncio.create_task(snapshot_loop())
+    soul_snapshot_task = asyncio.create_task(soul_snapshot_loop())
     logger.info("MyndLens BE ready")
     yield
+    warmup_task.cancel()
     scheduler_task.cancel()
     cleanup_task.cancel()
+    snapshot_task.cancel()
+    soul_snapshot_task.cancel()
     try:
         await scheduler_task
     except asyncio.CancelledError:
@@ -102,6 +118,29 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    try:
+        await snapshot_task
+    except asyncio.CancelledError:
+        pass
+    try:
+        await soul_snapshot_task
+    except asyncio.CancelledError:
+        pass
+    try:
+        await warmup_task
+    except asyncio.CancelledError:
+        pass
+    await stop_backplane()
+    from memory.client.embedder import shutdown_batcher
+    from memory.client.write_behind import shutdown_write_behind
+    from memory.client.graph import flush_all as flush_graphs
+    from memory.client.vector import snapshot_to_disk
+    from soul.store import snapshot_soul
+    await shutdown_batcher()
+    await shutdown_write_behind()   # flush pending vector writes before the DB closes
+    await flush_graphs()
+    await snapshot_to_disk()
+    await snapshot_soul()
     await close_db()
     logger.info("MyndLens BE shutdown complete")
 
@@ -141,11 +180,15 @@ async def health():
     tts = get_tts()
     stt_healthy = await stt.is_healthy()
     tts_healthy = await tts.is_healthy()
+    embedder = get_embedder_status()
     return {
         "status": "healthy",
+        "ready": embedder["ready"],
+        "embedder": embedder,
         "env": settings.ENV,
         "version": "0.2.0",
         "active_sessions": get_active_session_count(),
+        "session_registry": get_session_registry_stats(),
         "stt_provider": type(stt).__name__,
         "stt_healthy": stt_healthy,
         "mock_stt": settings.MOCK_STT,
@@ -156,6 +199,15 @@ async def health():
     }
 
 
+@api_router.get("/health/ready")
+async def health_ready():
+    """Readiness probe: 503 until the embedder has warmed up."""
+    embedder = get_embedder_status()
+    if not embedder["ready"]:
+        return JSONResponse(status_code=503, content={"ready": False, "embedder": embedder})
+    return {"ready": True, "embedder": embedder}
+
+
 # =====================================================
 #  Proxy Nickname API
 # =====================================================
@@ -602,13 +654,13 @@ async def api_ds_sync(req: DSSyncRequest, request: Request):
     The text is never written to any database.
     """
     from memory.client.vector import add_document_with_embedding
-    from memory.client.embedder import embed
+    from memory.client.embedder import embed_async
 
     if not req.nodes:
         return {"synced": 0}
 
     texts = [n.text for n in req.nodes]
-    vectors = embed(texts)   # Generate embeddings from text
+    vectors = await embed_async(texts)   # Generate embeddings off the event loop
 
     synced = 0
     for node, vector in zip(req.nodes, vectors):
@@ -636,7 +688,7 @@ async def api_ds_tombstone(req: DSTombstoneRequest):
     deleted = 0
     for node_id in req.deleted_node_ids:
         try:
-            delete_document(node_id)
+            delete_document(node_id, user_id=req.user_id)
             deleted += 1
         except Exception:
             pass
@@ -2293,7 +2345,7 @@ async def ds_ingest_endpoint(request: Request):
         raise HTTPException(status_code=400, detail="user_id (or tenant_id) and contacts required")
 
     from memory.ds_ingest import ingest_extraction_results
-    stats = ingest_extraction_results(user_id, contacts, source=source)
+    stats = await ingest_extraction_results(user_id, contacts, source=source)
     return {"status": "ingested", **stats}
 
 
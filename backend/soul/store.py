@@ -5,7 +5,18 @@ Not a file. Dynamic, versioned, drift-protected.
 
 Stored in ChromaDB (semantic layer) + MongoDB (version metadata).
 Personalization per user; drift from base forbidden.
+
+Fragments are embedded by the shared ONNX embedder (memory.client.embedder),
+so the soul adds no second model. Base fragment vectors are stored with
+their soul hash in `soul_embeddings`; an unchanged base soul is never
+re-embedded, and initialize_base_soul() is a no-op once it is loaded.
+
+User fragments exist only in the in-memory collection; with
+VECTOR_SNAPSHOT_DIR set the collection is snapshotted to disk every
+VECTOR_SNAPSHOT_INTERVAL_S when it changed (soul_snapshot_loop) and at
+shutdown, and restored on first use.
 """
+import asyncio
 import hashlib
 import logging
 import uuid
@@ -14,7 +25,11 @@ from typing import Any, Dict, List, Optional
 
 import chromadb
 
+from config.settings import get_settings
 from core.database import get_db
+from memory.client import vector_codec, vector_snapshot
+from memory.client.embedder import MODEL_NAME, embed_async, embed_one_async
+from memory.client.vector import ONNXEmbeddingFunction
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +37,8 @@ logger = logging.getLogger(__name__)
 _client: Optional[chromadb.ClientAPI] = None
 _collection = None
 COLLECTION_NAME = "myndlens_soul"
+BASE_VERSION = "1.0.0"
+_snapshot_dirty = False   # collection changed since the last snapshot
 
 
 def _get_collection():
@@ -30,11 +47,70 @@ def _get_collection():
         _client = chromadb.Client()
         _collection = _client.get_or_create_collection(
             name=COLLECTION_NAME,
+            embedding_function=ONNXEmbeddingFunction(),
             metadata={"hnsw:space": "cosine"},
         )
+        _restore_snapshot(_collection)
     return _collection
 
 
+def _mark_changed() -> None:
+    global _snapshot_dirty
+    _snapshot_dirty = True
+
+
+def _restore_snapshot(coll) -> None:
+    directory = get_settings().VECTOR_SNAPSHOT_DIR
+    if not directory:
+        return
+    snap = vector_snapshot.read_partition(directory, COLLECTION_NAME)
+    if snap is None or snap[0] != MODEL_NAME or not snap[1]:
+        return
+    _, ids, documents, metadatas, matrix = snap
+    coll.upsert(ids=ids, embeddings=matrix, documents=documents, metadatas=metadatas)
+    logger.info("[Soul] Restored %d fragments from snapshot", len(ids))
+
+
+def _write_snapshot(directory: str) -> None:
+    """Read the collection and write its files (runs in a worker thread)."""
+    rows = _collection.get(include=["embeddings", "documents", "metadatas"])
+    if not rows["ids"]:
+        return
+    vector_snapshot.write_partition(
+        directory,
+        COLLECTION_NAME,
+        rows["ids"],
+        [d or "" for d in rows["documents"]],
+        rows["metadatas"],
+        rows["embeddings"],
+        MODEL_NAME,
+    )
+
+
+async def snapshot_soul() -> None:
+    """Write the soul collection to VECTOR_SNAPSHOT_DIR if it changed (no-op when unset)."""
+    global _snapshot_dirty
+    directory = get_settings().VECTOR_SNAPSHOT_DIR
+    if not directory or _collection is None or not _snapshot_dirty:
+        return
+    _snapshot_dirty = False
+    try:
+        await asyncio.to_thread(_write_snapshot, directory)
+    except Exception as e:
+        _snapshot_dirty = True
+        logger.warning("[Soul] Snapshot failed: %s", e)
+
+
+async def soul_snapshot_loop() -> None:
+    """Background task: snapshot the soul collection every VECTOR_SNAPSHOT_INTERVAL_S."""
+    settings = get_settings()
+    if not settings.VECTOR_SNAPSHOT_DIR:
+        return
+    while True:
+        await asyncio.sleep(settings.VECTOR_SNAPSHOT_INTERVAL_S)
+        await snapshot_soul()
+
+
 # ---- Optimized Base Soul (merged identity + safety) ----
 
 BASE_SOUL_FRAGMENTS = [
@@ -64,30 +140,62 @@ def compute_soul_hash(fragments: List[Dict[str, Any]]) -> str:
 
 
 async def initialize_base_soul() -> str:
-    """Load base soul fragments into vector memory. Idempotent."""
+    """Load base soul fragments into vector memory. Idempotent.
+
+    A no-op when the collection already holds this soul hash (earlier call,
+    or restored from snapshot). Otherwise vectors come from `soul_embeddings`
+    for (hash, model); fragments are embedded only when either changed.
+    """
+    base_hash = compute_soul_hash(BASE_SOUL_FRAGMENTS)
+    ids = [frag["id"] for frag in BASE_SOUL_FRAGMENTS]
     coll = _get_collection()
 
-    for frag in BASE_SOUL_FRAGMENTS:
-        coll.upsert(
-            ids=[frag["id"]],
-            documents=[frag["text"]],
-            metadatas=[{
-                "category": frag["category"],
-                "priority": frag["priority"],
-                "version": "1.0.0",
-                "is_base": True,
-                "user_id": "__base__",
-            }],
+    current = coll.get(ids=ids, include=["metadatas"])
+    if len(current["ids"]) == len(ids) and all(
+        (meta or {}).get("soul_hash") == base_hash for meta in current["metadatas"]
+    ):
+        logger.debug("[Soul] Base soul unchanged: hash=%s", base_hash[:16])
+        return base_hash
+
+    db = get_db()
+    stored = await db.soul_embeddings.find_one({"hash": base_hash, "model": MODEL_NAME}, {"_id": 0})
+    vectors = (stored or {}).get("vectors", {})
+    if all(frag_id in vectors for frag_id in ids):
+        embeddings = [vector_codec.unpack(vectors[frag_id], "f32") for frag_id in ids]
+    else:
+        embeddings = await embed_async([frag["text"] for frag in BASE_SOUL_FRAGMENTS])
+        await db.soul_embeddings.update_one(
+            {"hash": base_hash, "model": MODEL_NAME},
+            {"$set": {
+                "hash": base_hash,
+                "model": MODEL_NAME,
+                "vectors": {frag_id: vector_codec.pack(e, "f32") for frag_id, e in zip(ids, embeddings)},
+                "created_at": datetime.now(timezone.utc),
+            }},
+            upsert=True,
         )
+        logger.info("[Soul] Base soul embedded: %d fragments, model=%s", len(ids), MODEL_NAME)
 
-    base_hash = compute_soul_hash(BASE_SOUL_FRAGMENTS)
+    coll.upsert(
+        ids=ids,
+        embeddings=embeddings,
+        documents=[frag["text"] for frag in BASE_SOUL_FRAGMENTS],
+        metadatas=[{
+            "category": frag["category"],
+            "priority": frag["priority"],
+            "version": BASE_VERSION,
+            "is_base": True,
+            "user_id": "__base__",
+            "soul_hash": base_hash,
+        } for frag in BASE_SOUL_FRAGMENTS],
+    )
+    _mark_changed()
 
     # Store version metadata in MongoDB
-    db = get_db()
     await db.soul_versions.update_one(
-        {"version": "1.0.0"},
+        {"version": BASE_VERSION},
         {"$set": {
-            "version": "1.0.0",
+            "version": BASE_VERSION,
             "hash": base_hash,
             "fragment_count": len(BASE_SOUL_FRAGMENTS),
             "created_at": datetime.now(timezone.utc),
@@ -151,6 +259,7 @@ async def add_user_soul_fragment(
 
     coll.upsert(
         ids=[frag_id],
+        embeddings=[await embed_one_async(text)],
         documents=[text],
         metadatas=[{
             "category": category,
@@ -161,5 +270,6 @@ async def add_user_soul_fragment(
         }],
     )
 
+    _mark_changed()
     logger.info("[Soul] User fragment added: user=%s id=%s category=%s", user_id, frag_id, category)
     return frag_id
@@ -0,0 +1,52 @@
+"""Audio Buffer — reusable, preallocated byte buffer for STT streams.
+
+Chunks are copied once, straight from the received frame (a memoryview
+over the WS message) into a preallocated bytearray via slice assignment;
+clear() only resets the length, so the allocation is reused for the next
+batch. Capacity doubles when a batch outgrows it.
+"""
+from typing import Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+INITIAL_CAPACITY = 64 * 1024
+
+
+class AudioBuffer:
+    """Append-only byte buffer with amortised O(1) appends and no per-chunk reallocations."""
+
+    __slots__ = ("_buf", "_len")
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._buf = bytearray(capacity)
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def append(self, chunk: BytesLike) -> None:
+        n = len(chunk)
+        end = self._len + n
+        if end > len(self._buf):
+            grown = bytearray(max(end, len(self._buf) * 2))
+            grown[:self._len] = memoryview(self._buf)[:self._len]
+            self._buf = grown
+        memoryview(self._buf)[self._len:end] = chunk
+        self._len = end
+
+    def view(self) -> memoryview:
+        """Zero-copy view of the buffered bytes — valid until the next append/clear."""
+        return memoryview(self._buf)[:self._len]
+
+    def take(self) -> bytes:
+        """The buffered bytes (one copy, for the HTTP request body); the buffer is emptied."""
+        data = bytes(self.view())
+        self._len = 0
+        return data
+
+    def clear(self) -> None:
+        self._len = 0
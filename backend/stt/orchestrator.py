@@ -2,10 +2,23 @@
 
 Routes audio chunks to the configured STT provider.
 Enforces rate limits, chunk validation, and format rules.
+
+Audio arrives in one of two forms on the same socket:
+  - JSON AUDIO_CHUNK envelope, base64 audio in payload.audio (decode_audio_payload)
+  - binary WS frame: AUDIO_FRAME_HEADER followed by the raw audio bytes
+    (decode_audio_frame) — no JSON parse, no base64 (+33%), and the audio
+    is handed on as a memoryview over the frame rather than copied
+
+Binary frame header (8 bytes, network byte order):
+    magic   2s  b"ML"
+    version B   AUDIO_FRAME_VERSION
+    flags   B   reserved, 0
+    seq     I   per-session chunk sequence number
 """
 import base64
 import logging
-from typing import Optional
+import struct
+from typing import Optional, Union
 
 from config.feature_flags import is_mock_stt
 from stt.provider.interface import STTProvider
@@ -17,6 +30,10 @@ logger = logging.getLogger(__name__)
 MAX_CHUNK_SIZE_BYTES = 512 * 1024  # 512KB — supports ~2min recording at 32kbps
 MAX_CHUNKS_PER_SECOND = 10  # Rate limit
 
+AUDIO_FRAME_HEADER = struct.Struct("!2sBBI")
+AUDIO_FRAME_MAGIC = b"ML"
+AUDIO_FRAME_VERSION = 1
+
 
 def _get_provider() -> STTProvider:
     """Get the configured STT provider."""
@@ -43,7 +60,7 @@ def get_stt_provider() -> STTProvider:
     return _provider
 
 
-def validate_audio_chunk(data: bytes, seq: int) -> Optional[str]:
+def validate_audio_chunk(data: Union[bytes, memoryview], seq: int) -> Optional[str]:
     """Validate an audio chunk. Returns error message or None if valid."""
     if not data:
         return "Empty audio chunk"
@@ -81,3 +98,27 @@ def decode_audio_payload(payload: dict) -> tuple[bytes, int, Optional[str]]:
         logger.debug("[STT:DECODE] seq=%d OK bytes=%d", seq, len(audio_bytes))
 
     return audio_bytes, seq, error
+
+
+def decode_audio_frame(frame: bytes) -> tuple[memoryview, int, Optional[str]]:
+    """Decode a binary audio frame (see AUDIO_FRAME_HEADER).
+
+    Returns (audio_view, sequence_number, error_or_none). audio_view is a
+    zero-copy memoryview over `frame`.
+    """
+    if len(frame) < AUDIO_FRAME_HEADER.size:
+        logger.warning("[STT:DECODE] binary frame too short: %d bytes", len(frame))
+        return memoryview(b""), -1, "Truncated audio frame"
+
+    magic, version, _flags, seq = AUDIO_FRAME_HEADER.unpack_from(frame)
+    if magic != AUDIO_FRAME_MAGIC or version != AUDIO_FRAME_VERSION:
+        logger.warning("[STT:DECODE] seq=%d UNKNOWN frame magic=%r version=%d", seq, magic, version)
+        return memoryview(b""), seq, "Unsupported audio frame"
+
+    audio = memoryview(frame)[AUDIO_FRAME_HEADER.size:]
+    error = validate_audio_chunk(audio, seq)
+    if error:
+        logger.warning("[STT:DECODE] seq=%d VALIDATION FAIL: %s", seq, error)
+    else:
+        logger.debug("[STT:DECODE] seq=%d OK bytes=%d (binary)", seq, len(audio))
+    return audio, seq, error
@@ -18,6 +18,7 @@ import time
 import uuid
 from typing import Dict, List, Optional
 
+from stt.audio_buffer import AudioBuffer, BytesLike
 from stt.provider.interface import STTProvider, TranscriptFragment
 
 logger = logging.getLogger(__name__)
@@ -30,7 +31,7 @@ MIN_BUFFER_BYTES = 512  # Don't send tiny buffers
 class _DeepgramStreamState:
     """Per-session state for buffered Deepgram transcription."""
     def __init__(self):
-        self.audio_buffer: bytearray = bytearray()
+        self.audio_buffer = AudioBuffer()   # reused across batches — no per-chunk reallocation
         self.chunk_count: int = 0
         self.total_bytes: int = 0
         self.accumulated_text: List[str] = []
@@ -66,15 +67,15 @@ class DeepgramSTTProvider(STTProvider):
         logger.info("[DeepgramSTT] Stream started: session=%s", session_id)
 
     async def feed_audio(
-        self, session_id: str, chunk: bytes, seq: int
+        self, session_id: str, chunk: BytesLike, seq: int
     ) -> Optional[TranscriptFragment]:
         state = self._streams.get(session_id)
         if state is None:
             await self.start_stream(session_id)
             state = self._streams[session_id]
 
-        # Accumulate chunk
-        state.audio_buffer.extend(chunk)
+        # Accumulate chunk (a memoryview over the WS frame for binary audio — copied once, here)
+        state.audio_buffer.append(chunk)
         state.chunk_count += 1
         state.total_bytes += len(chunk)
 
@@ -121,8 +122,7 @@ class DeepgramSTTProvider(STTProvider):
             logger.error("[DeepgramSTT] Client not initialized")
             return None
 
-        buffer_data = bytes(state.audio_buffer)
-        state.audio_buffer.clear()
+        buffer_data = state.audio_buffer.take()
 
         start_time = time.monotonic()
 
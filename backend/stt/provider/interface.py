@@ -32,7 +32,11 @@ class STTProvider(ABC):
 
     @abstractmethod
     async def feed_audio(self, session_id: str, chunk: bytes, seq: int) -> Optional[TranscriptFragment]:
-        """Feed an audio chunk. May return a transcript fragment."""
+        """Feed an audio chunk. May return a transcript fragment.
+
+        `chunk` may be a memoryview over the received WS frame — copy it if it
+        must outlive the call.
+        """
         ...
 
     @abstractmethod
@@ -0,0 +1,150 @@
+"""Shared test helpers.
+
+Test modules import from here (`from conftest import run_async, FakeCollection`).
+"""
+import asyncio
+from typing import Optional
+
+from pymongo import DeleteOne, UpdateOne
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Cancel what a test left behind on the loop, finalize async generators, close it."""
+    pending = asyncio.all_tasks(loop)
+    for task in pending:
+        task.cancel()
+    if pending:
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+def run_async(coro):
+    """Run coro on a fresh event loop and leave that loop installed.
+
+    Older suites call asyncio.get_event_loop() directly, so the current
+    loop stays open until the next call (or the end of the session) closes it.
+    """
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        _close_loop(_loop)
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+def _field(doc, key):
+    value = doc
+    for part in key.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def matches(doc, query) -> bool:
+    """Equality, $exists and $gte on (dotted) fields — all the repo's queries use."""
+    for key, cond in query.items():
+        value = _field(doc, key)
+        if isinstance(cond, dict) and "$exists" in cond:
+            if (value is not None) != cond["$exists"]:
+                return False
+        elif isinstance(cond, dict) and "$gte" in cond:
+            if value is None or value < cond["$gte"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class FakeCursor:
+    """Async cursor over a list of documents; yields copies like a driver would."""
+
+    def __init__(self, docs):
+        self._docs = docs
+
+    def batch_size(self, n):
+        return self
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for d in self._docs:
+            yield dict(d)
+
+
+class FakeCollection:
+    """In-process stand-in for a Motor collection.
+
+    bulk_write applies UpdateOne ($set, upsert) and DeleteOne ops and records
+    each batch; the next `fail_times` bulk_write calls raise ConnectionError.
+    """
+
+    def __init__(self, docs=None, fail_times=0):
+        self.docs = docs if docs is not None else []
+        self.fail_times = fail_times
+        self.batches = []
+        self.queries = []
+        self.deleted = []
+
+    @property
+    def ops(self):
+        return [op for batch in self.batches for op in batch]
+
+    def _update(self, query, update, upsert):
+        for doc in self.docs:
+            if matches(doc, query):
+                doc.update(update["$set"])
+                return
+        if upsert:
+            self.docs.append({**query, **update["$set"]})
+
+    def _delete(self, query):
+        self.docs[:] = [d for d in self.docs if not matches(d, query)]
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return FakeCursor([d for d in self.docs if matches(d, query)])
+
+    async def find_one(self, query):
+        return next((dict(d) for d in self.docs if matches(d, query)), None)
+
+    async def count_documents(self, query):
+        return sum(1 for d in self.docs if matches(d, query))
+
+    def aggregate(self, pipeline):
+        # Only the per-key count vector._repair_partitions() runs
+        [stage] = pipeline
+        group = stage["$group"]
+        counts = {}
+        for d in self.docs:
+            key = _field(d, group["_id"].lstrip("$"))
+            counts[key] = counts.get(key, 0) + 1
+        return FakeCursor([{"_id": key, "n": n} for key, n in counts.items()])
+
+    async def bulk_write(self, ops, ordered=True):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("mongo unavailable")
+        self.batches.append(list(ops))
+        for op in ops:
+            if isinstance(op, UpdateOne):
+                self._update(op._filter, op._doc, op._upsert)
+            else:
+                assert isinstance(op, DeleteOne)
+                self._delete(op._filter)
+
+    async def update_one(self, query, update, upsert=False):
+        self._update(query, update, upsert)
+
+    async def delete_one(self, query):
+        self.deleted.append(query)
+        self._delete(query)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        _close_loop(_loop)
+    _loop = None
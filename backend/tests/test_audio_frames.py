@@ -0,0 +1,50 @@
+"""Tests for binary WS audio frames (stt.orchestrator) and the reusable STT buffer."""
+import base64
+
+
+def _frame(seq, audio, magic=b"ML", version=1):
+    from stt.orchestrator import AUDIO_FRAME_HEADER
+
+    return AUDIO_FRAME_HEADER.pack(magic, version, 0, seq) + audio
+
+
+def test_binary_frame_decodes_to_a_view_matching_the_json_path():
+    from stt.orchestrator import decode_audio_frame, decode_audio_payload
+
+    audio = bytes(range(256)) * 8
+    frame = _frame(42, audio)
+    view, seq, error = decode_audio_frame(frame)
+    json_bytes, json_seq, json_error = decode_audio_payload(
+        {"audio": base64.b64encode(audio).decode(), "seq": 42},
+    )
+
+    assert error is None and json_error is None
+    assert seq == json_seq == 42
+    assert isinstance(view, memoryview) and view.obj is frame   # no copy of the audio
+    assert view == json_bytes
+
+
+def test_bad_binary_frames_are_rejected():
+    from stt.orchestrator import MAX_CHUNK_SIZE_BYTES, decode_audio_frame
+
+    assert decode_audio_frame(b"ML\x01")[2] == "Truncated audio frame"
+    assert decode_audio_frame(_frame(1, b"abc", magic=b"XX"))[2] == "Unsupported audio frame"
+    assert decode_audio_frame(_frame(1, b"abc", version=9))[2] == "Unsupported audio frame"
+    assert decode_audio_frame(_frame(1, b""))[2] == "Empty audio chunk"
+    assert decode_audio_frame(_frame(1, b"\x00" * (MAX_CHUNK_SIZE_BYTES + 1)))[2].startswith("Chunk too large")
+
+
+def test_audio_buffer_reuses_its_allocation():
+    from stt.audio_buffer import AudioBuffer
+
+    buf = AudioBuffer(capacity=8)
+    buf.append(memoryview(b"hello"))
+    buf.append(b" world")                 # grows past the initial capacity
+    assert bytes(buf.view()) == b"hello world"
+    capacity = buf.capacity
+
+    assert buf.take() == b"hello world"
+    assert len(buf) == 0
+    buf.append(b"again")
+    assert buf.capacity == capacity       # same storage reused after take()
+    assert bytes(buf.view()) == b"again"
@@ -0,0 +1,56 @@
+"""Tests for bulk fact/entity ingestion (memory.retriever *_bulk APIs).
+
+Vector, KV and graph persistence are patched; only call shapes are asserted.
+"""
+from unittest.mock import AsyncMock, patch
+
+from conftest import run_async
+
+
+def test_store_facts_bulk_embeds_once_and_persists_graph_once():
+    from memory import retriever
+
+    facts = [
+        {"text": "Alice likes tea.", "fact_type": "PREFERENCE"},
+        {"text": "Bob lives in Sydney.", "metadata": {"source": "onboarding"}},
+        {"text": "Carol is Alice's sister.", "fact_type": "RELATIONSHIP"},
+    ]
+    add_docs = AsyncMock()
+    persist = AsyncMock()
+    with patch.object(retriever.vector, "add_documents_async", add_docs), \
+         patch.object(retriever.vector, "ensure_user_loaded", AsyncMock()), \
+         patch.object(retriever.graph, "persist_graph", persist), \
+         patch.object(retriever.graph, "add_node") as add_node:
+        node_ids = run_async(retriever.store_facts_bulk("u_bulk", facts))
+
+    assert len(node_ids) == 3 and len(set(node_ids)) == 3
+    add_docs.assert_awaited_once()
+    ids, texts, metas = add_docs.await_args.args
+    assert ids == node_ids
+    assert texts == [f["text"] for f in facts]
+    assert metas[1]["source"] == "onboarding" and metas[1]["type"] == "FACT"
+    assert add_node.call_count == 3
+    persist.assert_awaited_once_with("u_bulk")
+
+
+def test_register_entities_bulk_uses_one_kv_write():
+    from memory import retriever
+
+    entities = [
+        {"entity_type": "PERSON", "name": "Alice", "aliases": ["Ali"]},
+        {"entity_type": "PERSON", "name": "Bob"},
+    ]
+    kv_bulk = AsyncMock()
+    add_docs = AsyncMock()
+    persist = AsyncMock()
+    with patch.object(retriever.kv, "register_entities_bulk", kv_bulk), \
+         patch.object(retriever.vector, "add_documents_async", add_docs), \
+         patch.object(retriever.graph, "persist_graph", persist), \
+         patch.object(retriever.graph, "add_node"):
+        ids = run_async(retriever.register_entities_bulk("u_bulk", entities))
+
+    assert len(ids) == 2
+    kv_bulk.assert_awaited_once()
+    add_docs.assert_awaited_once()
+    persist.assert_awaited_once()
+    assert run_async(retriever.store_facts_bulk("u_bulk", [])) == []
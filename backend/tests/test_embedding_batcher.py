@@ -0,0 +1,174 @@
+"""Tests for the async micro-batching embedding service (memory.client.embedder).
+
+The ONNX model is never loaded — embed() is patched with a deterministic fake
+that records the batch sizes it receives.
+"""
+import asyncio
+from unittest.mock import patch
+
+from conftest import run_async
+
+
+def _fake_embed_factory(calls):
+    def _fake_embed(texts):
+        calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+    return _fake_embed
+
+
+def test_concurrent_requests_merge_into_one_batch():
+    """Requests that arrive within max_wait are embedded in a single ONNX call."""
+    from memory.client.embedder import EmbeddingBatcher
+
+    calls = []
+
+    async def _run():
+        batcher = EmbeddingBatcher(max_batch_size=64, max_wait_ms=50)
+        try:
+            return await asyncio.gather(
+                batcher.embed(["a"]),
+                batcher.embed(["bb", "ccc"]),
+                batcher.embed(["dddd"]),
+            )
+        finally:
+            await batcher.close()
+
+    with patch("memory.client.embedder.embed", side_effect=_fake_embed_factory(calls)):
+        results = run_async(_run())
+
+    assert len(calls) == 1
+    assert calls[0] == ["a", "bb", "ccc", "dddd"]
+    # Each caller gets back exactly its own slice, in order
+    assert results[0] == [[1.0, 1.0]]
+    assert results[1] == [[2.0, 1.0], [3.0, 1.0]]
+    assert results[2] == [[4.0, 1.0]]
+
+
+def test_batch_size_cap_splits_batches():
+    """A full batch is dispatched without waiting for the remaining requests."""
+    from memory.client.embedder import EmbeddingBatcher
+
+    calls = []
+
+    async def _run():
+        batcher = EmbeddingBatcher(max_batch_size=2, max_wait_ms=50)
+        try:
+            return await asyncio.gather(*(batcher.embed([f"t{i}"]) for i in range(5)))
+        finally:
+            await batcher.close()
+
+    with patch("memory.client.embedder.embed", side_effect=_fake_embed_factory(calls)):
+        results = run_async(_run())
+
+    assert [len(c) for c in calls] == [2, 2, 1]
+    assert len(results) == 5
+
+
+def test_failure_propagates_to_every_caller_in_batch():
+    from memory.client.embedder import EmbeddingBatcher
+
+    async def _run():
+        batcher = EmbeddingBatcher(max_batch_size=8, max_wait_ms=20)
+        try:
+            return await asyncio.gather(
+                batcher.embed(["x"]), batcher.embed(["y"]), return_exceptions=True,
+            )
+        finally:
+            await batcher.close()
+
+    with patch("memory.client.embedder.embed", side_effect=RuntimeError("onnx down")):
+        results = run_async(_run())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_close_fails_in_flight_and_queued_callers():
+    """Shutdown must not leave embed() callers awaiting forever."""
+    import threading
+    from memory.client.embedder import EmbeddingBatcher
+
+    release = threading.Event()
+
+    def _stuck_embed(texts):
+        release.wait(5)
+        return [[0.0] for _ in texts]
+
+    async def _run():
+        batcher = EmbeddingBatcher(max_batch_size=1, max_wait_ms=0)
+        in_flight = asyncio.ensure_future(batcher.embed(["running"]))
+        queued = asyncio.ensure_future(batcher.embed(["waiting"]))
+        await asyncio.sleep(0.05)
+        await batcher.close()
+        results = await asyncio.wait_for(asyncio.gather(in_flight, queued, return_exceptions=True), 1)
+        release.set()
+        return results
+
+    with patch("memory.client.embedder.embed", side_effect=_stuck_embed):
+        results = run_async(_run())
+
+    assert [str(r) for r in results] == ["embedder shut down", "embedder shut down"]
+
+
+def test_empty_input_short_circuits():
+    from memory.client.embedder import EmbeddingBatcher
+
+    async def _run():
+        batcher = EmbeddingBatcher()
+        try:
+            return await batcher.embed([])
+        finally:
+            await batcher.close()
+
+    with patch("memory.client.embedder.embed", side_effect=AssertionError("must not be called")):
+        assert run_async(_run()) == []
+
+
+def test_batcher_survives_event_loop_change():
+    """run_async() creates a fresh loop each time; the worker must rebind."""
+    from memory.client.embedder import EmbeddingBatcher
+
+    batcher = EmbeddingBatcher(max_batch_size=4, max_wait_ms=1)
+    calls = []
+    with patch("memory.client.embedder.embed", side_effect=_fake_embed_factory(calls)):
+        for _ in range(2):
+            assert run_async(batcher.embed(["hello"])) == [[5.0, 1.0]]
+    assert len(calls) == 2
+
+
+def test_warm_up_gates_readiness():
+    from types import SimpleNamespace
+    from memory.client import embedder
+
+    calls = []
+    settings = SimpleNamespace(EMBED_WARMUP=True, EMBED_BATCH_MAX_SIZE=4, EMBED_BATCH_MAX_WAIT_MS=1.0)
+
+    async def _run():
+        assert not embedder.is_ready()
+        await embedder.warm_up()
+        await embedder.shutdown_batcher()
+
+    with patch.dict(embedder._warmup, {"state": "cold", "ms": None, "error": None}), \
+         patch("config.settings.get_settings", return_value=settings), \
+         patch.object(embedder, "embed", side_effect=_fake_embed_factory(calls)):
+        run_async(_run())
+        assert embedder.is_ready()
+        assert embedder.get_status()["warmup_state"] == "ready"
+    assert [len(c) for c in calls] == [4]
+
+
+def test_failed_warm_up_stays_not_ready():
+    from types import SimpleNamespace
+    from memory.client import embedder
+
+    settings = SimpleNamespace(EMBED_WARMUP=True, EMBED_BATCH_MAX_SIZE=2, EMBED_BATCH_MAX_WAIT_MS=1.0)
+
+    async def _run():
+        await embedder.warm_up()
+        await embedder.shutdown_batcher()
+
+    with patch.dict(embedder._warmup, {"state": "cold", "ms": None, "error": None}), \
+         patch("config.settings.get_settings", return_value=settings), \
+         patch.object(embedder, "embed", side_effect=RuntimeError("model download failed")):
+        run_async(_run())
+        assert not embedder.is_ready()
+        assert embedder.get_status()["warmup_error"] == "model download failed"
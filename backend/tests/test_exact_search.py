@@ -0,0 +1,108 @@
+"""Tests for the exact (NumPy) search path — memory.client.exact + vector routing.
+
+Results are compared with a brute-force reference and with real in-memory
+Chroma; the ONNX model is never loaded (all vectors are precomputed).
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+
+def _vectors(n, dim=16, seed=3):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, dim)).astype(np.float32)
+
+
+def test_exact_topk_matches_brute_force_with_filter():
+    from memory.client.exact import ExactIndex
+
+    vecs = _vectors(200)
+    index = ExactIndex()
+    for i, v in enumerate(vecs):
+        index.add(f"d{i}", v, f"text {i}", {"confidential": i % 3 == 0})
+    q = _vectors(1, seed=9)[0]
+
+    unit = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+    sims = unit @ (q / np.linalg.norm(q))
+    allowed = [i for i in range(200) if i % 3 != 0]
+    expected = sorted(allowed, key=lambda i: -sims[i])[:5]
+
+    hits = index.search([q], 5, {"confidential": {"$ne": True}})[0]
+    assert [h["id"] for h in hits] == [f"d{i}" for i in expected]
+    assert hits[0]["distance"] == np.float32(1.0 - sims[expected[0]])
+    assert hits[0]["text"] == f"text {expected[0]}"
+
+
+def test_remove_and_overwrite_keep_rows_consistent():
+    from memory.client.exact import ExactIndex
+
+    index = ExactIndex()
+    index.add("a", [1.0, 0.0], "a", {})
+    index.add("b", [0.0, 1.0], "b", {})
+    index.add("c", [1.0, 1.0], "c", {})
+    index.remove("a")                      # "c" moves into row 0
+    index.add("b", [1.0, 0.0], "b2", {})   # overwrite in place
+
+    hits = index.search([[1.0, 0.0]], 5)[0]
+    assert [h["id"] for h in hits] == ["b", "c"]
+    assert hits[0]["text"] == "b2"
+    assert len(index) == 2
+
+
+def test_small_partition_served_exactly_and_agrees_with_chroma():
+    from memory.client import vector
+
+    uid = f"test_user_{uuid.uuid4().hex[:8]}"
+    vecs = _vectors(300, dim=32)
+    settings = SimpleNamespace(VECTOR_EXACT_SEARCH_MAX_DOCS=1000)
+
+    with patch.object(vector, "_persist_one"), \
+         patch.object(vector, "get_settings", return_value=settings), \
+         patch.object(vector, "_exact", {}), \
+         patch.object(vector, "_exact_oversized", set()), \
+         patch.dict(vector._exact_stats, {"queries": 0, "hnsw_queries": 0}):
+        for i, v in enumerate(vecs):
+            vector.add_document_with_embedding(f"d{i}", v.tolist(), {"user_id": uid})
+        q = _vectors(1, dim=32, seed=11)[0].tolist()
+        exact = vector._run_query({"query_embeddings": [q]}, 5, {"user_id": uid})
+        chroma = vector._get_collection(uid).query(query_embeddings=[q], n_results=5)
+        stats = dict(vector._exact_stats)
+        vector.evict_user(uid)
+
+    assert stats["queries"] == 1 and stats["hnsw_queries"] == 0
+    assert [h["id"] for h in exact] == chroma["ids"][0]
+    assert np.allclose([h["distance"] for h in exact], chroma["distances"][0], atol=1e-5)
+
+
+def test_partition_over_threshold_falls_back_to_hnsw():
+    from memory.client import vector
+
+    uid = f"test_user_{uuid.uuid4().hex[:8]}"
+    settings = SimpleNamespace(VECTOR_EXACT_SEARCH_MAX_DOCS=10)
+
+    with patch.object(vector, "_persist_one"), \
+         patch.object(vector, "get_settings", return_value=settings), \
+         patch.object(vector, "_exact", {}), \
+         patch.object(vector, "_exact_oversized", set()), \
+         patch.dict(vector._exact_stats, {"queries": 0, "hnsw_queries": 0}):
+        for i, v in enumerate(_vectors(11)):
+            vector.add_document_with_embedding(f"d{i}", v.tolist(), {"user_id": uid})
+        assert uid not in vector._exact
+        hits = vector._run_query({"query_embeddings": [_vectors(1)[0].tolist()]}, 3, {"user_id": uid})
+        stats = dict(vector._exact_stats)
+        vector.evict_user(uid)
+        assert uid not in vector._exact_oversized
+
+    assert len(hits) == 3
+    assert stats["hnsw_queries"] == 1
+
+
+def test_unsupported_filter_operator_uses_chroma():
+    from memory.client.lexical import where_supported
+
+    assert where_supported({"confidential": {"$ne": True}})
+    assert where_supported({"$and": [{"type": "fact"}, {"tag": {"$in": ["a"]}}]})
+    assert not where_supported({"priority": {"$gt": 2}})
+    assert not where_supported({"$contains": "x"})
@@ -0,0 +1,158 @@
+"""Tests for write-time fact deduplication and offline compaction (memory.retriever).
+
+Uses a real in-memory Chroma partition with hand-made vectors; the ONNX
+model, MongoDB, the write-behind queue and graph persistence are patched out.
+"""
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from conftest import run_async
+
+
+@contextmanager
+def _memory(user, max_distance=0.0):
+    from memory import retriever
+    from memory.client import graph, vector
+
+    settings = SimpleNamespace(FACT_DEDUP_ENABLED=True, FACT_DEDUP_MAX_DISTANCE=max_distance)
+    write_behind = MagicMock(wait_for_capacity=AsyncMock())
+    graph_db = MagicMock()
+    graph_db.graph_nodes.delete_many = AsyncMock()
+    graph_db.graph_edges.delete_many = AsyncMock()
+    with patch.object(vector, "_persist_one"), \
+         patch.object(vector, "_collections", {}), \
+         patch.object(vector, "_loaded_users", {user}), \
+         patch.object(vector, "get_write_behind", return_value=write_behind), \
+         patch.object(retriever, "get_settings", return_value=settings), \
+         patch.object(graph, "_cache", OrderedDict()), \
+         patch.object(graph, "get_db", return_value=graph_db), \
+         patch.object(graph, "persist_graph", AsyncMock()):
+        graph._entry(user).loaded = True
+        try:
+            yield retriever, vector, graph
+        finally:
+            vector.evict_user(user)
+
+
+def test_lexical_hash_ignores_case_and_whitespace():
+    from memory.client.lexical import LexicalIndex
+
+    lex = LexicalIndex()
+    lex.add("a", "User prefers  aisle seats.", {"type": "PREFERENCE"})
+    assert lex.find_by_hash("user prefers aisle seats.")["id"] == "a"
+    assert lex.find_by_hash("User prefers aisle seats.", where={"type": "FACT"}) is None
+    assert lex.find_by_hash("User prefers window seats.") is None
+    lex.remove("a")
+    assert lex.hashes == {}
+
+
+def test_store_fact_merges_exact_duplicate_into_existing_node():
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+    with _memory(user) as (retriever, vector, graph):
+        with patch.object(vector, "embed_one_async", AsyncMock(return_value=[1.0, 0.0])) as embed:
+            first = run_async(retriever.store_fact(user, "Lives in Sydney.", metadata={"source": "onboarding"}))
+            second = run_async(retriever.store_fact(user, "lives in  sydney.", metadata={"city": "Sydney"}))
+            other_type = run_async(retriever.store_fact(user, "Lives in Sydney.", fact_type="HISTORY"))
+        doc = vector.get_document(first, user)
+        count = vector.count(user)
+
+    assert second == first and other_type != first
+    assert embed.await_count == 2   # the duplicate was never embedded
+    assert count == 2
+    assert doc["metadata"]["source"] == "onboarding" and doc["metadata"]["city"] == "Sydney"
+    assert doc["metadata"]["occurrences"] == 2 and doc["metadata"]["type"] == "FACT"
+
+
+def test_bulk_near_duplicates_reuse_nodes_and_embeddings():
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+    vectors = {"Prefers aisle seats.": [1.0, 0.0], "Likes aisle seats on flights.": [0.99, 0.05],
+               "Allergic to peanuts.": [0.0, 1.0], "allergic to peanuts.": [0.0, 1.0]}
+
+    async def _embed(texts):
+        return [vectors[t] for t in texts]
+
+    with _memory(user, max_distance=0.05) as (retriever, vector, graph):
+        with patch.object(vector, "embed_async", side_effect=_embed) as embed:
+            [existing] = run_async(retriever.store_facts_bulk(user, [{"text": "Prefers aisle seats."}]))
+            ids = run_async(retriever.store_facts_bulk(user, [
+                {"text": "Likes aisle seats on flights."},
+                {"text": "Allergic to peanuts."},
+                {"text": "allergic to peanuts."},
+            ]))
+        count = vector.count(user)
+
+    assert ids[0] == existing
+    assert ids[1] == ids[2] != existing
+    assert count == 2
+    assert embed.call_count == 2   # one batch per call, reused for the adds
+
+
+def test_bulk_repeats_within_a_batch_merge_metadata_and_edges():
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+    with _memory(user) as (retriever, vector, graph):
+        with patch.object(vector, "embed_async", AsyncMock(side_effect=lambda texts: [[1.0, 0.0]] * len(texts))):
+            ids = run_async(retriever.store_facts_bulk(user, [
+                {"text": "Drives a Tesla.", "metadata": {"source": "chat"}},
+                {"text": "drives a tesla.", "metadata": {"model": "Model 3"}, "related_to": "person-1"},
+            ]))
+        doc = vector.get_document(ids[0], user)
+        node = graph.get_node(user, ids[0])
+        linked = graph.get_graph(user).has_edge("person-1", ids[0])
+
+    assert ids[0] == ids[1]
+    assert doc["metadata"]["source"] == "chat" and doc["metadata"]["model"] == "Model 3"
+    assert doc["metadata"]["occurrences"] == 2
+    assert node["model"] == "Model 3" and linked
+
+
+def test_concurrent_identical_facts_store_one_node():
+    import asyncio
+
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+
+    async def _slow_embed(text):
+        await asyncio.sleep(0.01)   # both writes pass their duplicate check before either lands
+        return [1.0, 0.0]
+
+    async def _run(retriever):
+        return await asyncio.gather(
+            retriever.store_fact(user, "Works at Acme."),
+            retriever.store_fact(user, "Works at Acme."),
+        )
+
+    with _memory(user) as (retriever, vector, graph):
+        with patch.object(vector, "embed_one_async", side_effect=_slow_embed):
+            first, second = run_async(_run(retriever))
+        count = vector.count(user)
+
+    assert first == second and count == 1
+    assert retriever._write_locks == {}
+
+
+def test_compact_duplicates_merges_docs_and_repoints_edges():
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+    with _memory(user) as (retriever, vector, graph):
+        for doc_id, text, meta in [
+            ("a", "Works at Acme.", {"source": "onboarding"}),
+            ("b", "works at acme.", {"source": "ds_ingest", "team": "growth"}),
+            ("c", "Has a dog.", {}),
+        ]:
+            vector._upsert(doc_id, text, [1.0, 0.0], {"node_id": doc_id, "user_id": user, "type": "FACT", **meta})
+            graph.add_node(user, doc_id, "FACT", {"text": text})
+        graph.add_edge(user, "c", "b", edge_type="FACT")
+
+        dry = run_async(retriever.compact_duplicates(user, dry_run=True))
+        stats = run_async(retriever.compact_duplicates(user))
+        survivor = vector.get_document("a", user)
+        remaining = vector.count(user)
+        neighbors = graph.get_neighbors(user, "c")
+        has_b = graph.get_node(user, "b") is not None
+
+    assert dry == stats == {"groups": 1, "docs_removed": 1}
+    assert remaining == 2 and not has_b
+    assert survivor["metadata"]["source"] == "onboarding" and survivor["metadata"]["team"] == "growth"
+    assert survivor["metadata"]["occurrences"] == 2
+    assert [n["node_id"] for n in neighbors] == ["a"]
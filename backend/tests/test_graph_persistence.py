@@ -0,0 +1,247 @@
+"""Tests for incremental graph persistence (memory.client.graph).
+
+MongoDB is replaced with in-process fake collections.
+"""
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from conftest import FakeCollection, run_async
+
+
+def _db():
+    db = MagicMock()
+    db.graph_nodes = FakeCollection()
+    db.graph_edges = FakeCollection()
+    db.graphs = FakeCollection()
+    return db
+
+
+def test_persist_writes_only_changed_nodes_and_edges():
+    from memory.client import graph
+
+    db = _db()
+    with patch.object(graph, "get_db", return_value=db), \
+         patch.object(graph, "_cache", OrderedDict()):
+        for i in range(50):
+            graph.add_node("u1", f"n{i}", "FACT", {"text": f"fact {i}"})
+        graph.add_edge("u1", "n0", "n1", edge_type="FACT")
+        run_async(graph.persist_graph("u1"))
+
+        graph.add_node("u1", "n50", "FACT", {"text": "new"})
+        graph.add_edge("u1", "n50", "n0", edge_type="HISTORY")
+        run_async(graph.persist_graph("u1"))
+        run_async(graph.persist_graph("u1"))   # nothing dirty: no writes
+
+    assert [len(b) for b in db.graph_nodes.batches] == [50, 1]
+    assert [len(b) for b in db.graph_edges.batches] == [1, 1]
+    assert len(db.graph_nodes.docs) == 51
+
+
+def test_load_rebuilds_graph_from_node_and_edge_documents():
+    from memory.client import graph
+
+    db = _db()
+    with patch.object(graph, "get_db", return_value=db), \
+         patch.object(graph, "_cache", OrderedDict()):
+        graph.add_node("u1", "a", "ENTITY", {"name": "Alice"}, provenance="EXPLICIT")
+        graph.add_node("u1", "b", "FACT", {"text": "Alice likes tea"})
+        graph.add_edge("u1", "a", "b", edge_type="PREFERENCE")
+        run_async(graph.persist_graph("u1"))
+
+        graph._cache.clear()
+        g = run_async(graph.load_graph("u1"))
+        assert g.number_of_nodes() == 2
+        assert graph.get_node("u1", "a")["name"] == "Alice"
+        assert [n["node_id"] for n in graph.get_neighbors("u1", "a", "PREFERENCE")] == ["b"]
+        assert graph.is_loaded("u1") and not graph._cache["u1"].dirty
+
+
+def test_legacy_blob_is_migrated_on_load():
+    import networkx as nx
+    from memory.client import graph
+
+    legacy = nx.DiGraph()
+    legacy.add_node("x", type="FACT", text="old")
+    legacy.add_node("y", type="FACT", text="older")
+    legacy.add_edge("x", "y", type="HISTORY")
+    blob = nx.node_link_data(legacy)
+
+    db = _db()
+
+    async def _find_one(query):
+        return {"user_id": "u1", "graph_data": blob}
+
+    db.graphs.find_one = _find_one
+    with patch.object(graph, "get_db", return_value=db), \
+         patch.object(graph, "_cache", OrderedDict()):
+        g = run_async(graph.load_graph("u1"))
+
+    assert g.number_of_nodes() == 2 and g.has_edge("x", "y")
+    assert len(db.graph_nodes.docs) == 2 and len(db.graph_edges.docs) == 1
+    assert db.graphs.deleted == [{"user_id": "u1"}]
+
+
+def test_writes_before_first_load_survive_legacy_migration():
+    import networkx as nx
+    from memory.client import graph
+
+    legacy = nx.DiGraph()
+    legacy.add_node("x", type="FACT", text="old")
+    db = _db()
+
+    async def _find_one(query):
+        return {"user_id": "u1", "graph_data": nx.node_link_data(legacy)}
+
+    db.graphs.find_one = _find_one
+
+    async def _run():
+        graph.add_node("u1", "new", "FACT", {"text": "written before load"})
+        graph.add_edge("u1", "x", "new", "HISTORY")
+        await graph.ensure_loaded("u1")
+
+    with patch.object(graph, "get_db", return_value=db), \
+         patch.object(graph, "get_settings", return_value=SimpleNamespace(GRAPH_CACHE_MAX_BYTES=10**9)), \
+         patch.object(graph, "_cache", OrderedDict()):
+        run_async(_run())
+        g = graph.get_graph("u1")
+        assert g.nodes["x"]["text"] == "old" and g.nodes["new"]["text"] == "written before load"
+        assert g.has_edge("x", "new") and not graph._cache["u1"].dirty
+
+    assert sorted(d["node_id"] for d in db.graph_nodes.docs) == ["new", "x"]
+    assert len(db.graph_edges.docs) == 1
+
+
+def test_restoring_a_legacy_backup_writes_node_documents():
+    """A blob-format backup for an already-migrated user must not be ignored."""
+    import networkx as nx
+    from governance import restore
+    from memory.client import graph
+
+    legacy = nx.DiGraph()
+    legacy.add_node("x", type="FACT", text="restored")
+    legacy.add_node("y", type="FACT", text="also restored")
+    legacy.add_edge("x", "y", type="HISTORY")
+    db = _db()
+    db.graph_nodes.docs.append({"user_id": "u1", "node_id": "x", "attrs": {"text": "current"}})
+    snapshot = {"user_id": "u1", "data": {"graphs": [{"user_id": "u1", "graph_data": nx.node_link_data(legacy)}]}}
+
+    async def _find_backup(query):
+        return snapshot
+
+    db.backups.find_one = _find_backup
+    with patch.object(graph, "get_db", return_value=db), \
+         patch.object(restore, "get_db", return_value=db), \
+         patch.object(graph, "get_settings", return_value=SimpleNamespace(GRAPH_CACHE_MAX_BYTES=10**9)), \
+         patch.object(graph, "_cache", OrderedDict()):
+        result = run_async(restore.restore_from_backup("backup-legacy"))
+        g = run_async(graph.load_graph("u1"))
+
+    assert result["counts"]["graph_nodes"] == 2 and result["counts"]["graph_edges"] == 1
+    assert g.nodes["x"]["text"] == "restored" and g.has_edge("x", "y")
+    assert db.graphs.deleted == []
+
+
+def test_node_summary_matches_full_lookups():
+    from memory.client import graph
+
+    with patch.object(graph, "_cache", OrderedDict()):
+        graph.add_node("u1", "a", "ENTITY", {"name": "Alice"}, provenance="EXPLICIT")
+        graph.add_node("u1", "b", "FACT", {"text": "t1"}, provenance="OBSERVED")
+        graph.add_edge("u1", "a", "b", edge_type="FACT")
+        graph.add_edge("u1", "a", "c", edge_type="HISTORY")   # "c" created implicitly
+        graph.add_edge("u1", "a", "b", edge_type="FACT")      # duplicate: degree unchanged
+
+        for node_id in ("a", "b", "c"):
+            full = graph.get_node("u1", node_id)
+            summary = graph.node_summary("u1", node_id)
+            assert summary["type"] == full.get("type")
+            assert summary["provenance"] == full.get("provenance")
+            assert summary["degree"] == len(graph.get_neighbors("u1", node_id))
+        assert graph.node_summary("u1", "missing") is None
+
+
+def test_remove_node_keeps_byte_estimate_exact_and_reuses_slots():
+    from memory.client import graph
+
+    entry = graph._UserGraph()
+    entry.add_node("a", {"type": "FACT"})
+    for _ in range(50):
+        entry.add_node("tmp", {"type": "FACT", "text": "merged away"})
+        entry.add_edge("tmp", "tmp", {"type": "HISTORY"})     # self-loop
+        entry.add_edge("a", "tmp", {"type": "FACT"})
+        entry.remove_node("tmp")
+
+    assert entry.nbytes == graph._UserGraph(entry.g.copy()).nbytes
+    assert len(entry.types) == 2                               # one live slot + one reused slot
+    assert entry.out_deg[entry.index["a"]] == 0
+
+
+def test_lru_eviction_flushes_dirty_graphs_within_budget():
+    from memory.client import graph
+
+    db = _db()
+    # Room for one 40-node graph, not two
+    settings = SimpleNamespace(GRAPH_CACHE_MAX_BYTES=90 * graph._NODE_OVERHEAD)
+
+    with patch.object(graph, "get_db", return_value=db), \
+         patch.object(graph, "get_settings", return_value=settings), \
+         patch.object(graph, "_cache", OrderedDict()), \
+         patch.dict(graph._cache_stats, {k: 0 for k in graph._cache_stats}):
+        for i in range(40):
+            graph.add_node("u1", f"u1_n{i}", "FACT", {"text": "x"})   # dirty, never persisted
+        for i in range(40):
+            graph.add_node("u2", f"u2_n{i}", "FACT", {"text": "y"})
+        run_async(graph.persist_graph("u2"))
+
+        # u1 was least recently used: flushed, then evicted
+        assert list(graph._cache) == ["u2"]
+        assert len(db.graph_nodes.docs) == 80
+
+        run_async(graph.ensure_loaded("u1"))
+        assert list(graph._cache) == ["u1"]
+        assert graph.node_count("u1") == 40
+        stats = graph.get_cache_stats()
+
+    assert stats["evictions"] == 2 and stats["eviction_flushes"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes_estimated"] <= settings.GRAPH_CACHE_MAX_BYTES
+    assert stats["users"]["u1"]["nodes"] == 40
+
+
+def test_restore_evicts_the_cached_graph():
+    """A dirty pre-restore graph must not be flushed over the restored documents."""
+    from governance import restore
+    from memory.client import graph
+
+    db = _db()
+    snapshot = {
+        "user_id": "u1",
+        "data": {
+            "graph_nodes": [{"user_id": "u1", "node_id": "n1", "attrs": {"type": "FACT", "v": "restored"}}],
+            "graph_edges": [],
+        },
+    }
+
+    async def _find_backup(query):
+        return snapshot
+
+    db.backups.find_one = _find_backup
+
+    async def _run():
+        graph.add_node("u1", "n1", "FACT", {"v": "stale"})
+        await restore.restore_from_backup("backup-1")
+        assert not graph.is_loaded("u1")
+        await graph.ensure_loaded("u1")
+        await graph.persist_graph("u1")
+        return graph.get_node("u1", "n1")
+
+    with patch.object(graph, "get_db", return_value=db), \
+         patch.object(restore, "get_db", return_value=db), \
+         patch.object(graph, "get_settings", return_value=SimpleNamespace(GRAPH_CACHE_MAX_BYTES=10**9)), \
+         patch.object(graph, "_cache", OrderedDict()):
+        node = run_async(_run())
+
+    assert node["v"] == "restored"
+    [stored] = db.graph_nodes.docs
+    assert stored["attrs"]["v"] == "restored"
@@ -0,0 +1,117 @@
+"""Tests for the in-memory entity alias index (memory.client.kv).
+
+MongoDB is replaced with a fake entity_registry that records reads.
+"""
+from unittest.mock import MagicMock, patch
+
+from conftest import FakeCollection, run_async
+
+
+def _entity(canonical_id, *refs, user_id="u1"):
+    return {"user_id": user_id, "canonical_id": canonical_id, "entity_type": "PERSON",
+            "human_refs": [r.lower() for r in refs], "data": {}, "provenance": "EXPLICIT"}
+
+
+def _patched(registry):
+    db = MagicMock()
+    db.entity_registry = registry
+    from memory.client import kv
+    return patch.object(kv, "get_db", return_value=db), patch.object(kv, "_indexes", {})
+
+
+def test_exact_fuzzy_and_prefix_resolution_from_one_build():
+    from memory.client import kv
+
+    registry = FakeCollection([
+        _entity("c_jacob", "Jacob", "Jacob Miller"),
+        _entity("c_sarah", "Sarah", "Sarah Johnson"),
+        _entity("c_sam", "Sam"),
+    ])
+
+    async def _run():
+        return (
+            await kv.resolve_entity("u1", "JACOB"),
+            await kv.resolve_entity("u1", "Jakob"),          # substitution
+            await kv.resolve_entity("u1", "Sara"),           # deletion
+            await kv.resolve_entity("u1", "Jacob's"),        # punctuation + insertion
+            await kv.resolve_entity("u1", "Sal"),            # too short for fuzzy
+            await kv.resolve_prefix("u1", "sa"),
+            await kv.resolve_many("u1", ["sarah johnson", "nobody"]),
+        )
+
+    db_patch, idx_patch = _patched(registry)
+    with db_patch, idx_patch:
+        exact, sub, dele, punct, short, prefix, many = run_async(_run())
+
+    assert exact["canonical_id"] == "c_jacob"
+    assert sub["canonical_id"] == "c_jacob"
+    assert dele["canonical_id"] == "c_sarah"
+    assert punct["canonical_id"] == "c_jacob"
+    assert short is None
+    assert [d["canonical_id"] for d in prefix] == ["c_sam", "c_sarah"]
+    assert many["sarah johnson"]["canonical_id"] == "c_sarah" and many["nobody"] is None
+    assert len(registry.queries) == 1                               # built once, served from memory
+
+
+def test_ambiguous_fuzzy_match_is_not_resolved():
+    from memory.client import kv
+
+    registry = FakeCollection([_entity("c_mark", "Mark"), _entity("c_mary", "Mary")])
+    db_patch, idx_patch = _patched(registry)
+    with db_patch, idx_patch:
+        single = run_async(kv.resolve_entity("u1", "Marx"))
+        candidates = run_async(kv.resolve_entities("u1", "Marx"))
+
+    assert single is None
+    assert {d["canonical_id"] for d in candidates} == {"c_mark", "c_mary"}
+
+
+def test_register_updates_built_index_and_evict_forces_rebuild():
+    from memory.client import kv
+
+    registry = FakeCollection([_entity("c_jacob", "Jacob")])
+
+    async def _run():
+        await kv.resolve_entity("u1", "jacob")
+        await kv.register_entity("u1", "c_jacob", "PERSON", ["Jacob", "Jake"])
+        renamed = await kv.resolve_entity("u1", "jake")
+        finds_before_evict = len(registry.queries)
+        kv.evict_user("u1")
+        await kv.resolve_entity("u1", "jacob")
+        return renamed, finds_before_evict
+
+    db_patch, idx_patch = _patched(registry)
+    with db_patch, idx_patch:
+        renamed, finds_before_evict = run_async(_run())
+
+    assert renamed["canonical_id"] == "c_jacob"
+    assert finds_before_evict == 1
+    assert len(registry.queries) == 2
+
+
+def test_restore_evicts_the_alias_index():
+    """Entities written by restore (not register_entity) must be visible on the next resolve."""
+    from governance import restore
+    from memory.client import kv
+
+    registry = FakeCollection([_entity("c_jacob", "Jacob")])
+    snapshot = {"user_id": "u1", "data": {"entities": [_entity("c_sarah", "Sarah")]}}
+    db = MagicMock()
+    db.entity_registry = registry
+
+    async def _find_backup(query):
+        return snapshot
+
+    db.backups.find_one = _find_backup
+
+    async def _run():
+        before = await kv.resolve_entity("u1", "sarah")
+        await restore.restore_from_backup("backup-1")
+        return before, await kv.resolve_entity("u1", "sarah")
+
+    db_patch, idx_patch = _patched(registry)
+    with db_patch, idx_patch, patch.object(restore, "get_db", return_value=db):
+        before, after = run_async(_run())
+
+    assert before is None
+    assert after["canonical_id"] == "c_sarah"
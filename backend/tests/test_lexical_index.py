@@ -0,0 +1,78 @@
+"""Tests for the lexical fast path (memory.client.lexical + retriever name lookups).
+
+Uses a real in-memory Chroma partition with hand-made vectors; the ONNX
+model, MongoDB and the write-behind queue are patched out.
+"""
+import uuid
+from collections import OrderedDict
+from unittest.mock import patch
+
+from conftest import run_async
+
+
+def _index():
+    from memory.client.lexical import LexicalIndex
+
+    lex = LexicalIndex()
+    lex.add("j_id", "Jacob is CMO at Acme.", {"contact_name": "Jacob Miller", "contact_id": "+4477001"})
+    lex.add("j_thr", "Planning Sydney trip, flights undecided.", {"contact_name": "Jacob Miller", "confidential": True})
+    lex.add("s_id", "Sarah is your manager.", {"contact_name": "Sarah Johnson"})
+    lex.add("fact", "User prefers aisle seats on flights.", {"type": "PREFERENCE"})
+    return lex
+
+
+def test_index_name_lookup_search_and_removal():
+    lex = _index()
+
+    assert lex.match_name("Jacob Miller") == "jacob miller"
+    assert lex.match_name("contact jacob miler") == "jacob miller"     # near-exact
+    assert lex.match_name("book flights") is None
+    assert {r["id"] for r in lex.find_by_name("jacob")} == {"j_id", "j_thr"}
+    assert [r["id"] for r in lex.find_by_name("jacob", where={"confidential": {"$ne": True}})] == ["j_id"]
+    assert [r["id"] for r in lex.find_by_name(contact_id="+4477")] == ["j_id"]
+    assert lex.search("flights sydney", 5)[0]["id"] == "j_thr"
+
+    lex.remove("j_thr")
+    assert "sydney" not in lex.postings
+    assert [r["id"] for r in lex.find_by_name("jacob")] == ["j_id"]
+
+
+def test_fuse_prefers_docs_ranked_by_both():
+    from memory.client.lexical import fuse
+
+    semantic = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    lexical = [{"id": "c"}, {"id": "b"}]
+    assert [r["id"] for r in fuse(semantic, lexical, 3)] == ["c", "b", "a"]
+
+
+def test_name_queries_skip_embedding_and_get_contact_uses_index():
+    from mcp import ds_server
+    from memory import retriever
+    from memory.client import graph, vector
+
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+
+    async def _run():
+        by_name = await retriever.recall(user, "Jacob Miller", n_results=5)
+        contact = await ds_server.get_contact(user, name="jacob")
+        return by_name, contact
+
+    with patch.object(vector, "_persist_one"), \
+         patch.object(vector, "_collections", {}), \
+         patch.object(vector, "_loaded_users", {user}), \
+         patch.object(vector, "embed_one_async", side_effect=AssertionError("no embedding for name lookups")), \
+         patch.object(graph, "_cache", OrderedDict()):
+        vector.add_document_with_embedding("j_id", [1.0, 0.0], {"user_id": user, "contact_name": "Jacob Miller"})
+        vector.add_document_with_embedding("j_thr", [0.0, 1.0], {"user_id": user, "contact_name": "Jacob Miller",
+                                                                  "confidential": True})
+        vector.add_document_with_embedding("s_id", [1.0, 1.0], {"user_id": user, "contact_name": "Sarah Johnson"})
+        graph._entry(user).loaded = True
+        try:
+            by_name, contact = run_async(_run())
+        finally:
+            vector.evict_user(user)
+
+    assert {r["node_id"] for r in by_name} == {"j_id", "j_thr"}
+    assert contact["found"] is True
+    # get_contact excludes confidential docs by default
+    assert [d["metadata"]["contact_name"] for d in contact["profile"]["documents"]] == ["Jacob Miller"]
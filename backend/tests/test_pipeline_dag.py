@@ -0,0 +1,151 @@
+"""Tests for the stage DAG executor (gateway.pipeline_dag) and the mandate pipeline built on it."""
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from conftest import run_async
+
+
+def _sleeper(delay, value=None):
+    async def run(**inputs):
+        await asyncio.sleep(delay)
+        return value if value is not None else inputs
+    return run
+
+
+def test_independent_stages_overlap_and_inputs_flow_by_name():
+    from gateway.pipeline_dag import Stage, run_stages
+
+    events = []
+
+    async def on_event(name, status, elapsed_ms):
+        events.append((name, status))
+
+    async def _run():
+        start = time.monotonic()
+        results = await run_stages([
+            Stage("a", _sleeper(0.05, "A")),
+            Stage("b", _sleeper(0.05, "B")),
+            Stage("c", _sleeper(0.05), needs=("a", "b")),
+        ], on_event=on_event)
+        return results, time.monotonic() - start
+
+    results, elapsed = run_async(_run())
+    assert results["c"] == {"a": "A", "b": "B"}
+    assert elapsed < 0.14                  # critical path (~0.10s), not the sum (0.15s)
+    assert events.index(("c", "started")) > max(events.index(("a", "done")), events.index(("b", "done")))
+
+
+def test_halt_cancels_in_flight_stages_and_dependents_never_start():
+    from gateway.pipeline_dag import PipelineHalt, Stage, run_stages
+
+    cancelled, started = [], []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def answer():
+        await asyncio.sleep(0.01)
+        raise PipelineHalt("answer", "answered the user")
+
+    async def after(**inputs):
+        started.append("after")
+
+    async def _run():
+        with pytest.raises(PipelineHalt) as halt:
+            await run_stages([Stage("slow", slow), Stage("answer", answer), Stage("after", after, needs=("answer",))])
+        return halt.value
+
+    halt = run_async(_run())
+    assert halt.stage == "answer"
+    assert cancelled == ["slow"] and started == []
+
+
+def test_timeouts_use_the_fallback_or_abort_and_bad_graphs_are_rejected():
+    from gateway.pipeline_dag import Stage, run_stages
+
+    async def boom():
+        raise RuntimeError("boom")
+
+    async def _run():
+        results = await run_stages([
+            Stage("recall", _sleeper(5), timeout_s=0.02, fallback=[]),
+            Stage("fill", _sleeper(0), needs=("recall",)),
+        ])
+        with pytest.raises(RuntimeError):
+            await run_stages([Stage("required", boom), Stage("other", _sleeper(5))])
+        with pytest.raises(ValueError, match="cycle"):
+            await run_stages([Stage("x", _sleeper(0), needs=("y",)), Stage("y", _sleeper(0), needs=("x",))])
+        with pytest.raises(ValueError, match="unknown"):
+            await run_stages([Stage("x", _sleeper(0), needs=("missing",))])
+        return results
+
+    assert run_async(_run())["fill"] == {"recall": []}
+
+
+def test_mandate_pipeline_runs_harm_check_alongside_l1_and_keeps_stage_order():
+    from gateway import ws_server
+    from gateway.conversation_state import cleanup_conversation
+
+    class _WS:
+        def __init__(self):
+            self.sent = []
+
+        async def send_text(self, text):
+            self.sent.append(json.loads(text))
+
+    timeline = []
+
+    def _timed(name, delay, value):
+        async def run(*args, **kwargs):
+            timeline.append((name, "start", time.monotonic()))
+            await asyncio.sleep(delay)
+            timeline.append((name, "end", time.monotonic()))
+            return value
+        return run
+
+    hypothesis = SimpleNamespace(intent="Travel Concierge", hypothesis="Book a table", confidence=0.95,
+                                 sub_intents=[], dimension_suggestions={})
+    l1_draft = SimpleNamespace(draft_id="d1", hypotheses=[hypothesis], is_mock=False, latency_ms=0)
+    harm = SimpleNamespace(block_execution=False, nudge="", result="PASS", reason="")
+    ws, session_id = _WS(), "sess-dag"
+
+    async def _run():
+        with patch("memory.retriever.recall", AsyncMock(return_value=[])), \
+             patch("guardrails.self_awareness.route_self_awareness", AsyncMock(return_value=None)), \
+             patch.object(ws_server, "run_l1_scout", _timed("l1", 0.1, l1_draft)), \
+             patch("intent.micro_questions.should_ask_micro_questions", return_value=False), \
+             patch("dimensions.extractor.extract_mandate_dimensions",
+                   _timed("dimensions", 0.05, {"mandate_summary": "Book a table", "actions": []})), \
+             patch("intent.mandate_questions.get_all_missing", return_value=[]), \
+             patch("guardrails.engine._assess_harm_llm", _timed("harm", 0.1, harm)), \
+             patch.object(ws_server, "save_mandate", AsyncMock()), \
+             patch("mandate.store.abort_all_pending_for_user", AsyncMock()), \
+             patch.object(ws_server, "_send_tts", AsyncMock(return_value=0)) as send_tts:
+            try:
+                start = time.monotonic()
+                await ws_server._send_mock_tts_response(ws, session_id, "book a table", user_id="u1")
+                return time.monotonic() - start, send_tts
+            finally:
+                ws_server._sessions.drop(session_id)
+                cleanup_conversation(session_id)
+
+    elapsed, send_tts = run_async(_run())
+    at = {(name, edge): t for name, edge, t in timeline}
+    assert at[("harm", "start")] < at[("l1", "end")]          # safety check overlaps L1
+    assert elapsed < 0.24                                       # l1 + dimensions, not + harm (0.25s)
+    stages = [(m["payload"]["stage_id"], m["payload"]["status"]) for m in ws.sent if m["type"] == "pipeline_stage"]
+    assert stages == [
+        ("capture", "done"), ("digital_self", "active"), ("digital_self", "done"),
+        ("dimensions", "active"), ("dimensions", "done"), ("mandate", "active"), ("mandate", "done"),
+    ]
+    assert [m["type"] for m in ws.sent][-1] == "draft_update"
+    assert send_tts.await_args.args[2].endswith("Book a table. Shall I proceed?")
@@ -0,0 +1,64 @@
+"""Tests for batched recall (memory.retriever.recall_many).
+
+Uses a real in-memory Chroma partition with hand-made vectors; the ONNX
+model, MongoDB and the write-behind queue are patched out.
+"""
+import uuid
+from collections import OrderedDict
+from unittest.mock import AsyncMock, patch
+
+from conftest import run_async
+
+
+_VECTORS = {
+    "tea": [1.0, 0.0, 0.0],
+    "sydney": [0.0, 1.0, 0.0],
+}
+
+
+def test_recall_many_batches_embedding_and_graph_work():
+    from memory import retriever
+    from memory.client import graph, vector
+
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+    embed_calls = []
+
+    async def _fake_embed_async(texts):
+        embed_calls.append(list(texts))
+        return [_VECTORS[t] for t in texts]
+
+    with patch.object(vector, "_persist_one"), \
+         patch.object(vector, "_collections", {}), \
+         patch.object(vector, "_loaded_users", {user}), \
+         patch.object(vector, "embed_async", side_effect=_fake_embed_async), \
+         patch.object(graph, "_cache", OrderedDict()), \
+         patch.object(graph, "load_graph", new=AsyncMock()) as load_graph:
+        vector.add_document_with_embedding("n_tea", [1.0, 0.0, 0.0], {"user_id": user, "node_id": "n_tea"})
+        vector.add_document_with_embedding("n_syd", [0.0, 1.0, 0.0], {"user_id": user, "node_id": "n_syd"})
+        graph.add_node(user, "n_tea", "PREFERENCE", {"text": "likes tea"})
+        graph.add_node(user, "n_syd", "FACT", {"text": "lives in Sydney"})
+        graph.add_edge(user, "n_tea", "n_syd", edge_type="FACT")
+        graph._cache[user].loaded = True
+
+        rows = run_async(retriever.recall_many(user, ["tea", "sydney"], n_results=1))
+        vector.evict_user(user)
+
+    assert embed_calls == [["tea", "sydney"]]        # one embedding batch
+    load_graph.assert_not_awaited()                   # graph already cached
+    assert [[r["node_id"] for r in row] for row in rows] == [["n_tea"], ["n_syd"]]
+    assert rows[0][0]["graph_type"] == "PREFERENCE" and rows[0][0]["neighbors"] == 1
+    assert rows[1][0]["provenance"] == "EXPLICIT" and rows[1][0]["neighbors"] == 0
+
+
+def test_recall_many_empty_and_unknown_user():
+    from memory import retriever
+    from memory.client import graph, vector
+
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+    with patch.object(vector, "_collections", {}), \
+         patch.object(vector, "_loaded_users", {user}), \
+         patch.object(graph, "load_graph", new=AsyncMock()) as load_graph:
+        assert run_async(retriever.recall_many(user, [])) == []
+        assert run_async(retriever.recall_many(user, ["a", "b"])) == [[], []]
+        vector.evict_user(user)
+    load_graph.assert_not_awaited()                   # no hits: graph never loaded
@@ -0,0 +1,124 @@
+"""Tests for mandate-scoped recall memoization (memory.recall_memo).
+
+Uses a real in-memory Chroma partition with hand-made vectors; the ONNX
+model, MongoDB and the write-behind queue are patched out.
+"""
+import uuid
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from conftest import run_async
+
+
+def _run_with_partition(scenario):
+    """Run scenario(user, embed_calls) against a 6-doc user partition."""
+    from memory import recall_memo
+    from memory.client import graph, vector
+
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+    embed_calls = []
+
+    async def _fake_embed_one_async(text):
+        embed_calls.append(text)
+        return [1.0, 0.0, 0.0]
+
+    with patch.object(vector, "_persist_one"), \
+         patch.object(vector, "_collections", {}), \
+         patch.object(vector, "_loaded_users", {user}), \
+         patch.object(vector, "embed_one_async", side_effect=_fake_embed_one_async), \
+         patch.object(graph, "_cache", OrderedDict()), \
+         patch.object(recall_memo, "_entries", OrderedDict()), \
+         patch.object(recall_memo, "_user_keys", {}):
+        for i in range(6):
+            vector.add_document_with_embedding(f"d{i}", [1.0, 0.1 * i, 0.0], {"user_id": user})
+        graph._entry(user).loaded = True
+        try:
+            return run_async(scenario(user)), embed_calls
+        finally:
+            vector.evict_user(user)
+
+
+def test_smaller_recall_in_same_cycle_is_served_from_memo():
+    from memory import recall_memo
+    from memory.retriever import recall
+
+    async def _scenario(user):
+        recall_memo.bind_cycle("cycle_a")
+        five = await recall(user, "Book  a table with Jacob", n_results=5)
+        three = await recall(user, "book a table with jacob", n_results=3)
+        return five, three
+
+    (five, three), embed_calls = _run_with_partition(_scenario)
+    assert len(embed_calls) == 1
+    assert [r["node_id"] for r in three] == [r["node_id"] for r in five[:3]]
+
+
+def test_no_memo_outside_a_cycle_or_across_cycles():
+    from memory import recall_memo
+    from memory.retriever import recall
+
+    async def _scenario(user):
+        await recall(user, "jacob", n_results=3)
+        await recall(user, "jacob", n_results=3)      # no cycle bound: both hit the store
+        recall_memo.bind_cycle("cycle_a")
+        await recall(user, "jacob", n_results=3)
+        recall_memo.bind_cycle("cycle_b")
+        await recall(user, "jacob", n_results=3)      # different mandate: fresh search
+
+    _, embed_calls = _run_with_partition(_scenario)
+    assert len(embed_calls) == 4
+
+
+def test_write_for_user_invalidates_memo():
+    from memory import recall_memo
+    from memory.client import vector
+    from memory.retriever import recall
+
+    async def _scenario(user):
+        recall_memo.bind_cycle("cycle_a")
+        await recall(user, "jacob", n_results=5)
+        vector.add_document_with_embedding("d_new", [1.0, 0.0, 0.0], {"user_id": user})
+        after = await recall(user, "jacob", n_results=5)
+        return after
+
+    after, embed_calls = _run_with_partition(_scenario)
+    assert len(embed_calls) == 2
+    assert "d_new" in [r["node_id"] for r in after]
+
+
+def test_larger_request_than_memoized_is_a_miss():
+    from memory import recall_memo
+    from memory.retriever import recall
+
+    async def _scenario(user):
+        recall_memo.bind_cycle("cycle_a")
+        await recall(user, "jacob", n_results=5)
+        return await recall(user, "jacob", n_results=6)
+
+    rows, embed_calls = _run_with_partition(_scenario)
+    assert len(embed_calls) == 2 and len(rows) == 6
+
+
+def test_write_stamps_stay_bounded_and_evicted_users_still_reject_stale_puts():
+    from memory import recall_memo
+
+    settings = SimpleNamespace(RECALL_MEMO_MAX_ENTRIES=3, RECALL_MEMO_TTL_S=60.0)
+    with patch.object(recall_memo, "get_settings", return_value=settings), \
+         patch.object(recall_memo, "_entries", OrderedDict()), \
+         patch.object(recall_memo, "_user_keys", {}), \
+         patch.object(recall_memo, "_last_write", OrderedDict()), \
+         patch.object(recall_memo, "_evicted_write", 0):
+        recall_memo.bind_cycle("cycle_a")
+        gen = recall_memo.generation("u0")            # search for u0 starts
+        for i in range(10):                            # u0 written, then pushed out by others
+            recall_memo.invalidate_user(f"u{i}")
+        assert len(recall_memo._last_write) == 3 and "u0" not in recall_memo._last_write
+
+        recall_memo.put("u0", "jacob", "all", 5, [{"id": "stale"}], gen)
+        assert recall_memo.get("u0", "jacob", "all", 5) is None
+
+        fresh = recall_memo.generation("u0")
+        recall_memo.put("u0", "jacob", "all", 5, [{"id": "fresh"}], fresh)
+        assert recall_memo.get("u0", "jacob", "all", 5) == [{"id": "fresh"}]
+        recall_memo.bind_cycle("")
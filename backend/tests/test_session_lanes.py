@@ -0,0 +1,104 @@
+"""Tests for per-session WS task lanes (gateway.session_lanes)."""
+import asyncio
+
+from conftest import run_async
+
+
+def test_pipeline_runs_in_order_and_survives_handler_errors():
+    from gateway.session_lanes import SessionLanes
+
+    async def _run():
+        lanes = SessionLanes("s1")
+        seen = []
+
+        def step(i, delay=0.0, fail=False):
+            async def handler():
+                await asyncio.sleep(delay)
+                if fail:
+                    raise RuntimeError("boom")
+                seen.append(i)
+            return handler
+
+        drained = asyncio.Event()
+
+        async def last():
+            drained.set()
+
+        lanes.submit("a", step(1, delay=0.02))
+        lanes.submit("b", step(2, fail=True))
+        lanes.submit("c", step(3))
+        lanes.submit("d", last)
+        await asyncio.wait_for(drained.wait(), timeout=1.0)
+        await lanes.close()
+        return seen
+
+    assert run_async(_run()) == [1, 3]
+
+
+def test_control_work_is_not_blocked_and_kill_cancels_pipeline():
+    from gateway.session_lanes import SessionLanes
+
+    async def _run():
+        lanes = SessionLanes("s2")
+        reply = asyncio.Event()
+        events = []
+
+        async def pipeline():
+            # Waits for a reply that only the receive loop can deliver (ds_context)
+            await asyncio.wait_for(reply.wait(), timeout=1.0)
+            events.append("got_reply")
+            await asyncio.sleep(10)
+            events.append("finished")
+
+        async def queued():
+            events.append("queued_ran")
+
+        lanes.submit("text_input", pipeline)
+        lanes.submit("text_input", queued)
+        await asyncio.sleep(0.01)
+        reply.set()                      # handled inline while the pipeline runs
+        await asyncio.sleep(0.01)
+        affected = lanes.cancel_pipeline()
+        await asyncio.sleep(0.01)
+
+        after = []
+
+        async def next_turn():
+            after.append("next")
+
+        lanes.submit("text_input", next_turn)
+        await asyncio.sleep(0.01)
+        await lanes.close()
+        return events, affected, after
+
+    events, affected, after = run_async(_run())
+    assert events == ["got_reply"]
+    assert affected == 2
+    assert after == ["next"]             # lane keeps serving after a kill
+
+
+def test_limits_reject_work_and_close_cancels_background():
+    from gateway.session_lanes import SessionLanes
+
+    async def _run():
+        lanes = SessionLanes("s3", max_pending=2, max_background=1)
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        accepted = [lanes.submit("audio_chunk", slow) for _ in range(3)]
+        spawned = [lanes.spawn("wa_pair_request", slow), lanes.spawn("wa_pair_request", slow)]
+        await asyncio.sleep(0.01)
+        await lanes.close()
+        return accepted, spawned, cancelled, lanes.submit("late", slow)
+
+    accepted, spawned, cancelled, late = run_async(_run())
+    assert accepted == [True, True, False]
+    assert spawned == [True, False]
+    assert len(cancelled) == 2           # running pipeline handler + background task
+    assert late is False
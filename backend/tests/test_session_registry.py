@@ -0,0 +1,57 @@
+"""Tests for the consolidated per-session registry (gateway.session_registry)."""
+
+
+def test_views_behave_like_the_old_maps_and_share_one_record():
+    from gateway.session_registry import SessionRegistry
+
+    reg = SessionRegistry()
+    auth, clarify = reg.view("auth"), reg.view("clarification")
+
+    auth["s1"] = {"user_id": "u1"}
+    clarify["s1"] = {"pending": True}
+    clarify["s2"] = {"pending": False}
+
+    assert len(reg) == 2 and reg.get("s1").auth is auth["s1"]
+    assert "s1" in auth and "s2" not in auth
+    assert auth.get("s2", {}) == {} and auth.get("missing") is None
+    assert sorted(clarify) == ["s1", "s2"] and len(auth) == 1
+    assert clarify.pop("s2") == {"pending": False}
+    assert clarify.pop("s2", None) is None and "s2" not in clarify
+    assert len(reg) == 2  # emptying a field keeps the record; only drop() frees it
+
+
+def test_drop_frees_every_field_and_its_execution_routes():
+    from gateway.session_registry import ExecutionIndex, SessionRegistry
+
+    reg = SessionRegistry()
+    executions = ExecutionIndex(reg)
+    reg.view("websocket")["s1"] = object()
+    reg.view("context")["s1"] = {"user_name": "Ada"}
+    reg.view("websocket")["s2"] = object()
+    executions["exec-1"] = "s1"
+    executions["exec-2"] = "s2"
+
+    record = reg.drop("s1")
+    executions.forget_session(record)
+
+    assert "s1" not in reg and reg.view("context").get("s1") is None
+    assert executions.get("exec-1") is None and executions["exec-2"] == "s2"
+    assert reg.drop("s1") is None
+
+
+def test_sweep_only_frees_idle_socketless_records_and_stats_report_them():
+    from gateway.session_registry import SessionRegistry
+
+    reg = SessionRegistry()
+    reg.view("websocket")["live"] = object()
+    reg.view("clarification")["orphan"] = {"pending": True, "question_asked": "x" * 200}
+
+    stats = reg.stats()
+    assert stats["sessions"] == 2 and stats["connected"] == 1
+    assert stats["fields"]["clarification"] == 1 and stats["fields"]["auth"] == 0
+    assert stats["approx_bytes"] > 200
+
+    now = reg.get("orphan").last_active
+    assert reg.sweep(idle_ttl_s=60, now=now + 30) == 0
+    assert reg.sweep(idle_ttl_s=60, now=now + 61) == 1
+    assert "orphan" not in reg and "live" in reg
@@ -0,0 +1,116 @@
+"""Tests for the Soul store's shared embedder and precomputed base-soul vectors.
+
+Chroma is real (in-memory, one throwaway collection per test); MongoDB is an
+in-process fake and the ONNX embedder is replaced by a counting stub.
+"""
+import uuid
+from unittest.mock import MagicMock, patch
+
+from conftest import run_async
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.docs = {}
+        self.writes = 0
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(tuple(sorted(query.items())))
+
+    async def update_one(self, query, update, upsert=False):
+        self.writes += 1
+        self.docs[tuple(sorted(query.items()))] = dict(update["$set"])
+
+
+def _fake_db():
+    db = MagicMock()
+    db.soul_embeddings = _FakeCollection()
+    db.soul_versions = _FakeCollection()
+    return db
+
+
+def _init(store, db, embed_calls, dim=4):
+    async def _fake_embed_async(texts):
+        embed_calls.append(list(texts))
+        return [[float(i + 1)] * dim for i in range(len(texts))]
+
+    with patch.object(store, "get_db", return_value=db), \
+         patch.object(store, "embed_async", side_effect=_fake_embed_async), \
+         patch.object(store, "_collection", None), \
+         patch.object(store, "_client", None), \
+         patch.object(store, "COLLECTION_NAME", f"soul_test_{uuid.uuid4().hex[:8]}"):
+        first = run_async(store.initialize_base_soul())
+        second = run_async(store.initialize_base_soul())
+        rows = store._get_collection().get(include=["embeddings", "metadatas"])
+    return first, second, rows
+
+
+def test_base_soul_embedded_once_then_noop():
+    from soul import store
+
+    db, calls = _fake_db(), []
+    first, second, rows = _init(store, db, calls)
+
+    assert first == second == store.compute_soul_hash(store.BASE_SOUL_FRAGMENTS)
+    assert len(calls) == 1                     # second call did not re-embed
+    assert db.soul_embeddings.writes == 1
+    assert db.soul_versions.writes == 1        # ...and did not touch MongoDB
+    assert rows["ids"] == [f["id"] for f in store.BASE_SOUL_FRAGMENTS]
+    assert rows["metadatas"][0]["soul_hash"] == first
+
+
+def test_unchanged_soul_reuses_stored_vectors_after_restart():
+    from soul import store
+
+    db, calls = _fake_db(), []
+    _init(store, db, calls)
+    # New process: empty collection, same MongoDB
+    _, _, rows = _init(store, db, calls)
+
+    assert len(calls) == 1
+    assert [list(e) for e in rows["embeddings"]] == [[1.0] * 4]
+
+
+def test_changed_soul_is_re_embedded():
+    from soul import store
+
+    db, calls = _fake_db(), []
+    _init(store, db, calls)
+    edited = [dict(store.BASE_SOUL_FRAGMENTS[0], text="You are MyndLens, edited.")]
+    with patch.object(store, "BASE_SOUL_FRAGMENTS", edited):
+        _, _, rows = _init(store, db, calls)
+
+    assert len(calls) == 2
+    assert rows["metadatas"][0]["soul_hash"] == store.compute_soul_hash(edited)
+
+
+def test_user_fragments_are_snapshotted_by_the_periodic_snapshot_only(tmp_path):
+    from types import SimpleNamespace
+    from soul import store
+
+    settings = SimpleNamespace(VECTOR_SNAPSHOT_DIR=str(tmp_path))
+    name = f"soul_test_{uuid.uuid4().hex[:8]}"
+
+    async def _fake_embed_one_async(text):
+        return [0.5] * 4
+
+    async def _run():
+        await store.add_user_soul_fragment("user-1234", "Prefers short answers", "style")
+        written_on_add = list(tmp_path.iterdir())
+        await store.snapshot_soul()
+        first = sorted(p.name for p in tmp_path.iterdir())
+        (tmp_path / f"{name}.json").unlink()
+        await store.snapshot_soul()            # unchanged since the last snapshot
+        return written_on_add, first
+
+    with patch.object(store, "get_settings", return_value=settings), \
+         patch.object(store, "embed_one_async", side_effect=_fake_embed_one_async), \
+         patch.object(store, "_collection", None), \
+         patch.object(store, "_client", None), \
+         patch.object(store, "_snapshot_dirty", False), \
+         patch.object(store, "COLLECTION_NAME", name):
+        written_on_add, first = run_async(_run())
+
+    assert written_on_add == []
+    assert first == [f"{name}.json", f"{name}.npy"]
+    assert not (tmp_path / f"{name}.json").exists()
@@ -0,0 +1,128 @@
+"""Tests for chunked TTS delivery (gateway.tts_stream) and the streaming mock provider."""
+import base64
+import json
+import time
+
+from conftest import run_async
+
+
+class _RecordingWS:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append((time.monotonic(), json.loads(text)))
+
+
+def test_streamed_tts_is_ordered_and_reassembles_to_the_full_audio():
+    from gateway.tts_stream import send_tts
+    from tts.provider.mock import MockStreamingTTSProvider
+
+    provider = MockStreamingTTSProvider(chunk_size=500, chunk_delay_s=0.02)
+    text = "Shall I book Trattoria Roma for four on Friday?"
+    ws = _RecordingWS()
+
+    async def _run():
+        start = time.monotonic()
+        sent = await send_tts(ws, "s1", text, streaming=True, provider=provider,
+                              auto_record=True, ui_mode="approval")
+        return start, sent, (await provider.synthesize(text)).audio_bytes
+
+    start, sent, full_audio = run_async(_run())
+    types = [env["type"] for _, env in ws.sent]
+    header, chunks, end = ws.sent[0][1], [env for _, env in ws.sent[1:-1]], ws.sent[-1][1]
+
+    assert types[0] == "tts_audio" and types[-1] == "tts_audio_end"
+    assert set(types[1:-1]) == {"tts_audio_chunk"} and len(chunks) > 3
+    assert header["payload"]["auto_record"] is True and header["payload"]["ui_mode"] == "approval"
+    assert "audio" not in header["payload"]
+    stream_id = header["payload"]["stream_id"]
+    assert [c["payload"]["seq"] for c in chunks] == list(range(len(chunks)))
+    assert {c["payload"]["stream_id"] for c in chunks} == {end["payload"]["stream_id"]} == {stream_id}
+    assert b"".join(base64.b64decode(c["payload"]["audio"]) for c in chunks) == full_audio
+    assert end["payload"] == {
+        "stream_id": stream_id, "session_id": "s1", "chunk_count": len(chunks),
+        "audio_size_bytes": len(full_audio), "complete": True,
+    }
+    assert sent == len(full_audio)
+    # First audio leaves at first-chunk latency, long before synthesis finishes
+    assert ws.sent[1][0] - start < 0.02 <= ws.sent[-1][0] - ws.sent[1][0]
+
+
+def test_no_audio_falls_back_to_text_and_legacy_clients_get_one_envelope():
+    from gateway.tts_stream import send_tts
+    from tts.provider.mock import MockTTSProvider
+
+    class _RealAudio(MockTTSProvider):
+        async def synthesize(self, text, voice_id=None):
+            result = await super().synthesize(text, voice_id)
+            result.audio_bytes, result.format, result.is_mock = b"ID3audio", "mp3", False
+            return result
+
+    async def _run():
+        text_ws, legacy_ws = _RecordingWS(), _RecordingWS()
+        await send_tts(text_ws, "s2", "Hello", streaming=True, provider=MockTTSProvider(), auto_record=True)
+        await send_tts(legacy_ws, "s2", "Hello", streaming=False, provider=_RealAudio())
+        return text_ws.sent, legacy_ws.sent
+
+    text_sent, legacy_sent = run_async(_run())
+    assert [env["type"] for _, env in text_sent] == ["tts_audio"]
+    assert text_sent[0][1]["payload"] == {
+        "text": "Hello", "session_id": "s2", "format": "text", "is_mock": True, "auto_record": True,
+    }
+    assert [env["type"] for _, env in legacy_sent] == ["tts_audio"]
+    assert base64.b64decode(legacy_sent[0][1]["payload"]["audio"]) == b"ID3audio"
+
+
+def test_provider_failure_mid_stream_closes_the_stream_incomplete():
+    from gateway.tts_stream import send_tts
+    from tts.provider.mock import MockStreamingTTSProvider
+
+    class _Flaky(MockStreamingTTSProvider):
+        async def stream(self, text, voice_id=None):
+            audio = self.audio_for(text)
+            yield audio[:100]
+            yield audio[100:200]
+            raise ConnectionError("upstream reset")
+
+    ws = _RecordingWS()
+    sent = run_async(send_tts(ws, "s3", "A long enough answer", streaming=True, provider=_Flaky(chunk_size=100)))
+    end = ws.sent[-1][1]
+    assert end["type"] == "tts_audio_end"
+    assert end["payload"]["chunk_count"] == 2 and end["payload"]["complete"] is False
+    assert sent == end["payload"]["audio_size_bytes"] == 200
+
+
+def test_elevenlabs_stream_failure_or_stall_marks_the_stream_incomplete():
+    import threading
+    from types import SimpleNamespace
+    from unittest.mock import patch
+    from gateway.tts_stream import send_tts
+    from tts.provider import elevenlabs
+
+    release = threading.Event()
+
+    def _failing(**request):
+        yield b"a" * 100
+        yield b"b" * 100
+        raise ConnectionError("upstream reset")
+
+    def _stalling(**request):
+        yield b"a" * 100
+        release.wait(5)
+
+    def _provider(sdk_stream):
+        provider = elevenlabs.ElevenLabsTTSProvider.__new__(elevenlabs.ElevenLabsTTSProvider)
+        provider._client = SimpleNamespace(text_to_speech=SimpleNamespace(stream=sdk_stream))
+        return provider
+
+    ends = []
+    with patch.object(elevenlabs, "SYNTHESIS_TIMEOUT_S", 0.2):
+        for sdk_stream in (_failing, _stalling):
+            ws = _RecordingWS()
+            run_async(send_tts(ws, "s4", "Your table is booked.", streaming=True, provider=_provider(sdk_stream)))
+            ends.append(ws.sent[-1][1])
+    release.set()
+
+    assert [end["type"] for end in ends] == ["tts_audio_end", "tts_audio_end"]
+    assert [(end["payload"]["chunk_count"], end["payload"]["complete"]) for end in ends] == [(2, False), (1, False)]
@@ -0,0 +1,104 @@
+"""Tests for compact vector encodings (memory.client.vector_codec).
+
+Includes the recall-accuracy check documented in the codec module: top-10
+cosine neighbours under each compact encoding versus full float32.
+"""
+import json
+
+import numpy as np
+import pytest
+
+
+def _unit_vectors(rng, n, dim=384):
+    v = rng.normal(size=(n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("encoding,size,tolerance", [
+    ("f32", 4 * 384, 0.0),
+    ("f16", 2 * 384, 1e-3),
+    ("i8", 4 + 384, 1e-2),
+])
+def test_pack_roundtrip_size_and_error(encoding, size, tolerance):
+    from memory.client import vector_codec
+
+    vec = _unit_vectors(np.random.default_rng(1), 1)[0].tolist()
+    blob = vector_codec.pack(vec, encoding)
+    assert len(blob) == size
+    restored = vector_codec.unpack(blob, encoding)
+    assert max(abs(a - b) for a, b in zip(vec, restored)) <= tolerance
+    assert vector_codec.decode(vector_codec.encode(vec, encoding), encoding) == restored
+
+
+def test_compact_json_is_4_to_8x_smaller_than_float_list():
+    from memory.client import vector_codec
+
+    vec = _unit_vectors(np.random.default_rng(2), 1)[0].tolist()
+    as_floats = len(json.dumps(vec))
+    assert as_floats / len(vector_codec.encode(vec, "f16")) >= 4
+    assert as_floats / len(vector_codec.encode(vec, "i8")) >= 8
+
+
+def test_negotiate_reads_accept_parameter():
+    from memory.client.vector_codec import negotiate
+
+    assert negotiate(None) == "f32"
+    assert negotiate("application/json") == "f32"
+    assert negotiate("application/json; vector-encoding=f16") == "f16"
+    assert negotiate('text/html, application/json;q=0.9; vector-encoding="I8"') == "i8"
+    assert negotiate("application/json; vector-encoding=bf16") == "f32"
+
+
+def test_recall_accuracy_against_float32():
+    """Top-10 neighbour overlap with float32 on clustered embeddings-like data."""
+    from memory.client import vector_codec
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 384))
+    docs = np.concatenate([c + 0.6 * rng.normal(size=(100, 384)) for c in centers]).astype(np.float32)
+    docs /= np.linalg.norm(docs, axis=1, keepdims=True)
+    queries = docs[rng.choice(len(docs), 50)] + 0.3 * rng.normal(size=(50, 384)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    def top10(matrix):
+        return np.argsort(-(queries @ matrix.T), axis=1)[:, :10]
+
+    reference = top10(docs)
+    for encoding, minimum in (("f16", 0.99), ("i8", 0.97)):
+        decoded = np.array([vector_codec.unpack(vector_codec.pack(d, encoding), encoding) for d in docs])
+        overlap = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(reference, top10(decoded))])
+        assert overlap >= minimum, (encoding, overlap)
+
+
+def test_sync_nodes_switch_to_compact_vectors_when_negotiated():
+    from fastapi import Response
+    from api.digital_self_sync import PKGNodeOut, _encode_vectors
+
+    def _node():
+        return PKGNodeOut(id="n", type="Person", label="x", data={}, confidence=0.9,
+                          provenance="LINKEDIN", vector=[0.5, -0.25, 1.0])
+
+    plain, compact = [_node()], [_node()]
+    response = Response()
+    _encode_vectors(plain, "application/json", response)
+    _encode_vectors(compact, "application/json; vector-encoding=f16", response)
+
+    assert plain[0].vector == [0.5, -0.25, 1.0] and plain[0].vector_b64 is None
+    assert compact[0].vector == [] and compact[0].vector_encoding == "f16"
+    from memory.client.vector_codec import decode
+    assert decode(compact[0].vector_b64, "f16") == [0.5, -0.25, 1.0]
+    assert response.headers["Vary"] == "Accept"
+
+
+def test_vector_store_persists_configured_encoding():
+    from types import SimpleNamespace
+    from unittest.mock import patch
+    from memory.client import vector
+    from memory.client.embedder import MODEL_NAME
+
+    settings = SimpleNamespace(VECTOR_STORAGE_ENCODING="i8")
+    with patch.object(vector, "get_settings", return_value=settings):
+        fields = vector._embedding_fields([0.5, -1.0, 0.25])
+    assert fields["embedding_encoding"] == "i8" and len(fields["embedding"]) == 4 + 3
+    restored = vector._stored_embedding({**fields, "embedding_model": MODEL_NAME})
+    assert np.allclose(restored, [0.5, -1.0, 0.25], atol=1e-2)
@@ -0,0 +1,209 @@
+"""Tests for vector persistence — stored embeddings and re-embed-free rehydration.
+
+Chroma and MongoDB are replaced with in-process fakes; the ONNX model is never loaded.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from conftest import FakeCollection, run_async
+
+
+def test_embedding_pack_roundtrip_is_float32_exact():
+    from memory.client.vector import _pack_embedding, _unpack_embedding
+
+    vec = [0.25, -1.5, 3.0, 0.0]
+    blob = _pack_embedding(vec, "f32")
+    assert isinstance(blob, bytes)
+    assert len(blob) == 4 * len(vec)
+    assert _unpack_embedding(blob) == vec
+
+
+def test_stored_embedding_ignored_for_other_model():
+    from memory.client.vector import _pack_embedding, _stored_embedding
+    from memory.client.embedder import MODEL_NAME
+
+    blob = _pack_embedding([1.0, 2.0], "f32")
+    assert _stored_embedding({"embedding": blob, "embedding_model": MODEL_NAME}) == [1.0, 2.0]
+    assert _stored_embedding({"embedding": blob, "embedding_model": "other-model"}) is None
+    assert _stored_embedding({"text": "no vector"}) is None
+
+
+def test_reload_uses_stored_vectors_and_backfills_the_rest():
+    from memory.client import vector
+    from memory.client.embedder import MODEL_NAME
+
+    store = FakeCollection([
+        {"doc_id": "a", "text": "Alice is a colleague.", "metadata": {"user_id": "u1"},
+         "embedding": vector._pack_embedding([0.5, 0.5], "f32"), "embedding_model": MODEL_NAME},
+        {"doc_id": "b", "text": "Bob is a friend.", "metadata": {"user_id": "u1"}},
+        {"doc_id": "c", "text": "", "metadata": {"user_id": "u1"}},
+    ])
+    db = MagicMock()
+    db.vector_store = store
+    coll = MagicMock()
+
+    async def _fake_embed_async(texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    async def _run():
+        count = await vector.reload_from_mongodb()
+        await vector.wait_for_backfill()
+        return count
+
+    with patch.object(vector, "get_db", return_value=db), \
+         patch.object(vector, "_get_collection", return_value=coll), \
+         patch.object(vector, "embed", side_effect=AssertionError("sync re-embed not allowed")), \
+         patch.object(vector, "embed_async", side_effect=_fake_embed_async):
+        count = run_async(_run())
+
+    assert count == 1
+    first, backfill = coll.upsert.call_args_list
+    assert first.kwargs["ids"] == ["a"]
+    assert first.kwargs["embeddings"] == [[0.5, 0.5]]
+    assert backfill.kwargs["ids"] == ["b"]
+    assert backfill.kwargs["embeddings"] == [[1.0, 0.0]]
+    # Backfilled vector written back to Mongo so the next restart skips it
+    assert len(store.ops) == 1
+
+
+def test_reload_streams_in_batches_without_a_cap():
+    from memory.client import vector
+    from memory.client.embedder import MODEL_NAME
+
+    blob = vector._pack_embedding([1.0, 0.0], "f32")
+    store = FakeCollection([
+        {"doc_id": f"d{i}", "text": f"fact {i}", "metadata": {"user_id": "u1"},
+         "embedding": blob, "embedding_model": MODEL_NAME}
+        for i in range(25)
+    ])
+    db = MagicMock()
+    db.vector_store = store
+    coll = MagicMock()
+    settings = SimpleNamespace(VECTOR_REHYDRATE_MODE="eager", VECTOR_REHYDRATE_BATCH_SIZE=10, VECTOR_SNAPSHOT_DIR="", VECTOR_EXACT_SEARCH_MAX_DOCS=0)
+    seen = []
+
+    with patch.object(vector, "get_db", return_value=db), \
+         patch.object(vector, "_get_collection", return_value=coll), \
+         patch.object(vector, "get_settings", return_value=settings):
+        count = run_async(vector.reload_from_mongodb(progress=seen.append))
+
+    assert count == 25
+    assert [len(c.kwargs["ids"]) for c in coll.upsert.call_args_list] == [10, 10, 5]
+    assert seen == [10, 20, 25]
+
+
+def test_lazy_mode_loads_users_on_first_use_only():
+    from memory.client import vector
+    from memory.client.embedder import MODEL_NAME
+
+    blob = vector._pack_embedding([1.0, 0.0], "f32")
+    store = FakeCollection([
+        {"doc_id": "skill_x", "text": "Skill: x", "metadata": {"type": "skill"},
+         "embedding": blob, "embedding_model": MODEL_NAME},
+        {"doc_id": "u1_a", "text": "u1 fact", "metadata": {"user_id": "u1"},
+         "embedding": blob, "embedding_model": MODEL_NAME},
+        {"doc_id": "u2_a", "text": "u2 fact", "metadata": {"user_id": "u2"},
+         "embedding": blob, "embedding_model": MODEL_NAME},
+    ])
+    db = MagicMock()
+    db.vector_store = store
+    coll = MagicMock()
+    settings = SimpleNamespace(VECTOR_REHYDRATE_MODE="lazy", VECTOR_REHYDRATE_BATCH_SIZE=100, VECTOR_SNAPSHOT_DIR="", VECTOR_EXACT_SEARCH_MAX_DOCS=0)
+
+    async def _run():
+        boot = await vector.reload_from_mongodb()
+        await asyncio.gather(vector.ensure_user_loaded("u1"), vector.ensure_user_loaded("u1"))
+        await vector.ensure_user_loaded("u1")
+        return boot
+
+    with patch.object(vector, "get_db", return_value=db), \
+         patch.object(vector, "_get_collection", return_value=coll), \
+         patch.object(vector, "get_settings", return_value=settings), \
+         patch.object(vector, "_loaded_users", set()):
+        boot = run_async(_run())
+
+    assert boot == 1
+    loaded_ids = [c.kwargs["ids"] for c in coll.upsert.call_args_list]
+    # Shared docs at boot, then u1 exactly once; u2 never touched
+    assert loaded_ids == [["skill_x"], ["u1_a"]]
+
+
+# ── Per-user partitions ─────────────────────────────────────────────────────
+
+def test_split_where_extracts_user_scope():
+    from memory.client.vector import _split_where
+
+    assert _split_where({"user_id": "u1"}) == ("u1", None)
+    assert _split_where(
+        {"$and": [{"user_id": "u1"}, {"confidential": {"$ne": True}}]}
+    ) == ("u1", {"confidential": {"$ne": True}})
+    assert _split_where({"type": "skill"}) == ("", {"type": "skill"})
+    assert _split_where(None) == ("", None)
+
+
+def test_partitions_isolate_users_and_count_exactly():
+    """Each user's vectors live in their own Chroma collection."""
+    import uuid
+    from memory.client import vector
+
+    u1, u2 = f"test_user_{uuid.uuid4().hex[:8]}", f"test_user_{uuid.uuid4().hex[:8]}"
+    with patch.object(vector, "_persist_one"), patch.object(vector, "_collections", {}):
+        vector.add_document_with_embedding("u1_a", [1.0, 0.0, 0.0], {"user_id": u1})
+        vector.add_document_with_embedding("u1_b", [0.0, 1.0, 0.0], {"user_id": u1})
+        vector.add_document_with_embedding("u2_a", [1.0, 0.0, 0.0], {"user_id": u2})
+
+        assert vector.count(u1) == 2
+        assert vector.count(u2) == 1
+        assert vector._partition_name(u1) != vector._partition_name(u2)
+
+        hits = vector._run_query({"query_embeddings": [[1.0, 0.0, 0.0]]}, 5, {"user_id": u2})
+        assert [h["id"] for h in hits] == ["u2_a"]
+
+        vector.evict_user(u1)
+        assert u1 not in vector._collections
+        vector.evict_user(u2)
+
+
+def test_delete_user_removes_vectors_everywhere_and_stays_deleted():
+    """delete_user() wins over queued upserts and nothing rehydrates afterwards."""
+    import uuid
+    from memory.client import vector
+    from memory.client.write_behind import VectorWriteBehind
+
+    uid = f"test_user_{uuid.uuid4().hex[:8]}"
+    store = FakeCollection([])
+    store.delete_many_calls = []
+
+    async def delete_many(query):
+        store.delete_many_calls.append(query)
+        return SimpleNamespace(deleted_count=3)   # docs only MongoDB still had
+
+    store.delete_many = delete_many
+    db = MagicMock()
+    db.vector_store = store
+    queue = VectorWriteBehind(flush_interval_ms=10_000)
+    settings = SimpleNamespace(VECTOR_EXACT_SEARCH_MAX_DOCS=0, VECTOR_STORAGE_ENCODING="f32",
+                               VECTOR_REHYDRATE_BATCH_SIZE=100)
+
+    async def _run():
+        vector.add_document_with_embedding("a", [1.0, 0.0], {"user_id": uid})
+        vector.add_document_with_embedding("b", [0.0, 1.0], {"user_id": uid})
+        removed = await vector.delete_user(uid)
+        await vector.ensure_user_loaded(uid)
+        return removed
+
+    with patch.object(vector, "get_db", return_value=db), \
+         patch("memory.client.write_behind.get_db", return_value=db), \
+         patch.object(vector, "get_write_behind", return_value=queue), \
+         patch.object(vector, "get_settings", return_value=settings), \
+         patch.object(vector, "_collections", {}), \
+         patch.object(vector, "_loaded_users", set()), \
+         patch.object(vector, "_snapshot_dirty", set()) as dirty:
+        removed = run_async(_run())
+        assert vector.count(uid) == 0
+        assert uid in dirty
+
+    assert removed == 5
+    assert [type(op).__name__ for op in store.ops] == ["DeleteOne", "DeleteOne"]
+    assert store.delete_many_calls == [{"metadata.user_id": uid}]
@@ -0,0 +1,164 @@
+"""Tests for vector disk snapshots (memory.client.vector_snapshot + vector restore).
+
+Chroma is real (in-memory); MongoDB is an in-process fake. The ONNX model
+is never loaded — every document carries a precomputed vector.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from conftest import FakeCollection, run_async
+
+
+def _doc(vector, doc_id, user_id, emb, updated_at):
+    from memory.client.embedder import MODEL_NAME
+    return {
+        "doc_id": doc_id, "text": f"fact {doc_id}", "metadata": {"user_id": user_id},
+        "embedding": vector._pack_embedding(emb, "f32"), "embedding_model": MODEL_NAME,
+        "embedding_encoding": "f32", "updated_at": updated_at,
+    }
+
+
+def _settings(directory):
+    return SimpleNamespace(
+        VECTOR_REHYDRATE_MODE="eager",
+        VECTOR_REHYDRATE_BATCH_SIZE=100,
+        VECTOR_SNAPSHOT_DIR=str(directory),
+        VECTOR_STORAGE_ENCODING="f32",
+        VECTOR_EXACT_SEARCH_MAX_DOCS=1000,
+    )
+
+
+def _fresh_state(vector):
+    return [
+        patch.object(vector, "_collections", {}),
+        patch.object(vector, "_lexical", {}),
+        patch.object(vector, "_loaded_users", set()),
+        patch.object(vector, "_snapshot_dirty", set()),
+        patch.object(vector, "_snapshot", None),
+        patch.dict(vector._snapshot_stats, {"docs_from_snapshot": 0, "partitions_repaired": 0}),
+    ]
+
+
+def _snapshot_then_restart(vector, tmp_path, uid, mongo_docs):
+    """Load a/b, snapshot them, drop everything in memory, restart against mongo_docs."""
+    store = FakeCollection(mongo_docs)
+    db = MagicMock()
+    db.vector_store = store
+
+    async def _run():
+        vector._upsert_many(
+            ["a", "b"], ["fact a", "fact b"], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+            [{"user_id": uid}, {"user_id": uid}],
+        )
+        written = await vector.snapshot_to_disk()
+        vector.evict_user(uid)
+        vector._snapshot_dirty.clear()
+        vector._loaded_users.clear()
+        restored = await vector.reload_from_mongodb()
+        return written, restored
+
+    patches = _fresh_state(vector) + [
+        patch.object(vector, "_persist_one"),
+        patch.object(vector, "get_db", return_value=db),
+        patch.object(vector, "get_settings", return_value=_settings(tmp_path)),
+    ]
+    for p in patches:
+        p.start()
+    try:
+        written, restored = run_async(_run())
+        ids = sorted(vector._get_collection(uid).get()["ids"])
+        stats = dict(vector._snapshot_stats)
+        vector.evict_user(uid)
+    finally:
+        for p in reversed(patches):
+            p.stop()
+    return store, written, restored, ids, stats
+
+
+def test_partition_files_roundtrip_memory_mapped(tmp_path):
+    from memory.client import vector_snapshot
+
+    emb = np.arange(12, dtype=np.float32).reshape(3, 4)
+    vector_snapshot.write_partition(
+        str(tmp_path), "p1", ["a", "b", "c"], ["x", "y", ""], [{"k": 1}, {"k": 2}, {"k": 3}], emb, "m",
+    )
+    vector_snapshot.write_manifest(str(tmp_path), "m", "2026-01-01T00:00:00+00:00", {"u1": "p1"})
+
+    model, ids, docs, metas, matrix = vector_snapshot.read_partition(str(tmp_path), "p1")
+    assert (model, ids, docs, metas[2]) == ("m", ["a", "b", "c"], ["x", "y", ""], {"k": 3})
+    assert isinstance(matrix, np.memmap)
+    assert np.array_equal(matrix, emb)
+    assert vector_snapshot.read_manifest(str(tmp_path))["partitions"] == {"u1": "p1"}
+    assert vector_snapshot.read_partition(str(tmp_path), "missing") is None
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_restore_reads_only_docs_after_the_watermark(tmp_path):
+    from memory.client import vector
+
+    uid = f"test_user_{uuid.uuid4().hex[:8]}"
+    old = datetime.now(timezone.utc) - timedelta(days=1)
+    new = datetime.now(timezone.utc) + timedelta(minutes=5)
+    store, written, restored, ids, stats = _snapshot_then_restart(vector, tmp_path, uid, [
+        _doc(vector, "a", uid, [1.0, 0.0, 0.0], old),
+        _doc(vector, "b", uid, [0.0, 1.0, 0.0], old),
+        _doc(vector, "c", uid, [0.0, 0.0, 1.0], new),   # written after the snapshot
+    ])
+
+    assert written == 1
+    assert restored == 3
+    assert ids == ["a", "b", "c"]
+    assert stats["docs_from_snapshot"] == 2
+    assert stats["partitions_repaired"] == 0
+    # MongoDB was asked for the delta only — never a full scan
+    assert len(store.queries) == 1 and set(store.queries[0]) == {"updated_at"}
+
+
+def test_restore_reloads_partition_that_disagrees_with_mongo(tmp_path):
+    from memory.client import vector
+
+    uid = f"test_user_{uuid.uuid4().hex[:8]}"
+    old = datetime.now(timezone.utc) - timedelta(days=1)
+    # "b" was deleted after the snapshot was taken
+    store, _, restored, ids, stats = _snapshot_then_restart(vector, tmp_path, uid, [
+        _doc(vector, "a", uid, [1.0, 0.0, 0.0], old),
+    ])
+
+    assert restored == 1
+    assert ids == ["a"]
+    assert stats["partitions_repaired"] == 1
+    assert {"metadata.user_id": uid} in store.queries
+
+
+def test_snapshot_rewrites_only_changed_partitions(tmp_path):
+    from memory.client import vector
+
+    u1, u2 = f"test_user_{uuid.uuid4().hex[:8]}", f"test_user_{uuid.uuid4().hex[:8]}"
+
+    async def _run():
+        vector.add_document_with_embedding("a", [1.0, 0.0], {"user_id": u1})
+        vector.add_document_with_embedding("b", [0.0, 1.0], {"user_id": u2})
+        first = await vector.snapshot_to_disk()
+        unchanged = await vector.snapshot_to_disk()
+        vector.add_document_with_embedding("c", [1.0, 1.0], {"user_id": u2})
+        second = await vector.snapshot_to_disk()
+        return first, unchanged, second
+
+    patches = _fresh_state(vector) + [
+        patch.object(vector, "_persist_one"),
+        patch.object(vector, "get_settings", return_value=_settings(tmp_path)),
+    ]
+    for p in patches:
+        p.start()
+    try:
+        assert run_async(_run()) == (2, 0, 1)
+        assert set(vector._snapshot["partitions"]) == {u1, u2}
+        vector.evict_user(u1)
+        vector.evict_user(u2)
+    finally:
+        for p in reversed(patches):
+            p.stop()
@@ -0,0 +1,196 @@
+"""Tests for the vector write-behind pipeline (memory.client.write_behind).
+
+MongoDB is replaced with a fake collection that records bulk_write batches.
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pymongo import DeleteOne, UpdateOne
+
+from conftest import FakeCollection, run_async
+
+
+def _db(store):
+    db = MagicMock()
+    db.vector_store = store
+    return db
+
+
+def test_ops_coalesce_per_doc_and_flush_on_close():
+    from memory.client.write_behind import VectorWriteBehind
+
+    store = FakeCollection()
+
+    async def _run():
+        wb = VectorWriteBehind(batch_size=100, flush_interval_ms=10_000)
+        wb.submit_upsert("a", {"doc_id": "a", "text": "v1"})
+        wb.submit_upsert("b", {"doc_id": "b", "text": "b"})
+        wb.submit_upsert("a", {"doc_id": "a", "text": "v2"})
+        wb.submit_delete("b")
+        assert wb.get_stats()["queue_depth"] == 2
+        await wb.close()
+        return wb
+
+    with patch("memory.client.write_behind.get_db", return_value=_db(store)):
+        wb = run_async(_run())
+
+    assert len(store.batches) == 1
+    ops = store.batches[0]
+    assert len(ops) == 2
+    assert isinstance(ops[0], UpdateOne) and ops[0]._doc == {"$set": {"doc_id": "a", "text": "v2"}}
+    assert isinstance(ops[1], DeleteOne)
+    assert wb.get_stats()["queue_depth"] == 0
+    assert wb.get_stats()["ops_flushed"] == 2
+
+
+def test_submit_without_a_running_loop_raises_and_queues_nothing():
+    from memory.client.write_behind import VectorWriteBehind
+
+    wb = VectorWriteBehind()
+    with pytest.raises(RuntimeError, match="running event loop"):
+        wb.submit_upsert("a", {"doc_id": "a"})
+    with pytest.raises(RuntimeError, match="running event loop"):
+        wb.submit_delete("a")
+    assert wb.get_stats()["queue_depth"] == 0
+
+
+def test_metadata_update_merges_into_queued_upsert():
+    """vector.update_metadata() queues a partial $set — it must not drop the queued embedding."""
+    import uuid
+    from types import SimpleNamespace
+    from memory.client import vector
+    from memory.client.write_behind import VectorWriteBehind
+
+    store = FakeCollection()
+    uid = f"test_user_{uuid.uuid4().hex[:8]}"
+    settings = SimpleNamespace(VECTOR_EXACT_SEARCH_MAX_DOCS=0, VECTOR_STORAGE_ENCODING="f32")
+
+    async def _run():
+        wb = VectorWriteBehind(batch_size=100, flush_interval_ms=10_000)
+        with patch.object(vector, "get_write_behind", return_value=wb), \
+             patch.object(vector, "get_settings", return_value=settings), \
+             patch.object(vector, "_collections", {}):
+            vector.add_document_with_embedding("a", [1.0, 0.0], {"user_id": uid, "occurrences": 1})
+            assert vector.update_metadata("a", {"user_id": uid, "occurrences": 2}, user_id=uid)
+            vector.evict_user(uid)
+        await wb.close()
+
+    with patch("memory.client.write_behind.get_db", return_value=_db(store)):
+        run_async(_run())
+
+    [[op]] = store.batches
+    flushed = op._doc["$set"]
+    assert flushed["metadata"] == {"user_id": uid, "occurrences": 2}
+    assert vector._stored_embedding(flushed) == [1.0, 0.0]
+
+
+def test_close_writes_the_batch_the_flusher_is_holding():
+    from memory.client.write_behind import VectorWriteBehind
+
+    class _SlowStore(FakeCollection):
+        def __init__(self):
+            super().__init__()
+            self.writing = asyncio.Event()
+
+        async def bulk_write(self, ops, ordered=True):
+            self.writing.set()
+            await asyncio.sleep(0.05)
+            await super().bulk_write(ops, ordered)
+
+    store = _SlowStore()
+
+    async def _run():
+        wb = VectorWriteBehind(batch_size=2, flush_interval_ms=10_000)
+        for i in range(3):
+            wb.submit_upsert(f"d{i}", {"doc_id": f"d{i}"})
+        await store.writing.wait()          # flusher has popped d0, d1
+        await wb.close()
+        return wb
+
+    with patch("memory.client.write_behind.get_db", return_value=_db(store)):
+        wb = run_async(_run())
+
+    assert sorted(op._filter["doc_id"] for batch in store.batches for op in batch) == ["d0", "d1", "d2"]
+    assert wb.get_stats()["queue_depth"] == 0
+
+
+def test_full_batch_triggers_background_flush():
+    from memory.client.write_behind import VectorWriteBehind
+
+    store = FakeCollection()
+
+    async def _run():
+        wb = VectorWriteBehind(batch_size=3, flush_interval_ms=10_000)
+        for i in range(3):
+            wb.submit_upsert(f"d{i}", {"doc_id": f"d{i}"})
+        for _ in range(10):
+            await asyncio.sleep(0)
+        flushed = len(store.batches)
+        await wb.close()
+        return flushed
+
+    with patch("memory.client.write_behind.get_db", return_value=_db(store)):
+        assert run_async(_run()) == 1
+
+
+def test_backpressure_waits_until_flushed():
+    from memory.client.write_behind import VectorWriteBehind
+
+    store = FakeCollection()
+
+    async def _run():
+        wb = VectorWriteBehind(batch_size=2, max_backlog=2, flush_interval_ms=10_000)
+        wb.submit_upsert("a", {"doc_id": "a"})
+        wb.submit_upsert("b", {"doc_id": "b"})
+        await asyncio.wait_for(wb.wait_for_capacity(), timeout=1.0)
+        depth = wb.get_stats()["queue_depth"]
+        await wb.close()
+        return depth
+
+    with patch("memory.client.write_behind.get_db", return_value=_db(store)):
+        assert run_async(_run()) < 2
+    assert store.batches
+
+
+def test_failed_batch_is_retried_not_lost():
+    from memory.client.write_behind import VectorWriteBehind
+
+    store = FakeCollection(fail_times=2)
+
+    async def _run():
+        wb = VectorWriteBehind(batch_size=10, flush_interval_ms=10_000, max_retries=3)
+        wb.submit_upsert("a", {"doc_id": "a"})
+        await wb.flush()
+        return wb
+
+    with patch("memory.client.write_behind.get_db", return_value=_db(store)), \
+         patch("memory.client.write_behind.asyncio.sleep", new=_no_sleep):
+        wb = run_async(_run())
+
+    assert len(store.batches) == 1
+    assert wb.get_stats()["flush_failures"] == 0
+
+
+def test_exhausted_retries_requeue_batch():
+    from memory.client.write_behind import VectorWriteBehind
+
+    store = FakeCollection(fail_times=5)
+
+    async def _run():
+        wb = VectorWriteBehind(batch_size=10, flush_interval_ms=10_000, max_retries=2)
+        wb.submit_upsert("a", {"doc_id": "a"})
+        await wb.flush()
+        return wb
+
+    with patch("memory.client.write_behind.get_db", return_value=_db(store)), \
+         patch("memory.client.write_behind.asyncio.sleep", new=_no_sleep):
+        wb = run_async(_run())
+
+    stats = wb.get_stats()
+    assert stats["flush_failures"] == 1
+    assert stats["queue_depth"] == 1   # still pending, will be retried
+
+
+async def _no_sleep(_delay):
+    return None
@@ -0,0 +1,115 @@
+"""Tests for the cross-worker session backplane (gateway.backplane) and its gateway wiring."""
+import asyncio
+import json
+import tempfile
+import uuid
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from conftest import run_async
+
+
+def _collector():
+    """A backplane handler that records messages and signals each arrival."""
+    got, arrived = [], asyncio.Event()
+
+    async def handler(message):
+        got.append(message)
+        arrived.set()
+
+    return handler, got, arrived
+
+
+def test_in_process_backplane_reaches_peers_but_not_itself():
+    from gateway.backplane import InProcessBackplane
+
+    async def _run():
+        channel = uuid.uuid4().hex
+        a, b, lone = InProcessBackplane(channel), InProcessBackplane(channel), InProcessBackplane(uuid.uuid4().hex)
+        (on_a, got_a, _), (on_b, got_b, b_arrived) = _collector(), _collector()
+        await a.start(on_a)
+        await b.start(on_b)
+        await lone.start(AsyncMock())
+        reached = await a.publish({"session_id": "s1", "type": "pipeline_stage", "payload": {}})
+        alone = await lone.publish({"session_id": "s1", "type": "pipeline_stage", "payload": {}})
+        await asyncio.wait_for(b_arrived.wait(), timeout=1.0)
+        for bp in (a, b, lone):
+            await bp.close()
+        return reached, alone, got_a, got_b
+
+    reached, alone, got_a, got_b = run_async(_run())
+    assert reached == 1 and alone == 0       # a single worker has nobody to forward to
+    assert got_a == [] and got_b[0]["session_id"] == "s1"
+
+
+def test_unix_socket_backplane_fans_out_between_workers_and_drops_stale_peers():
+    from gateway.backplane import UnixSocketBackplane
+
+    async def _run(directory):
+        w1, w2, w3 = (UnixSocketBackplane(directory) for _ in range(3))
+        (on_2, got2, arrived2), (on_3, got3, arrived3) = _collector(), _collector()
+        await w1.start(AsyncMock())
+        await w2.start(on_2)
+        await w3.start(on_3)
+
+        message = {"execution_id": "exec-1", "type": "tts_audio", "payload": {"text": "Results are in Chat."}}
+        reached = await w1.publish(message)
+        await asyncio.wait_for(asyncio.gather(arrived2.wait(), arrived3.wait()), timeout=1.0)
+        for w in (w1, w2, w3):
+            await w.close()
+        return reached, got2, got3
+
+    with tempfile.TemporaryDirectory() as directory:
+        stale = Path(directory) / "dead-worker.sock"
+        stale.touch()                          # left behind by a crashed worker
+        reached, got2, got3 = run_async(_run(directory))
+        stale_left, leftover = stale.exists(), sorted(Path(directory).iterdir())
+
+    assert reached == 2
+    assert got2 == got3 == [{"execution_id": "exec-1", "type": "tts_audio", "payload": {"text": "Results are in Chat."}}]
+    assert not stale_left and leftover == []  # close() removes each worker's socket
+
+
+def test_gateway_forwards_misses_and_delivers_messages_for_its_own_sessions():
+    from gateway import ws_server
+
+    class _WS:
+        def __init__(self):
+            self.sent = []
+
+        async def send_text(self, text):
+            self.sent.append(json.loads(text))
+
+    backplane = AsyncMock()
+    backplane.publish.return_value = 1
+    ws = _WS()
+    session_id, execution_id = f"sess-{uuid.uuid4().hex[:8]}", f"exec-{uuid.uuid4().hex[:8]}"
+
+    async def _run():
+        with patch.object(ws_server, "get_backplane", return_value=backplane):
+            # Not ours: forwarded to the other workers
+            forwarded = await ws_server.broadcast_to_session("exec-elsewhere", "pipeline_stage", {"stage_index": 9})
+            # Ours, as seen by the worker that received the peer's message
+            ws_server.active_connections[session_id] = ws
+            ws_server.execution_sessions[execution_id] = session_id
+            try:
+                await ws_server._deliver_from_backplane(
+                    {"execution_id": execution_id, "type": "pipeline_stage", "payload": {"stage_index": 9}},
+                )
+                await ws_server._deliver_from_backplane(
+                    {"execution_id": "exec-elsewhere", "type": "pipeline_stage", "payload": {}},
+                )
+                local = await ws_server.send_to_session(session_id, ws_server.WSMessageType.TTS_AUDIO, {"text": "hi"})
+            finally:
+                record = ws_server._sessions.drop(session_id)
+                ws_server.execution_sessions.forget_session(record)
+        return forwarded, local
+
+    forwarded, local = run_async(_run())
+    assert forwarded is True and local is True
+    backplane.publish.assert_awaited_once_with(
+        {"execution_id": "exec-elsewhere", "type": "pipeline_stage", "payload": {"stage_index": 9}},
+    )
+    assert [(m["type"], m["payload"]) for m in ws.sent] == [
+        ("pipeline_stage", {"stage_index": 9}), ("tts_audio", {"text": "hi"}),
+    ]
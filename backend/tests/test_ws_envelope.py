@@ -0,0 +1,55 @@
+"""Tests for the outbound envelope fast path (gateway.envelope)."""
+import json
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+
+
+def _legacy(msg_type, payload):
+    from schemas.ws_messages import WSEnvelope
+
+    if not isinstance(payload, dict):
+        payload = payload.model_dump()
+    return WSEnvelope(type=msg_type, payload=payload).model_dump_json()
+
+
+def _without_id_and_time(text):
+    data = json.loads(text)
+    return {k: v for k, v in data.items() if k not in ("id", "timestamp")}, data
+
+
+def test_fast_envelope_matches_validated_envelope():
+    from gateway.envelope import encode_envelope
+    from schemas.ws_messages import HeartbeatAckPayload, TTSAudioPayload, WSMessageType
+
+    class Stage(str, Enum):
+        ACTIVE = "active"
+
+    ts = datetime(2026, 3, 1, 9, 30, 15, 250000, tzinfo=timezone.utc)
+    cases = [
+        (WSMessageType.HEARTBEAT_ACK, HeartbeatAckPayload(seq=3, server_ts=ts)),
+        (WSMessageType.TTS_AUDIO, TTSAudioPayload(text="Café — ok?", session_id="s1", draft_id=None)),
+        (WSMessageType.PIPELINE_STAGE, {"stage_id": "l1", "status": Stage.ACTIVE, "progress": 40.0,
+                                        "at": ts, "nodes": [{"id": 1, "tags": ("a",)}], 7: "int key"}),
+        ("fragment_ack", {"ok": True, "missing": None}),
+    ]
+    for msg_type, payload in cases:
+        fast_text = encode_envelope(msg_type, payload)
+        fast, raw = _without_id_and_time(fast_text)
+        legacy, legacy_raw = _without_id_and_time(_legacy(msg_type, payload))
+        assert fast == legacy
+        assert list(raw) == list(legacy_raw) == ["type", "id", "timestamp", "payload"]
+        assert uuid.UUID(raw["id"]).version == 4
+        assert raw["timestamp"].endswith("Z")
+        datetime.fromisoformat(raw["timestamp"].replace("Z", "+00:00"))
+    # Typed payloads serialize byte-for-byte like the model
+    assert '"server_ts":"2026-03-01T09:30:15.250000Z"' in encode_envelope(cases[0][0], cases[0][1])
+
+
+def test_unknown_message_type_is_rejected():
+    import pytest
+
+    from gateway.envelope import encode_envelope
+
+    with pytest.raises(ValueError):
+        encode_envelope("not_a_type", {})
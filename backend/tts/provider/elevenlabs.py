@@ -1,12 +1,14 @@
 """ElevenLabs TTS Provider — real voice synthesis.
 
 Batch 3.5: Replace mock TTS with ElevenLabs.
-Uses the convert() API to generate MP3 audio from text.
+Uses the convert() API to generate MP3 audio from text, and the stream()
+API to hand MP3 chunks to the gateway as ElevenLabs produces them.
 """
 import asyncio
 import logging
+import threading
 import time
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from config.settings import get_settings
 from tts.provider.interface import TTSProvider, TTSResult
@@ -15,6 +17,23 @@ logger = logging.getLogger(__name__)
 
 # Default voice: configured for MyndLens
 DEFAULT_VOICE_ID = "i4CzbCVWoqvD0P1QJCUL"
+# Whole-response budget — covers convert + stream collection, or the full stream
+SYNTHESIS_TIMEOUT_S = 15.0
+
+
+def _request(voice_id: str, text: str) -> dict:
+    return {
+        "voice_id": voice_id,
+        "text": text,
+        "model_id": "eleven_turbo_v2_5",
+        "output_format": "mp3_22050_32",
+        "voice_settings": {
+            "stability": 0.75,
+            "similarity_boost": 0.85,
+            "style": 0.10,
+            "use_speaker_boost": True,
+        },
+    }
 
 
 class ElevenLabsTTSProvider(TTSProvider):
@@ -51,24 +70,13 @@ class ElevenLabsTTSProvider(TTSProvider):
                 loop = asyncio.get_running_loop()
                 audio_iter = await loop.run_in_executor(
                     None,
-                    lambda: self._client.text_to_speech.convert(
-                        voice_id=vid,
-                        text=text,
-                        model_id="eleven_turbo_v2_5",
-                        output_format="mp3_22050_32",
-                        voice_settings={
-                            "stability": 0.75,
-                            "similarity_boost": 0.85,
-                            "style": 0.10,
-                            "use_speaker_boost": True,
-                        },
-                    ),
+                    lambda: self._client.text_to_speech.convert(**_request(vid, text)),
                 )
                 return b"".join(audio_iter)
 
             audio_bytes = await asyncio.wait_for(
                 _tts_convert(),
-                timeout=15.0,  # 15s covers convert + stream collection
+                timeout=SYNTHESIS_TIMEOUT_S,
             )
 
             # Collect all chunks from the iterator
@@ -95,5 +103,73 @@ class ElevenLabsTTSProvider(TTSProvider):
             )
             return TTSResult(audio_bytes=b"", format="mp3", text=text, is_mock=True)
 
+    async def stream(self, text: str, voice_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """MP3 chunks as ElevenLabs streams them.
+
+        The SDK iterator blocks, so it is drained on an executor thread that
+        hands each chunk to the loop through a queue. SDK failures and the
+        SYNTHESIS_TIMEOUT_S budget are logged and re-raised, so the caller
+        can tell a cut-off stream from a finished one; closing the generator
+        stops the thread at its next chunk.
+        """
+        if not self._client:
+            logger.error("[ElevenLabsTTS] Client not initialized")
+            return
+
+        vid = voice_id or DEFAULT_VOICE_ID
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def _put(item) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                stop.set()  # loop closed under us
+
+        def _produce() -> None:
+            try:
+                for chunk in self._client.text_to_speech.stream(**_request(vid, text)):
+                    if stop.is_set():
+                        break
+                    if chunk:
+                        _put(chunk)
+            except Exception as e:
+                _put(e)
+            finally:
+                _put(done)
+
+        loop.run_in_executor(None, _produce)
+        chunks = 0
+        size = 0
+        first_chunk_ms = 0.0
+        try:
+            while True:
+                remaining = SYNTHESIS_TIMEOUT_S - (time.monotonic() - start)
+                item = await asyncio.wait_for(queue.get(), timeout=max(remaining, 0.0))
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if not chunks:
+                    first_chunk_ms = (time.monotonic() - start) * 1000
+                chunks += 1
+                size += len(item)
+                yield item
+            logger.info(
+                "[ElevenLabsTTS] Streamed: %d chunks, %d bytes, first_chunk=%.0fms total=%.0fms, text='%s'",
+                chunks, size, first_chunk_ms, (time.monotonic() - start) * 1000, text[:50],
+            )
+        except Exception as e:
+            logger.error(
+                "[ElevenLabsTTS] Stream failed after %d chunks: %s (%.0fms)",
+                chunks, str(e) or type(e).__name__, (time.monotonic() - start) * 1000,
+            )
+            raise
+        finally:
+            stop.set()
+
     async def is_healthy(self) -> bool:
         return self._client is not None
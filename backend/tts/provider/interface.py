@@ -5,7 +5,7 @@ TTS does NOT provide: intent, emotion analysis, or any reasoning.
 """
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 
 @dataclass
@@ -27,6 +27,16 @@ class TTSProvider(ABC):
         """Convert text to speech audio."""
         ...
 
+    async def stream(self, text: str, voice_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Yield audio chunks in playback order as the provider produces them.
+
+        A stream that yields nothing means no audio (callers fall back to
+        text). Providers without incremental synthesis yield one chunk.
+        """
+        result = await self.synthesize(text, voice_id)
+        if result.audio_bytes and not result.is_mock:
+            yield result.audio_bytes
+
     @abstractmethod
     async def is_healthy(self) -> bool:
         """Health check."""
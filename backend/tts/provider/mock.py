@@ -1,6 +1,8 @@
-"""Mock TTS Provider — returns empty audio for testing."""
+"""Mock TTS Providers — text-only (MOCK_TTS) and deterministic streaming audio for tests."""
+import asyncio
+import hashlib
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from tts.provider.interface import TTSProvider, TTSResult
 
@@ -24,3 +26,37 @@ class MockTTSProvider(TTSProvider):
 
     async def is_healthy(self) -> bool:
         return True
+
+
+class MockStreamingTTSProvider(TTSProvider):
+    """Mock TTS that streams deterministic fake audio — for chunked-delivery tests.
+
+    The audio for a text is a fixed function of the text (bytes_per_char
+    bytes per character, expanded from sha256), yielded in chunk_size
+    pieces with an optional delay between them. synthesize() returns the
+    same bytes in one piece.
+    """
+
+    def __init__(self, chunk_size: int = 1024, bytes_per_char: int = 64, chunk_delay_s: float = 0.0):
+        self.chunk_size = chunk_size
+        self.bytes_per_char = bytes_per_char
+        self.chunk_delay_s = chunk_delay_s
+
+    def audio_for(self, text: str) -> bytes:
+        size = max(1, len(text)) * self.bytes_per_char
+        seed = text.encode("utf-8")
+        blocks = (hashlib.sha256(seed + i.to_bytes(4, "big")).digest() for i in range(-(-size // 32)))
+        return b"".join(blocks)[:size]
+
+    async def synthesize(self, text: str, voice_id: Optional[str] = None) -> TTSResult:
+        return TTSResult(audio_bytes=self.audio_for(text), format="mp3", text=text, voice_id=voice_id or "", is_mock=True)
+
+    async def stream(self, text: str, voice_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        audio = self.audio_for(text)
+        for offset in range(0, len(audio), self.chunk_size):
+            if offset and self.chunk_delay_s:
+                await asyncio.sleep(self.chunk_delay_s)
+            yield audio[offset:offset + self.chunk_size]
+
+    async def is_healthy(self) -> bool:
+        return True